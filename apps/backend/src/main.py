@@ -1,5 +1,6 @@
 """Main FastAPI application."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
@@ -59,8 +60,16 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Failed to initialize Redis cache for LLM: {e}", exc_info=True)
 
+    # Read prompt templates now so workflows don't block the event loop on first use
+    from agentic_py.prompts import preload_prompts
+
+    await asyncio.to_thread(preload_prompts)
+
     yield
     # Shutdown
+    from agentic_py.workflows.checkpointer import close_checkpointer_pool
+
+    await close_checkpointer_pool()
     await close_db()
 
 
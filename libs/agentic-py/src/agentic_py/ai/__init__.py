@@ -1,33 +1,39 @@
 """
 AI Infrastructure Module
 
-Provides AI/LLM infrastructure including client utilities, caching, batching, and evaluation.
+Provides AI/LLM infrastructure including client utilities, caching, batching, evaluation, and profiling.
 Renamed from ml/ to better reflect its purpose (AI/LLM infrastructure, not traditional ML).
 """
 
 from agentic_py.ai.batching import batch_analyze_violations, batch_llm_calls
 from agentic_py.ai.cache import (
+    canonicalize_prompt,
     clear_cache,
     get_cache_stats,
     get_cached_response,
     set_cached_response,
 )
 from agentic_py.ai.evaluation import evaluate_rag_retrieval, evaluate_workflow_performance
-from agentic_py.ai.llm import get_llm_client, invoke_llm_with_retry
+from agentic_py.ai.llm import get_llm_client, invoke_llm_stream, invoke_llm_with_retry
+from agentic_py.ai.profiling import timed
 
 __all__ = [
     # LLM
     "get_llm_client",
     "invoke_llm_with_retry",
+    "invoke_llm_stream",
     # Caching
     "get_cached_response",
     "set_cached_response",
     "clear_cache",
     "get_cache_stats",
+    "canonicalize_prompt",
     # Batching
     "batch_llm_calls",
     "batch_analyze_violations",
     # Evaluation
     "evaluate_rag_retrieval",
     "evaluate_workflow_performance",
+    # Profiling
+    "timed",
 ]
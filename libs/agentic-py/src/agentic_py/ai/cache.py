@@ -9,6 +9,7 @@ The RedisCache should be provided by the backend application.
 """
 
 import logging
+import re
 from typing import Any, Protocol
 
 from agentic_py.config.cache import LLM_CACHE_ENABLED, LLM_CACHE_TTL
@@ -21,6 +22,10 @@ CACHE_TTL = LLM_CACHE_TTL
 # Global RedisCache instance (set by backend)
 _redis_cache: Any | None = None
 
+# Prompt canonicalization: trailing whitespace and runs of blank lines
+_TRAILING_WHITESPACE_RE = re.compile(r"[ \t]+$", re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
 
 class RedisCacheProtocol(Protocol):
     """Protocol for Redis cache implementations."""
@@ -90,6 +95,25 @@ def get_redis_cache() -> RedisCacheProtocol:
     return _redis_cache
 
 
+def canonicalize_prompt(prompt: str) -> str:
+    """
+    Normalize a prompt so formatting-only differences share a cache entry.
+
+    Line endings are normalized, trailing whitespace is dropped, runs of blank lines
+    are collapsed to one, and the prompt is stripped. Indentation and everything else
+    are kept, since prompts embed code where they are significant.
+
+    Args:
+        prompt: The prompt text
+
+    Returns:
+        Canonical form of the prompt, used for cache lookups
+    """
+    prompt = prompt.replace("\r\n", "\n")
+    prompt = _TRAILING_WHITESPACE_RE.sub("", prompt)
+    return _BLANK_LINES_RE.sub("\n\n", prompt).strip()
+
+
 async def get_cached_response(
     prompt: str,
     model: str | None = None,
@@ -116,7 +140,7 @@ async def get_cached_response(
 
     try:
         cache = get_redis_cache()
-        return await cache.get(prompt, model, temperature)
+        return await cache.get(canonicalize_prompt(prompt), model, temperature)
     except RuntimeError:
         raise
     except Exception as e:
@@ -155,7 +179,7 @@ async def set_cached_response(
 
     try:
         cache = get_redis_cache()
-        await cache.set(prompt, response, model, temperature, ttl=CACHE_TTL)
+        await cache.set(canonicalize_prompt(prompt), response, model, temperature, ttl=CACHE_TTL)
     except RuntimeError:
         raise
     except Exception as e:
@@ -0,0 +1,84 @@
+"""
+LLM Circuit Breaker
+
+Stops calling the LLM provider for a cooldown period after repeated failures, so callers
+fail fast instead of each retrying against an endpoint that is down.
+"""
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Closed: calls go through and consecutive failures are counted. After
+    failure_threshold of them the circuit opens and calls fail fast for cooldown
+    seconds. It is then half-open: one call goes through as a probe while the others
+    keep failing fast, and the probe's outcome closes or reopens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown: float) -> None:
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit (0 disables it)
+            cooldown: Seconds the circuit stays open before a probe call is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_until = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected."""
+        return time.monotonic() < self._opened_until
+
+    def check(self) -> None:
+        """
+        Reject the call if the circuit is open.
+
+        Raises:
+            RuntimeError: If the circuit is open
+        """
+        if self.failure_threshold <= 0:
+            return
+        now = time.monotonic()
+        if now < self._opened_until:
+            raise RuntimeError(
+                "LLM circuit open after repeated failures, "
+                f"retrying in {self._opened_until - now:.0f}s"
+            )
+        if self._failures >= self.failure_threshold:
+            # Half-open: this call is the probe; hold the others off until it finishes
+            self._opened_until = now + self.cooldown
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        if self._failures >= self.failure_threshold > 0:
+            logger.info("LLM circuit closed")
+        self._failures = 0
+        self._opened_until = 0.0
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit once the threshold is reached."""
+        self._failures += 1
+        if self._failures >= self.failure_threshold > 0:
+            self._open()
+
+    def trip(self) -> None:
+        """Open the circuit immediately, e.g. after a quota or authentication error."""
+        self._failures = max(self._failures + 1, self.failure_threshold)
+        if self.failure_threshold > 0:
+            self._open()
+
+    def _open(self) -> None:
+        self._opened_until = time.monotonic() + self.cooldown
+        logger.warning(
+            "LLM circuit opened",
+            extra={"consecutive_failures": self._failures, "cooldown_seconds": self.cooldown},
+        )
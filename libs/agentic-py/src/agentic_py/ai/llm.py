@@ -4,10 +4,19 @@ LLM Client Utilities
 Provides shared LLM client with retry logic, error handling, rate limiting, and caching.
 """
 
+import asyncio
 import logging
+import math
 import os
+import random
+import re
+from collections.abc import AsyncIterator, Mapping
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
 from typing import Any
 
+from agentic_py.ai.circuit import CircuitBreaker
+from agentic_py.ai.profiling import timed
 from agentic_py.config.llm import LLM_ENABLED, LLM_MODEL, LLM_TEMPERATURE
 
 logger = logging.getLogger(__name__)
@@ -16,6 +25,26 @@ logger = logging.getLogger(__name__)
 MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
 RETRY_BACKOFF_FACTOR = float(os.getenv("LLM_RETRY_BACKOFF_FACTOR", "2.0"))
 INITIAL_RETRY_DELAY = float(os.getenv("LLM_INITIAL_RETRY_DELAY", "1.0"))
+MAX_RETRY_DELAY = float(os.getenv("LLM_MAX_RETRY_DELAY", "30.0"))
+
+# Circuit breaker: fail fast for a cooldown after this many consecutive failed attempts
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_COOLDOWN = float(os.getenv("LLM_CIRCUIT_COOLDOWN", "30.0"))
+_llm_circuit = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_COOLDOWN)
+
+# Error message classification, matched once per failed call. Status codes need word
+# boundaries so request ids or token counts containing "401" aren't misread.
+_TERMINAL_ERROR_RE = re.compile(
+    r"(?P<quota>quota)"
+    r"|(?P<auth>\bauth(?:entication|enticate|orization)?\b|\bunauthorized\b|\b40[13]\b"
+    r"|\b(?:invalid|incorrect)[ _]api[ _]key\b)",
+    re.IGNORECASE,
+)
+_RATE_LIMIT_RE = re.compile(r"rate[ _]limit|\b429\b", re.IGNORECASE)
+
+# Invocations currently running, keyed by (prompt, id of the client, max retries), so
+# identical concurrent prompts share one API call
+_inflight_invocations: dict[tuple[str, int, int], asyncio.Future[str]] = {}
 
 
 async def get_llm_client():
@@ -57,6 +86,7 @@ async def get_llm_client():
         raise ValueError(f"Invalid LLM configuration: {e}") from e
 
 
+@timed("llm_invoke")
 async def invoke_llm_with_retry(
     prompt: str,
     llm_client: Any | None = None,
@@ -85,6 +115,35 @@ async def invoke_llm_with_retry(
 
     max_retries = max_retries or MAX_RETRIES
 
+    # Concurrent identical prompts (e.g. many violations needing the same fix) share
+    # one call instead of each missing the cache and calling the API
+    key = (prompt, id(llm_client), max_retries)
+    inflight = _inflight_invocations.get(key)
+    if inflight is None:
+        inflight = asyncio.ensure_future(_invoke_llm(prompt, llm_client, max_retries))
+        _inflight_invocations[key] = inflight
+        inflight.add_done_callback(lambda _: _inflight_invocations.pop(key, None))
+    else:
+        logger.debug("LLM invocation joined an identical in-flight prompt")
+    # Shield so one caller being cancelled doesn't cancel the call for the others
+    return await asyncio.shield(inflight)
+
+
+async def _invoke_llm(prompt: str, llm_client: Any | None, max_retries: int) -> str:
+    """
+    Invoke the LLM for a validated prompt, using the response cache and retrying failures.
+
+    Args:
+        prompt: The prompt to send to the LLM
+        llm_client: Optional LLM client instance (will be created if not provided)
+        max_retries: Maximum number of retries
+
+    Returns:
+        LLM response content as string
+
+    Raises:
+        RuntimeError: If the client can't be created or all retries failed
+    """
     # Check cache first (async)
     from agentic_py.ai.cache import get_cached_response as get_cached_response_async
 
@@ -98,11 +157,10 @@ async def invoke_llm_with_retry(
     if llm is None:
         raise RuntimeError("LLM client could not be initialized")
 
-    import asyncio
-
     last_exception = None
 
     for attempt in range(max_retries + 1):
+        _llm_circuit.check()
         try:
             logger.debug(f"LLM invocation attempt {attempt + 1}/{max_retries + 1}")
             response = await llm.ainvoke(prompt)
@@ -115,6 +173,7 @@ async def invoke_llm_with_retry(
             else:
                 content = str(response)
 
+            _llm_circuit.record_success()
             logger.info(
                 "LLM invocation successful",
                 extra={
@@ -133,69 +192,251 @@ async def invoke_llm_with_retry(
 
         except Exception as e:
             last_exception = e
-            error_type = type(e).__name__
-
-            # Check for specific OpenAI API errors
-            error_message = str(e).lower()
-
-            # Rate limit errors - should retry with backoff
-            if ("rate limit" in error_message or "429" in error_message) and attempt < max_retries:
-                delay = INITIAL_RETRY_DELAY * (RETRY_BACKOFF_FACTOR**attempt)
-                logger.warning(
-                    f"Rate limit hit, retrying after {delay}s",
-                    extra={"attempt": attempt + 1, "error": error_type},
-                )
-                await asyncio.sleep(delay)
-                continue
-
-            # Quota exceeded - don't retry
-            if "quota" in error_message or "insufficient_quota" in error_message:
-                logger.error(
-                    "LLM quota exceeded, cannot retry",
-                    extra={"error": error_type, "error_message": str(e)},
-                )
-                raise RuntimeError(
-                    "LLM quota exceeded. Please check your API key and billing status."
-                ) from e
-
-            # Authentication errors - don't retry
-            if (
-                "auth" in error_message
-                or "authentication" in error_message
-                or "401" in error_message
-                or "403" in error_message
-            ):
-                logger.error(
-                    "LLM authentication failed, cannot retry",
-                    extra={"error": error_type, "error_message": str(e)},
-                )
-                raise RuntimeError("LLM authentication failed. Please check your API key.") from e
-
-            # Other errors - retry with backoff
-            if attempt < max_retries:
-                delay = INITIAL_RETRY_DELAY * (RETRY_BACKOFF_FACTOR**attempt)
-                logger.warning(
-                    f"LLM invocation failed, retrying after {delay}s",
-                    extra={
-                        "attempt": attempt + 1,
-                        "error": error_type,
-                        "error_message": str(e)[:200],  # Truncate long error messages
-                    },
-                )
-                await asyncio.sleep(delay)
-            else:
-                logger.error(
-                    "LLM invocation failed after all retries",
-                    extra={
-                        "max_retries": max_retries,
-                        "error": error_type,
-                        "error_message": str(e)[:200],
-                    },
-                    exc_info=True,
-                )
+            await _handle_failed_attempt(e, attempt, max_retries)
 
     # All retries exhausted
     raise RuntimeError(
         f"LLM invocation failed after {max_retries + 1} attempts. "
         f"Last error: {type(last_exception).__name__}: {str(last_exception)[:200]}"
     ) from last_exception
+
+
+async def _handle_failed_attempt(e: Exception, attempt: int, max_retries: int) -> None:
+    """
+    Record a failed LLM call with the circuit breaker and wait before the next attempt.
+
+    Rate limits aren't counted as failures: they are backpressure that the retry delay
+    already honors (Retry-After), and counting them would open the circuit for every
+    caller while the API is healthy.
+
+    Args:
+        e: The exception raised by the LLM call
+        attempt: Zero-based index of the attempt that failed
+        max_retries: Maximum number of retries
+
+    Raises:
+        RuntimeError: If the error can't be fixed by retrying (quota or authentication)
+    """
+    try:
+        delay = _retry_delay(e, attempt, max_retries)
+    except RuntimeError:
+        # Every other call would fail the same way, so stop them all
+        _llm_circuit.trip()
+        raise
+    if not _RATE_LIMIT_RE.search(str(e)):
+        _llm_circuit.record_failure()
+    # Once the circuit opens the next attempt fails fast, so don't wait for it
+    if delay is not None and not _llm_circuit.is_open:
+        await asyncio.sleep(delay)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """
+    Pick a full-jitter exponential backoff delay for a retry.
+
+    The delay is drawn uniformly from zero up to the exponential backoff cap, so many
+    workers rate limited at the same moment spread their retries out instead of all
+    retrying in lockstep.
+
+    Args:
+        attempt: Zero-based index of the attempt that failed
+
+    Returns:
+        Seconds to wait before retrying
+    """
+    cap = min(MAX_RETRY_DELAY, INITIAL_RETRY_DELAY * (RETRY_BACKOFF_FACTOR**attempt))
+    return random.random() * cap
+
+
+def _retry_after_seconds(e: Exception) -> float | None:
+    """
+    Read the Retry-After header from a failed call's HTTP response.
+
+    Args:
+        e: The exception raised by the LLM call
+
+    Returns:
+        Seconds the server asked us to wait, or None if the header is absent or malformed
+    """
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    if not isinstance(headers, Mapping):
+        return None
+    value = headers.get("Retry-After", headers.get("retry-after"))
+    if not isinstance(value, str):
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        # The header may also be an HTTP date
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=UTC)
+        seconds = (retry_at - datetime.now(UTC)).total_seconds()
+    if not math.isfinite(seconds):
+        return None
+    return max(seconds, 0.0)
+
+
+def _retry_delay(e: Exception, attempt: int, max_retries: int) -> float | None:
+    """
+    Classify a failed LLM call and decide whether to retry it.
+
+    Args:
+        e: The exception raised by the LLM call
+        attempt: Zero-based index of the attempt that failed
+        max_retries: Maximum number of retries
+
+    Returns:
+        Seconds to wait before retrying, or None if retries are exhausted
+
+    Raises:
+        RuntimeError: If the error can't be fixed by retrying (quota or authentication)
+    """
+    error_type = type(e).__name__
+    error_message = str(e)
+
+    # Quota and authentication errors - don't retry. These are checked first: OpenAI
+    # reports an exhausted quota as a 429, which would otherwise look like a rate limit
+    terminal = _TERMINAL_ERROR_RE.search(error_message)
+    if terminal is not None:
+        if terminal.lastgroup == "quota":
+            logger.error(
+                "LLM quota exceeded, cannot retry",
+                extra={"error": error_type, "error_message": error_message},
+            )
+            raise RuntimeError(
+                "LLM quota exceeded. Please check your API key and billing status."
+            ) from e
+        logger.error(
+            "LLM authentication failed, cannot retry",
+            extra={"error": error_type, "error_message": error_message},
+        )
+        raise RuntimeError("LLM authentication failed. Please check your API key.") from e
+
+    # Rate limit errors - retry when the server says to, else with backoff
+    if attempt < max_retries and _RATE_LIMIT_RE.search(error_message):
+        retry_after = _retry_after_seconds(e)
+        if retry_after is None:
+            delay = _backoff_delay(attempt)
+        else:
+            delay = min(retry_after, MAX_RETRY_DELAY)
+        logger.warning(
+            f"Rate limit hit, retrying after {delay:.2f}s",
+            extra={"attempt": attempt + 1, "error": error_type},
+        )
+        return delay
+
+    # Other errors - retry with backoff
+    if attempt < max_retries:
+        delay = _backoff_delay(attempt)
+        logger.warning(
+            f"LLM invocation failed, retrying after {delay:.2f}s",
+            extra={
+                "attempt": attempt + 1,
+                "error": error_type,
+                "error_message": error_message[:200],  # Truncate long error messages
+            },
+        )
+        return delay
+
+    logger.error(
+        "LLM invocation failed after all retries",
+        extra={
+            "max_retries": max_retries,
+            "error": error_type,
+            "error_message": error_message[:200],
+        },
+        exc_info=True,
+    )
+    return None
+
+
+async def invoke_llm_stream(
+    prompt: str,
+    llm_client: Any | None = None,
+    max_retries: int | None = None,
+) -> AsyncIterator[str]:
+    """
+    Stream an LLM response, yielding content chunks as the model generates them.
+
+    Lets callers forward a long response to the user while it is still being
+    generated. Failures before the first chunk are retried like
+    ``invoke_llm_with_retry``; once output has been yielded it can't be taken back, so
+    a later failure is raised. Cached responses are yielded as a single chunk and
+    complete responses are cached.
+
+    Args:
+        prompt: The prompt to send to the LLM
+        llm_client: Optional LLM client instance (will be created if not provided)
+        max_retries: Maximum number of retries (defaults to MAX_RETRIES config)
+
+    Yields:
+        Response content chunks
+
+    Raises:
+        RuntimeError: If LLM is disabled, all retries failed, or the stream broke
+        ValueError: If prompt is empty or invalid
+    """
+    if not LLM_ENABLED:
+        raise RuntimeError("LLM is disabled. Set LLM_ENABLED=true to enable.")
+
+    if not prompt or not prompt.strip():
+        raise ValueError("Prompt cannot be empty")
+
+    max_retries = max_retries or MAX_RETRIES
+
+    from agentic_py.ai.cache import get_cached_response as get_cached_response_async
+
+    cached_response = await get_cached_response_async(prompt, LLM_MODEL, LLM_TEMPERATURE)
+    if cached_response is not None:
+        logger.debug("Returning cached LLM response")
+        yield cached_response
+        return
+
+    llm = llm_client or await get_llm_client()
+
+    if llm is None:
+        raise RuntimeError("LLM client could not be initialized")
+
+    last_exception = None
+    chunks: list[str] = []
+
+    for attempt in range(max_retries + 1):
+        _llm_circuit.check()
+        try:
+            logger.debug(f"LLM stream attempt {attempt + 1}/{max_retries + 1}")
+            async for message_chunk in llm.astream(prompt):
+                content = getattr(message_chunk, "content", message_chunk)
+                if not isinstance(content, str):
+                    content = str(content)
+                if content:
+                    chunks.append(content)
+                    yield content
+            break
+        except Exception as e:
+            if chunks:
+                _llm_circuit.record_failure()
+                raise RuntimeError(
+                    f"LLM stream failed after partial output: {type(e).__name__}: {str(e)[:200]}"
+                ) from e
+            last_exception = e
+            await _handle_failed_attempt(e, attempt, max_retries)
+    else:
+        raise RuntimeError(
+            f"LLM invocation failed after {max_retries + 1} attempts. "
+            f"Last error: {type(last_exception).__name__}: {str(last_exception)[:200]}"
+        ) from last_exception
+
+    _llm_circuit.record_success()
+    content = "".join(chunks)
+    logger.info(
+        "LLM stream successful",
+        extra={"attempt": attempt + 1, "model": LLM_MODEL, "response_length": len(content)},
+    )
+
+    from agentic_py.ai.cache import set_cached_response as set_cached_response_async
+
+    await set_cached_response_async(prompt, content, LLM_MODEL, LLM_TEMPERATURE)
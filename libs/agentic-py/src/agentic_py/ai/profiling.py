@@ -0,0 +1,103 @@
+"""
+Sampled Profiling
+
+Provides a decorator that times a sample of calls to expensive stages (LLM calls, RAG
+queries, prompt loading) and records their latency in a Prometheus histogram. Off by
+default; enable with PROFILING_ENABLED=true.
+"""
+
+import functools
+import inspect
+import logging
+import random
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from agentic_py.config.profiling import PROFILING_ENABLED, PROFILING_SAMPLE_RATE
+
+try:
+    from prometheus_client import Histogram
+
+    STAGE_DURATION_SECONDS: Histogram | None = Histogram(
+        "agentic_stage_duration_seconds",
+        "Sampled duration of agentic-py stages in seconds",
+        ["stage"],  # stage: llm_invoke, rag_query, prompt_load
+        buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0),
+    )
+except ImportError:
+    # prometheus_client is optional; sampled durations are still logged at debug level
+    STAGE_DURATION_SECONDS = None
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def record_stage_duration(stage: str, seconds: float) -> None:
+    """
+    Record one sampled stage duration.
+
+    Args:
+        stage: Name of the timed stage
+        seconds: Measured duration in seconds
+    """
+    if STAGE_DURATION_SECONDS is not None:
+        STAGE_DURATION_SECONDS.labels(stage=stage).observe(seconds)
+    logger.debug("Stage %s took %.1fms", stage, seconds * 1000)
+
+
+def timed(stage: str, sample_rate: float | None = None) -> Callable[[F], F]:
+    """
+    Decorate a function so a random sample of its calls are timed.
+
+    Works on both sync and async functions. When profiling is disabled the function is
+    returned undecorated, so there is no overhead in that case. Failed calls are timed
+    too, since slow failures are worth seeing.
+
+    Args:
+        stage: Name of the stage, used as the histogram label
+        sample_rate: Fraction of calls to time (defaults to PROFILING_SAMPLE_RATE)
+
+    Returns:
+        Decorator applying the sampled timer
+
+    Example:
+        ```python
+        @timed("rag_query")
+        async def query_knowledge(...): ...
+        ```
+    """
+    rate = PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    def decorator(func: F) -> F:
+        if not PROFILING_ENABLED or rate <= 0:
+            return func
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if random.random() >= rate:
+                    return await func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    record_stage_duration(stage, (time.perf_counter_ns() - start) / 1e9)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if random.random() >= rate:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_stage_duration(stage, (time.perf_counter_ns() - start) / 1e9)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -32,9 +32,16 @@ from agentic_py.config.llm import (
     LLM_ENABLED,
     LLM_MODEL,
     LLM_TEMPERATURE,
+    REMEDIATION_CONCURRENCY,
     LLMConfig,
     get_llm_config,
 )
+from agentic_py.config.profiling import (
+    PROFILING_ENABLED,
+    PROFILING_SAMPLE_RATE,
+    ProfilingConfig,
+    get_profiling_config,
+)
 from agentic_py.config.rag import (
     CHUNK_OVERLAP,
     CHUNK_SIZE,
@@ -43,11 +50,17 @@ from agentic_py.config.rag import (
     EVAL_ENABLED,
     PGVECTOR_COLLECTION,
     PGVECTOR_CONNECTION_STRING,
+    PGVECTOR_CREATE_EXTENSION,
     PGVECTOR_TABLE_NAME,
     RAG_ALLOWED_BASE_DIRS,
     RAG_ENABLED,
+    RAG_FILE_READ_CONCURRENCY,
     RAG_INGESTION_BATCH_SIZE,
+    RAG_IO_WORKERS,
     RAG_MAX_FILE_SIZE,
+    RAG_QUERY_CACHE_SIZE,
+    RAG_QUERY_CACHE_TTL,
+    RAG_QUERY_CONCURRENCY,
     RAG_SIMILARITY_THRESHOLD,
     RAG_TOP_K,
     VECTOR_STORE_TYPE,
@@ -56,6 +69,8 @@ from agentic_py.config.rag import (
 )
 from agentic_py.config.workflows import (
     AUDIT_FUNCTION_LENGTH_THRESHOLD,
+    AUDIT_PARSE_CACHE_SIZE,
+    LESSON_PROMPT_MAX_ITEMS,
     STRUGGLE_THRESHOLD_EDIT_FREQUENCY,
     STRUGGLE_THRESHOLD_ERROR_COUNT,
     WorkflowConfig,
@@ -72,6 +87,8 @@ __all__ = [
     "get_workflow_config",
     "CacheConfig",
     "get_cache_config",
+    "ProfilingConfig",
+    "get_profiling_config",
     # LLM Config Constants
     "LLM_MODEL",
     "LLM_TEMPERATURE",
@@ -80,10 +97,14 @@ __all__ = [
     "EMBEDDING_PROVIDER",
     "LLM_BATCH_SIZE",
     "LLM_BATCH_DELAY",
+    "REMEDIATION_CONCURRENCY",
     # RAG Config Constants
     "RAG_ENABLED",
     "RAG_TOP_K",
     "RAG_SIMILARITY_THRESHOLD",
+    "RAG_QUERY_CONCURRENCY",
+    "RAG_QUERY_CACHE_SIZE",
+    "RAG_QUERY_CACHE_TTL",
     "CHUNKING_STRATEGY",
     "CHUNK_SIZE",
     "CHUNK_OVERLAP",
@@ -91,15 +112,20 @@ __all__ = [
     "PGVECTOR_CONNECTION_STRING",
     "PGVECTOR_COLLECTION",
     "PGVECTOR_TABLE_NAME",
+    "PGVECTOR_CREATE_EXTENSION",
     "RAG_MAX_FILE_SIZE",
     "RAG_INGESTION_BATCH_SIZE",
+    "RAG_FILE_READ_CONCURRENCY",
+    "RAG_IO_WORKERS",
     "RAG_ALLOWED_BASE_DIRS",
     "EVAL_ENABLED",
     "EVAL_DATASET_PATH",
     # Workflow Config Constants
     "STRUGGLE_THRESHOLD_EDIT_FREQUENCY",
     "STRUGGLE_THRESHOLD_ERROR_COUNT",
+    "LESSON_PROMPT_MAX_ITEMS",
     "AUDIT_FUNCTION_LENGTH_THRESHOLD",
+    "AUDIT_PARSE_CACHE_SIZE",
     # Cache Config Constants
     "LLM_CACHE_ENABLED",
     "LLM_CACHE_TTL",
@@ -109,4 +135,7 @@ __all__ = [
     "REDIS_CONNECTION_POOL_SIZE",
     "REDIS_SOCKET_TIMEOUT",
     "REDIS_SOCKET_CONNECT_TIMEOUT",
+    # Profiling Config Constants
+    "PROFILING_ENABLED",
+    "PROFILING_SAMPLE_RATE",
 ]
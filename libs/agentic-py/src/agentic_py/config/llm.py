@@ -56,6 +56,12 @@ class LLMConfig(BaseSettings):
         ge=0.0,
         description="Delay between batches in seconds",
     )
+    remediation_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=64,
+        description="Maximum concurrent LLM calls when generating remediations in a batch",
+    )
 
 
 # Global instance (lazy-loaded)
@@ -79,3 +85,4 @@ EMBEDDING_MODEL = _config.embedding_model
 EMBEDDING_PROVIDER = _config.embedding_provider
 LLM_BATCH_SIZE = _config.llm_batch_size
 LLM_BATCH_DELAY = _config.llm_batch_delay
+REMEDIATION_CONCURRENCY = _config.remediation_concurrency
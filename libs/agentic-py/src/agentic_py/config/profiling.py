@@ -0,0 +1,47 @@
+"""
+Profiling Configuration
+
+Configuration for sampled latency profiling using Pydantic Settings.
+"""
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ProfilingConfig(BaseSettings):
+    """Profiling configuration for sampled stage timers."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+    profiling_enabled: bool = Field(
+        default=False,
+        description="Record sampled latencies of LLM, RAG and prompt loading calls",
+    )
+    profiling_sample_rate: float = Field(
+        default=0.01,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of calls to time when profiling is enabled",
+    )
+
+
+# Global instance (lazy-loaded)
+_profiling_config: ProfilingConfig | None = None
+
+
+def get_profiling_config() -> ProfilingConfig:
+    """Get profiling configuration instance (singleton)."""
+    global _profiling_config
+    if _profiling_config is None:
+        _profiling_config = ProfilingConfig()
+    return _profiling_config
+
+
+# Backward compatibility: export as module-level constants
+_config = get_profiling_config()
+PROFILING_ENABLED = _config.profiling_enabled
+PROFILING_SAMPLE_RATE = _config.profiling_sample_rate
@@ -36,6 +36,22 @@ class RAGConfig(BaseSettings):
         le=1.0,
         description="Similarity threshold for retrieval (0.0-1.0)",
     )
+    rag_query_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=64,
+        description="Number of worker threads dedicated to vector store similarity searches",
+    )
+    rag_query_cache_size: int = Field(
+        default=1024,
+        ge=0,
+        description="Maximum number of cached query results (0 = disabled)",
+    )
+    rag_query_cache_ttl: int = Field(
+        default=300,
+        ge=1,
+        description="Query result cache TTL in seconds",
+    )
 
     # Vector Store Configuration
     vector_store_type: Literal["pgvector"] = Field(
@@ -56,6 +72,10 @@ class RAGConfig(BaseSettings):
         default="embeddings",
         description="pgvector table name",
     )
+    pgvector_create_extension: bool = Field(
+        default=True,
+        description="Run CREATE EXTENSION vector on startup (disable when migrations manage it)",
+    )
 
     # Chunking Strategy Configuration
     chunking_strategy: Literal["fixed", "recursive", "semantic"] = Field(
@@ -96,6 +116,18 @@ class RAGConfig(BaseSettings):
         ge=1,
         description="Number of documents per ingestion batch",
     )
+    rag_file_read_concurrency: int = Field(
+        default=16,
+        ge=1,
+        le=256,
+        description="Maximum number of files read concurrently during ingestion",
+    )
+    rag_io_workers: int = Field(
+        default=64,
+        ge=1,
+        le=512,
+        description="Number of worker threads dedicated to ingestion file I/O",
+    )
     rag_allowed_base_dirs: list[str] = Field(
         default_factory=list,
         description="Comma-separated list of allowed base directories (empty = no restriction)",
@@ -135,10 +167,14 @@ _config = get_rag_config()
 RAG_ENABLED = _config.rag_enabled
 RAG_TOP_K = _config.rag_top_k
 RAG_SIMILARITY_THRESHOLD = _config.rag_similarity_threshold
+RAG_QUERY_CONCURRENCY = _config.rag_query_concurrency
+RAG_QUERY_CACHE_SIZE = _config.rag_query_cache_size
+RAG_QUERY_CACHE_TTL = _config.rag_query_cache_ttl
 VECTOR_STORE_TYPE = _config.vector_store_type
 PGVECTOR_CONNECTION_STRING = _config.pgvector_connection_string
 PGVECTOR_COLLECTION = _config.pgvector_collection
 PGVECTOR_TABLE_NAME = _config.pgvector_table_name
+PGVECTOR_CREATE_EXTENSION = _config.pgvector_create_extension
 CHUNKING_STRATEGY = _config.chunking_strategy
 CHUNK_SIZE = _config.chunk_size
 CHUNK_OVERLAP = _config.chunk_overlap
@@ -146,4 +182,6 @@ EVAL_ENABLED = _config.eval_enabled
 EVAL_DATASET_PATH = _config.eval_dataset_path
 RAG_MAX_FILE_SIZE = _config.rag_max_file_size
 RAG_INGESTION_BATCH_SIZE = _config.rag_ingestion_batch_size
+RAG_FILE_READ_CONCURRENCY = _config.rag_file_read_concurrency
+RAG_IO_WORKERS = _config.rag_io_workers
 RAG_ALLOWED_BASE_DIRS = _config.rag_allowed_base_dirs
@@ -28,6 +28,11 @@ class WorkflowConfig(BaseSettings):
         ge=0,
         description="Error count threshold for struggle detection",
     )
+    lesson_prompt_max_items: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum error logs and history items included in a lesson prompt",
+    )
 
     # Code Audit Configuration
     audit_function_length_threshold: int = Field(
@@ -35,6 +40,11 @@ class WorkflowConfig(BaseSettings):
         ge=1,
         description="Function length threshold for audit (lines)",
     )
+    audit_parse_cache_size: int = Field(
+        default=16,
+        ge=0,
+        description="Parsed diffs kept for re-audits of the same diff (0 disables)",
+    )
 
 
 # Global instance (lazy-loaded)
@@ -53,4 +63,6 @@ def get_workflow_config() -> WorkflowConfig:
 _config = get_workflow_config()
 STRUGGLE_THRESHOLD_EDIT_FREQUENCY = _config.struggle_threshold_edit_frequency
 STRUGGLE_THRESHOLD_ERROR_COUNT = _config.struggle_threshold_error_count
+LESSON_PROMPT_MAX_ITEMS = _config.lesson_prompt_max_items
 AUDIT_FUNCTION_LENGTH_THRESHOLD = _config.audit_function_length_threshold
+AUDIT_PARSE_CACHE_SIZE = _config.audit_parse_cache_size
@@ -9,10 +9,17 @@ from agentic_py.prompts.loader import (
     load_agent_system_prompt,
     load_agent_user_message_template,
     load_prompt,
+    load_prompt_renderer,
+    preload_prompts,
 )
+from agentic_py.prompts.remediations import REMEDIATION_TEMPLATES, render_remediation
 
 __all__ = [
     "load_prompt",
+    "load_prompt_renderer",
+    "preload_prompts",
     "load_agent_system_prompt",
     "load_agent_user_message_template",
+    "REMEDIATION_TEMPLATES",
+    "render_remediation",
 ]
@@ -5,21 +5,29 @@ Loads prompt templates from markdown files and converts them to LangChain Prompt
 """
 
 import logging
+from collections.abc import Callable
 from functools import lru_cache
 from pathlib import Path
+from string import Formatter
 
 from langchain_core.prompts import PromptTemplate
 
+from agentic_py.ai.profiling import timed
+
 logger = logging.getLogger(__name__)
 
 # Base directory for prompts (relative to this file)
 _PROMPTS_BASE_DIR = Path(__file__).parent
 
 
+@lru_cache(maxsize=128)
 def get_prompt_path(template_name: str) -> Path:
     """
     Resolve the path to a prompt template file.
 
+    Resolved paths are cached, so repeat lookups skip the filesystem probes. Missing
+    prompts are not cached and are searched for again on the next call.
+
     Supports loading from subdirectories:
     - `lesson_generation/lesson_generation_base.md` -> lesson_generation subdirectory
     - `violation_analysis/violation_analysis_base.md` -> violation_analysis subdirectory
@@ -134,6 +142,7 @@ def _parse_markdown_prompt(content: str) -> tuple[str | None, str]:
 
 
 @lru_cache(maxsize=32)
+@timed("prompt_load")
 def load_prompt(template_name: str) -> PromptTemplate:
     """
     Load a prompt template from a markdown file and convert it to a LangChain PromptTemplate.
@@ -214,6 +223,57 @@ def load_prompt(template_name: str) -> PromptTemplate:
         ) from e
 
 
+@lru_cache(maxsize=32)
+def load_prompt_renderer(template_name: str) -> Callable[..., str]:
+    """
+    Load a prompt template as a precompiled render function.
+
+    The template is split into literal text and field names once, so each render only
+    joins strings instead of re-parsing the template and validating its inputs like
+    ``PromptTemplate.format`` does. Use this for prompts rendered once per item in
+    large batches.
+
+    Args:
+        template_name: Name of the template (e.g., "violation_analysis/remediation_suggestion")
+
+    Returns:
+        Function taking the template variables as keyword arguments and returning
+        the formatted prompt
+
+    Raises:
+        FileNotFoundError: If the prompt file does not exist
+        ValueError: If the prompt content is invalid
+
+    Example:
+        ```python
+        render = load_prompt_renderer("violation_analysis/remediation_suggestion")
+        prompt = render(file_path="src/app.py", line_number=3, ...)
+        ```
+    """
+    template = load_prompt(template_name)
+    parsed = tuple(Formatter().parse(template.template))
+
+    # Conversions, format specs and attribute access need the full formatter
+    if template.template_format != "f-string" or any(
+        conversion or format_spec or (field_name is not None and not field_name.isidentifier())
+        for _, field_name, format_spec, conversion in parsed
+    ):
+        return template.format
+
+    segments = tuple((literal, field_name) for literal, field_name, _, _ in parsed)
+
+    def render(**kwargs: object) -> str:
+        return "".join(
+            [
+                literal + str(kwargs[field_name]) if field_name is not None else literal
+                for literal, field_name in segments
+            ]
+        )
+
+    return render
+
+
+@lru_cache(maxsize=32)
 def load_agent_system_prompt(template_name: str) -> str:
     """
     Load system prompt for an agent from a markdown file.
@@ -249,6 +309,7 @@ def load_agent_system_prompt(template_name: str) -> str:
     return system_message
 
 
+@lru_cache(maxsize=32)
 def load_agent_user_message_template(template_name: str) -> PromptTemplate:
     """
     Load user message template for an agent from a markdown file.
@@ -296,3 +357,35 @@ def load_agent_user_message_template(template_name: str) -> PromptTemplate:
             f"Failed to create PromptTemplate from {prompt_path}: {e}\n"
             f"Template content preview: {user_message[:200]}..."
         ) from e
+
+
+def preload_prompts() -> list[str]:
+    """
+    Load every prompt template into the loader caches.
+
+    Prompts are otherwise read from disk on first use, which blocks the event loop of
+    whichever async workflow needs them first. Call this once at startup (e.g. via
+    ``asyncio.to_thread``) so workflows only ever hit the caches. Prompts that fail to
+    load are logged and skipped; using them later raises as usual.
+
+    Returns:
+        Names of the templates that were loaded
+    """
+    loaded = []
+    for prompt_path in sorted(_PROMPTS_BASE_DIR.rglob("*.md")):
+        template_name = prompt_path.relative_to(_PROMPTS_BASE_DIR).with_suffix("").as_posix()
+        try:
+            if template_name.startswith("agents/"):
+                if template_name.endswith("_system"):
+                    load_agent_system_prompt(template_name)
+                else:
+                    load_agent_user_message_template(template_name)
+            else:
+                load_prompt_renderer(template_name)
+        except (FileNotFoundError, ValueError) as e:
+            logger.warning(f"Failed to preload prompt {template_name}: {e}")
+            continue
+        loaded.append(template_name)
+
+    logger.debug(f"Preloaded {len(loaded)} prompt templates")
+    return loaded
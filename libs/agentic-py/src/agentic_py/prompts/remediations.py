@@ -0,0 +1,50 @@
+"""
+Remediation Templates
+
+Fixed remediation suggestions for audit rules whose fix doesn't depend on the code
+around the violation. They are filled in with the violation's location instead of
+asking the LLM.
+"""
+
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any
+
+# Rule name -> suggestion template with {file_path} and {line_number} fields
+REMEDIATION_TEMPLATES: Mapping[str, str] = MappingProxyType(
+    {
+        "no_print_statements": (
+            "Replace the print() call at {file_path}:{line_number} with logger.debug() "
+            "or logger.info(), using a module-level logger = logging.getLogger(__name__)."
+        ),
+        "no_debugger_calls": (
+            "Remove the debugger call at {file_path}:{line_number} before committing. "
+            "Use logging or a conditional breakpoint in your IDE while debugging instead."
+        ),
+        "hardcoded_secret": (
+            "Move the secret at {file_path}:{line_number} out of the code: read it from "
+            "an environment variable or a secret manager. Rotate it, since it has already "
+            "been committed."
+        ),
+    }
+)
+
+
+def render_remediation(violation_detail: Mapping[str, Any]) -> str | None:
+    """
+    Fill in the remediation template for a violation's rule.
+
+    Args:
+        violation_detail: Violation detail dictionary with rule_name, file_path and
+            line_number
+
+    Returns:
+        Remediation suggestion, or None if the rule has no template and needs the LLM
+    """
+    template = REMEDIATION_TEMPLATES.get(violation_detail.get("rule_name", ""))
+    if template is None:
+        return None
+    return template.format(
+        file_path=violation_detail.get("file_path", "unknown"),
+        line_number=violation_detail.get("line_number", 0),
+    )
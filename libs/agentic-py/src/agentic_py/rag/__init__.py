@@ -30,8 +30,10 @@ from agentic_py.rag.loaders import (
 from agentic_py.rag.service import RagService, get_rag_service
 from agentic_py.rag.utils import (
     read_file_async,
+    read_files_async,
     validate_file_size,
     validate_path,
+    validate_paths,
 )
 
 __all__ = [
@@ -62,6 +64,8 @@ __all__ = [
     "RAGValidationError",
     # Utils
     "read_file_async",
+    "read_files_async",
     "validate_file_size",
     "validate_path",
+    "validate_paths",
 ]
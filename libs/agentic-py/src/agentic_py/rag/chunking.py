@@ -6,10 +6,12 @@ Supports recursive, fixed-size, and semantic chunking approaches.
 """
 
 import logging
+from functools import lru_cache
 from typing import Literal
 
 from langchain_text_splitters import (
     CharacterTextSplitter,
+    Language,
     RecursiveCharacterTextSplitter,
 )
 
@@ -22,15 +24,28 @@ from agentic_py.rag.exceptions import RAGValidationError
 
 logger = logging.getLogger(__name__)
 
+# File extensions with a language-specific recursive splitter
+EXTENSION_LANGUAGES: dict[str, Language] = {
+    ".py": Language.PYTHON,
+    ".ts": Language.TS,
+    ".tsx": Language.TS,
+    ".md": Language.MARKDOWN,
+    ".markdown": Language.MARKDOWN,
+}
+
 
 def get_text_splitter(
     strategy: Literal["fixed", "recursive", "semantic"] | None = None,
     chunk_size: int | None = None,
     chunk_overlap: int | None = None,
+    language: Language | None = None,
 ) -> CharacterTextSplitter | RecursiveCharacterTextSplitter:
     """
     Get a text splitter based on the specified strategy.
 
+    Splitters are cached per (strategy, chunk_size, chunk_overlap, language), so
+    repeated calls during ingestion reuse the same instance.
+
     Args:
         strategy: Chunking strategy to use. If None, uses CHUNKING_STRATEGY from config.
             - "recursive": RecursiveCharacterTextSplitter (respects code/markdown structure)
@@ -38,6 +53,9 @@ def get_text_splitter(
             - "semantic": Not yet implemented (raises NotImplementedError)
         chunk_size: Size of chunks in characters. If None, uses CHUNK_SIZE from config.
         chunk_overlap: Overlap between chunks in characters. If None, uses CHUNK_OVERLAP from config.
+        language: Optional source language. With the "recursive" strategy, uses the
+            language-specific separators (e.g. class/def boundaries for Python).
+            Ignored by other strategies.
 
     Returns:
         Text splitter instance configured with the specified strategy.
@@ -64,7 +82,31 @@ def get_text_splitter(
             f"chunk_overlap ({chunk_overlap}) must be less than chunk_size ({chunk_size})"
         )
 
+    return _build_text_splitter(strategy, chunk_size, chunk_overlap, language)
+
+
+@lru_cache(maxsize=32)
+def _build_text_splitter(
+    strategy: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    language: Language | None,
+) -> CharacterTextSplitter | RecursiveCharacterTextSplitter:
+    """Build a text splitter for already-validated settings (cached)."""
     if strategy == "recursive":
+        if language is not None:
+            logger.debug(
+                "Using language-specific RecursiveCharacterTextSplitter",
+                extra={
+                    "chunk_size": chunk_size,
+                    "chunk_overlap": chunk_overlap,
+                    "language": language.value,
+                },
+            )
+            return RecursiveCharacterTextSplitter.from_language(
+                language, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+            )
+
         logger.debug(
             "Using RecursiveCharacterTextSplitter",
             extra={"chunk_size": chunk_size, "chunk_overlap": chunk_overlap},
@@ -109,6 +151,7 @@ def chunk_text(
     strategy: Literal["fixed", "recursive", "semantic"] | None = None,
     chunk_size: int | None = None,
     chunk_overlap: int | None = None,
+    language: Language | None = None,
 ) -> list[str]:
     """
     Chunk text using the specified strategy.
@@ -120,6 +163,7 @@ def chunk_text(
         strategy: Chunking strategy (see get_text_splitter for details)
         chunk_size: Size of chunks in characters
         chunk_overlap: Overlap between chunks in characters
+        language: Optional source language for the recursive strategy
 
     Returns:
         List of text chunks
@@ -130,6 +174,6 @@ def chunk_text(
         5
     """
     splitter = get_text_splitter(
-        strategy=strategy, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        strategy=strategy, chunk_size=chunk_size, chunk_overlap=chunk_overlap, language=language
     )
     return splitter.split_text(text)
@@ -5,18 +5,24 @@ Provides functionality to ingest documents from files or directories
 into the vector store with chunking and metadata extraction.
 """
 
+import asyncio
+import hashlib
 import logging
+import os
 import re
+import sys
+from collections.abc import Iterator
+from fnmatch import translate
 from pathlib import Path
 from typing import Any, Literal, TypedDict
 
 from langchain_core.documents import Document
 
-from agentic_py.config.rag import CHUNKING_STRATEGY
-from agentic_py.rag.chunking import get_text_splitter
+from agentic_py.config.rag import CHUNKING_STRATEGY, RAG_FILE_READ_CONCURRENCY
+from agentic_py.rag.chunking import EXTENSION_LANGUAGES, get_text_splitter
 from agentic_py.rag.exceptions import RAGValidationError
 from agentic_py.rag.loaders import load_document
-from agentic_py.rag.utils import validate_path
+from agentic_py.rag.utils import _to_io_thread, validate_path
 
 logger = logging.getLogger(__name__)
 
@@ -88,23 +94,24 @@ def discover_files(
         if not re.match(r"^[\w.*\-]+$", pattern.replace("*", "star").replace(".", "dot")):
             raise RAGValidationError(f"Invalid file pattern syntax: {pattern}")
 
-    files: list[Path] = []
-
+    # Split patterns into plain suffix matches ("*.md" -> ".md") and remaining globs
+    suffixes: list[str] = []
+    name_globs: list[str] = []
     for file_pattern in file_patterns:
         # Handle both .md and *.md patterns
         if not file_pattern.startswith("*"):
             file_pattern = f"*{file_pattern}"
 
-        # Use **/*.md to match files in root and all subdirectories when recursive,
-        # otherwise use *.md to match only files in root directory
-        pattern = f"**/{file_pattern}" if recursive else file_pattern
+        if "*" in file_pattern[1:]:
+            name_globs.append(file_pattern)
+        else:
+            suffixes.append(file_pattern[1:])
 
-        found = list(validated_directory.glob(pattern))
-        files.extend(found)
+    # Fuse all wildcard patterns into one compiled alternation so each file name is
+    # matched with a single regex call instead of one fnmatch call per pattern
+    name_pattern = re.compile("|".join(map(translate, name_globs))) if name_globs else None
 
-    # Remove duplicates and filter to only files
-    files = list(set(files))
-    files = [f for f in files if f.is_file()]
+    files = sorted(_walk_files(str(validated_directory), tuple(suffixes), name_pattern, recursive))
 
     logger.info(
         "Files discovered",
@@ -116,7 +123,43 @@ def discover_files(
         },
     )
 
-    return sorted(files)
+    return files
+
+
+def _walk_files(
+    directory: str,
+    suffixes: tuple[str, ...],
+    name_pattern: re.Pattern[str] | None,
+    recursive: bool,
+) -> Iterator[Path]:
+    """
+    Yield files under a directory whose names match a suffix or glob.
+
+    Uses os.scandir so file type checks come from the directory entry, and only
+    builds Path objects for matching files. Symlinked directories are not followed.
+
+    Args:
+        directory: Directory to walk
+        suffixes: File name suffixes to match (e.g., (".md", ".py"))
+        name_pattern: Compiled union of the wildcard patterns that aren't plain suffixes
+        recursive: Whether to descend into subdirectories
+
+    Yields:
+        Paths of matching files
+    """
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        yield from _walk_files(entry.path, suffixes, name_pattern, recursive)
+                elif (
+                    entry.name.endswith(suffixes)
+                    or (name_pattern is not None and name_pattern.match(entry.name))
+                ) and entry.is_file():
+                    yield Path(entry.path)
+    except OSError as e:
+        logger.debug(f"Skipping unreadable directory {directory}: {e}")
 
 
 async def ingest_document(
@@ -140,10 +183,35 @@ async def ingest_document(
         >>> len(docs)  # Number of chunks
         5
     """
-    path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"Document not found: {path}")
+    # Reading, parsing and splitting are blocking; keep them off the event loop so
+    # concurrent work (e.g. in-flight embedding requests) isn't stalled by disk reads
+    return await _to_io_thread(_load_and_chunk, Path(path), chunking_strategy, metadata_override)
+
+
+# Metadata that changes without the stored text or metadata changing (e.g. a touch)
+_DIGEST_EXCLUDED_METADATA = frozenset({"last_modified", "file_size"})
+
 
+def _document_digest(doc: Document) -> str:
+    """
+    SHA-256 of what a document stores: its text and metadata, including its source.
+
+    Stored with every chunk so RagService.ingest_directory(skip_existing=True) can
+    skip files that were already ingested unchanged.
+    """
+    digest = hashlib.sha256(doc.page_content.encode("utf-8"))
+    for key in sorted(doc.metadata, key=str):
+        if key not in _DIGEST_EXCLUDED_METADATA:
+            digest.update(f"\x00{key}={doc.metadata[key]!r}".encode())
+    return digest.hexdigest()
+
+
+def _load_and_chunk(
+    path: Path,
+    chunking_strategy: Literal["fixed", "recursive", "semantic"] | None,
+    metadata_override: dict[str, Any] | None,
+) -> list[Document]:
+    """Load, chunk and tag a single document (blocking; see ingest_document)."""
     logger.debug(f"Ingesting document: {path}")
 
     # Load document
@@ -152,21 +220,37 @@ async def ingest_document(
     # Override or add metadata
     if metadata_override:
         doc.metadata.update(metadata_override)
+    doc.metadata["sha256"] = _document_digest(doc)
 
     # Chunk the document
     strategy = chunking_strategy or CHUNKING_STRATEGY
-    splitter = get_text_splitter(strategy=strategy)
+    splitter = get_text_splitter(
+        strategy=strategy, language=EXTENSION_LANGUAGES.get(path.suffix.lower())
+    )
 
     # Split into chunks
     chunks = splitter.split_text(doc.page_content)
+    total_chunks = len(chunks)
+
+    # Intern metadata keys once (frontmatter keys are fresh strings per file) so every
+    # chunk dict across the corpus shares the same key objects
+    parent_metadata = {
+        sys.intern(key) if isinstance(key, str) else key: value
+        for key, value in doc.metadata.items()
+    }
+    # Release the full file text now that it has been split; only chunks are needed below
+    del doc
 
     # Create Document objects for each chunk with metadata
-    chunked_docs: list[Document] = []
-    for i, chunk_text in enumerate(chunks):
-        chunk_metadata = doc.metadata.copy()
-        chunk_metadata["chunk_index"] = i
-        chunk_metadata["total_chunks"] = len(chunks)
-        chunked_docs.append(Document(page_content=chunk_text, metadata=chunk_metadata))
+    chunked_docs = [
+        Document(
+            page_content=chunk_text,
+            metadata={**parent_metadata, "chunk_index": i, "total_chunks": total_chunks},
+        )
+        for i, chunk_text in enumerate(chunks)
+    ]
+    # The Documents now own the chunk strings; drop the intermediate list
+    del chunks
 
     logger.info(
         "Document ingested",
@@ -237,25 +321,29 @@ async def ingest_directory(
         },
     )
 
-    # Process files with error handling
+    # Load and chunk files concurrently on the I/O executor, at most
+    # RAG_FILE_READ_CONCURRENCY at a time, keeping results in discovery order
     # Note: For very large directories, consider processing in batches
     # to manage memory. Current implementation loads all documents into memory.
-    for file_path in files:
-        try:
-            docs = await ingest_document(file_path, chunking_strategy=chunking_strategy)
-            all_documents.extend(docs)
-            files_processed += 1
-
-            # Log progress for large directories
-            if files_processed % 10 == 0:
-                logger.debug(
-                    f"Processing file {files_processed}/{len(files)}",
-                    extra={"files_processed": files_processed, "total_files": len(files)},
-                )
-        except Exception as e:
-            error_msg = f"Failed to ingest {file_path}: {str(e)}"
-            logger.error(error_msg, exc_info=True)
+    semaphore = asyncio.Semaphore(RAG_FILE_READ_CONCURRENCY)
+
+    async def _ingest(file_path: Path) -> list[Document]:
+        async with semaphore:
+            return await ingest_document(file_path, chunking_strategy=chunking_strategy)
+
+    outcomes = await asyncio.gather(*(_ingest(f) for f in files), return_exceptions=True)
+
+    for file_path, outcome in zip(files, outcomes, strict=True):
+        if isinstance(outcome, Exception):
+            error_msg = f"Failed to ingest {file_path}: {str(outcome)}"
+            logger.error(error_msg, exc_info=outcome)
             errors.append(error_msg)
+            continue
+        if isinstance(outcome, BaseException):
+            # Cancellation and interrupts are not per-file failures
+            raise outcome
+        all_documents.extend(outcome)
+        files_processed += 1
 
     result: IngestionResult = {
         "files_processed": files_processed,
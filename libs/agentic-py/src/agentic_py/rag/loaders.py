@@ -22,6 +22,8 @@ try:
     import yaml
 
     YAML_AVAILABLE = True
+    # libyaml's C loader parses frontmatter several times faster when pyyaml was built with it
+    _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 except ImportError:
     YAML_AVAILABLE = False
     logger.warning(
@@ -54,21 +56,16 @@ def load_markdown(path: str | Path) -> Document:
         >>> doc.metadata["source"]  # File path
     """
     path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"Markdown file not found: {path}")
 
     # Validate path and file size
     try:
         validated_path = validate_path(path)
-        validate_file_size(validated_path)
+        stat_info = validate_file_size(validated_path)
     except RAGPathError:
         raise
     except RAGFileError:
         raise
 
-    # Get file stat info once
-    stat_info = validated_path.stat()
-
     try:
         content = validated_path.read_text(encoding="utf-8")
     except PermissionError as e:
@@ -94,7 +91,7 @@ def load_markdown(path: str | Path) -> Document:
             # Use pyyaml if available, otherwise fall back to simple parsing
             if YAML_AVAILABLE:
                 try:
-                    frontmatter_data = yaml.safe_load(frontmatter)
+                    frontmatter_data = yaml.load(frontmatter, Loader=_YAML_LOADER)
                     if frontmatter_data and isinstance(frontmatter_data, dict):
                         metadata.update(frontmatter_data)
                 except yaml.YAMLError as e:
@@ -148,21 +145,16 @@ def load_python(path: str | Path) -> Document:
         >>> doc.metadata.get("functions")  # List of function names
     """
     path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"Python file not found: {path}")
 
     # Validate path and file size
     try:
         validated_path = validate_path(path)
-        validate_file_size(validated_path)
+        stat_info = validate_file_size(validated_path)
     except RAGPathError:
         raise
     except RAGFileError:
         raise
 
-    # Get file stat info once
-    stat_info = validated_path.stat()
-
     try:
         content = validated_path.read_text(encoding="utf-8")
     except PermissionError as e:
@@ -216,21 +208,16 @@ def load_typescript(path: str | Path) -> Document:
         FileNotFoundError: If file doesn't exist
     """
     path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"TypeScript file not found: {path}")
 
     # Validate path and file size
     try:
         validated_path = validate_path(path)
-        validate_file_size(validated_path)
+        stat_info = validate_file_size(validated_path)
     except RAGPathError:
         raise
     except RAGFileError:
         raise
 
-    # Get file stat info once
-    stat_info = validated_path.stat()
-
     try:
         content = validated_path.read_text(encoding="utf-8")
     except PermissionError as e:
@@ -271,21 +258,16 @@ def load_text(path: str | Path) -> Document:
         FileNotFoundError: If file doesn't exist
     """
     path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"Text file not found: {path}")
 
     # Validate path and file size
     try:
         validated_path = validate_path(path)
-        validate_file_size(validated_path)
+        stat_info = validate_file_size(validated_path)
     except RAGPathError:
         raise
     except RAGFileError:
         raise
 
-    # Get file stat info once
-    stat_info = validated_path.stat()
-
     try:
         content = validated_path.read_text(encoding="utf-8")
     except UnicodeDecodeError:
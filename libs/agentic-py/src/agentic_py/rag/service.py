@@ -6,25 +6,60 @@ and retrieving relevant context for lesson generation.
 """
 
 import asyncio
+import atexit
+import io
 import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from langchain_core.documents import Document
 from loguru import logger
 
+from agentic_py.ai.profiling import timed
 from agentic_py.config.llm import EMBEDDING_MODEL
 from agentic_py.config.rag import (
     PGVECTOR_COLLECTION,
     PGVECTOR_CONNECTION_STRING,
+    PGVECTOR_CREATE_EXTENSION,
     RAG_ENABLED,
     RAG_INGESTION_BATCH_SIZE,
+    RAG_QUERY_CACHE_SIZE,
+    RAG_QUERY_CACHE_TTL,
+    RAG_QUERY_CONCURRENCY,
     RAG_TOP_K,
 )
 from agentic_py.rag.ingestion import ingest_directory, ingest_document
 
+# Import vector store dependencies once at module load; if they are missing the
+# error is surfaced when the vector store is first initialized
+_VECTOR_STORE_IMPORT_ERROR: ImportError | None = None
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import PGVector
+    from langchain_openai import OpenAIEmbeddings
+else:
+    try:
+        from langchain_community.vectorstores import PGVector
+        from langchain_openai import OpenAIEmbeddings
+    except ImportError as _import_error:
+        PGVector: Any = None
+        OpenAIEmbeddings: Any = None
+        _VECTOR_STORE_IMPORT_ERROR = _import_error
+VECTOR_STORE_DEPS_AVAILABLE = _VECTOR_STORE_IMPORT_ERROR is None
+
 # Re-export for backward compatibility
 __all__ = ["RagService", "get_rag_service", "RAG_ENABLED", "RAG_TOP_K"]
 
+# Dedicated executor for similarity searches so query bursts don't queue behind
+# unrelated work submitted to the event loop's default executor
+_RAG_EXECUTOR = ThreadPoolExecutor(
+    max_workers=RAG_QUERY_CONCURRENCY,
+    thread_name_prefix="rag-query",
+)
+atexit.register(_RAG_EXECUTOR.shutdown)
+
 
 class RagService:
     """
@@ -45,10 +80,17 @@ class RagService:
             enabled: Whether RAG is enabled (defaults to RAG_ENABLED env var)
         """
         self.enabled = enabled or RAG_ENABLED
-        self._vector_store = None
-        self._embedding_model = None
+        self._vector_store: PGVector | None = None
+        self._embedding_model: OpenAIEmbeddings | None = None
         self._init_lock = asyncio.Lock()  # Prevent concurrent initialization
+        # LRU cache of formatted query results: key -> (timestamp, context)
+        self._query_cache: OrderedDict[tuple[str, tuple[str, ...], int], tuple[float, str]] = (
+            OrderedDict()
+        )
+        # Searches currently running, so identical concurrent queries can share them
+        self._inflight_queries: dict[tuple[str, tuple[str, ...], int], asyncio.Future[str]] = {}
 
+    @timed("rag_query")
     async def query_knowledge(
         self, query: str, error_patterns: list[str] | None = None, top_k: int | None = None
     ) -> str:
@@ -81,6 +123,47 @@ class RagService:
             logger.debug("RAG service is disabled, returning empty context")
             return "RAG service is not enabled. Set RAG_ENABLED=true to enable."
 
+        cache_key = (query, tuple(error_patterns or ()), top_k)
+        cached_context = self._get_cached_query(cache_key)
+        if cached_context is not None:
+            logger.debug("RAG query served from cache", extra={"top_k": top_k})
+            return cached_context
+
+        # Concurrent identical queries (e.g. many users hitting the same error at once)
+        # share one embedding and similarity search instead of each missing the cache
+        inflight = self._inflight_queries.get(cache_key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(
+                self._execute_query(query, error_patterns, top_k, cache_key, start_time)
+            )
+            self._inflight_queries[cache_key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight_queries.pop(cache_key, None))
+        else:
+            logger.debug("RAG query joined an identical in-flight query", extra={"top_k": top_k})
+        # Shield so one caller being cancelled doesn't cancel the search for the others
+        return await asyncio.shield(inflight)
+
+    async def _execute_query(
+        self,
+        query: str,
+        error_patterns: list[str] | None,
+        top_k: int,
+        cache_key: tuple[str, tuple[str, ...], int],
+        start_time: float,
+    ) -> str:
+        """
+        Run a similarity search for a query that missed the cache and cache its result.
+
+        Args:
+            query: Main query string
+            error_patterns: List of error patterns to enhance the query
+            top_k: Number of documents to retrieve
+            cache_key: Query cache key to store the result under
+            start_time: When the query was received, for duration logging
+
+        Returns:
+            Formatted context string, or a fallback message if the query fails
+        """
         try:
             # Initialize vector store if not already initialized
             init_start = time.time()
@@ -113,7 +196,7 @@ class RagService:
 
             # Query vector store
             # Note: similarity_search is synchronous in LangChain, but we're in async context
-            # Use asyncio.to_thread for async execution
+            # Run it on the dedicated RAG executor
             search_start = time.time()
             logger.debug(
                 "Executing similarity search",
@@ -124,10 +207,12 @@ class RagService:
                 },
             )
 
-            results = await asyncio.to_thread(
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(
+                _RAG_EXECUTOR,
                 self._vector_store.similarity_search,
                 enhanced_query,
-                k=top_k,
+                top_k,
             )
 
             search_duration = time.time() - search_start
@@ -160,6 +245,7 @@ class RagService:
                     "vector_store_type": "pgvector",
                 },
             )
+            self._set_cached_query(cache_key, context)
             return context
 
         except Exception as e:
@@ -184,6 +270,48 @@ class RagService:
                 f"Please check vector store configuration."
             )
 
+    def _get_cached_query(self, key: tuple[str, tuple[str, ...], int]) -> str | None:
+        """
+        Return a cached query result if present and not expired.
+
+        Args:
+            key: Cache key of (query, error_patterns, top_k)
+
+        Returns:
+            Cached context string, or None on a miss
+        """
+        entry = self._query_cache.get(key)
+        if entry is None:
+            return None
+
+        timestamp, context = entry
+        if time.monotonic() - timestamp > RAG_QUERY_CACHE_TTL:
+            del self._query_cache[key]
+            return None
+
+        self._query_cache.move_to_end(key)
+        return context
+
+    def _set_cached_query(self, key: tuple[str, tuple[str, ...], int], context: str) -> None:
+        """
+        Store a query result, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key of (query, error_patterns, top_k)
+            context: Formatted context string to cache
+        """
+        if RAG_QUERY_CACHE_SIZE <= 0:
+            return
+
+        self._query_cache[key] = (time.monotonic(), context)
+        self._query_cache.move_to_end(key)
+        if len(self._query_cache) > RAG_QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+
+    def clear_query_cache(self) -> None:
+        """Clear cached query results (e.g. after the knowledge base changes)."""
+        self._query_cache.clear()
+
     async def _initialize_vector_store(self) -> None:
         """
         Initialize the pgvector vector store connection.
@@ -206,7 +334,8 @@ class RagService:
                 "Initializing embedding model",
                 extra={"model": EMBEDDING_MODEL},
             )
-            from langchain_openai import OpenAIEmbeddings
+            if _VECTOR_STORE_IMPORT_ERROR is not None:
+                raise _VECTOR_STORE_IMPORT_ERROR
 
             # Initialize embedding model
             self._embedding_model = OpenAIEmbeddings(
@@ -243,14 +372,19 @@ class RagService:
 
     async def _initialize_pgvector(self) -> None:
         """Initialize pgvector (PostgreSQL extension) vector store."""
-        try:
-            from langchain_community.vectorstores import PGVector
+        if self._embedding_model is None:
+            raise RuntimeError("Embedding model not initialized. Cannot create vector store.")
 
-            self._vector_store = PGVector(
+        try:
+            # PGVector's constructor issues blocking DDL round trips (extension, tables,
+            # collection), so build it off the event loop
+            self._vector_store = await asyncio.to_thread(
+                PGVector,
                 connection_string=PGVECTOR_CONNECTION_STRING,
                 embedding_function=self._embedding_model,
                 collection_name=PGVECTOR_COLLECTION,
                 use_jsonb=True,  # Use JSONB for metadata for better performance
+                create_extension=PGVECTOR_CREATE_EXTENSION,
             )
 
             logger.debug(
@@ -295,9 +429,8 @@ class RagService:
         if not error_patterns:
             return query
 
-        # Combine query with error patterns
-        error_context = " ".join(error_patterns)
-        return f"{query} {error_context}"
+        # Combine query with error patterns in a single join
+        return " ".join([query, *error_patterns])
 
     def _format_results(self, results: list[Any]) -> str:
         """
@@ -323,15 +456,21 @@ class RagService:
         if not results:
             return "No relevant documentation found."
 
-        formatted = []
+        # Write into a single buffer instead of building and joining a list of strings
+        buf = io.StringIO()
         for i, doc in enumerate(results, 1):
-            content = doc.page_content if hasattr(doc, "page_content") else str(doc)
-            metadata = doc.metadata if hasattr(doc, "metadata") else {}
-            source = metadata.get("source", "unknown")
+            content = getattr(doc, "page_content", None)
+            if content is None:
+                content = str(doc)
+            source = getattr(doc, "metadata", {}).get("source", "unknown")
 
-            formatted.append(f"### Document {i} (from {source})\n{content}\n")
+            if i > 1:
+                buf.write("\n")
+            buf.write(f"### Document {i} (from {source})\n")
+            buf.write(content)
+            buf.write("\n")
 
-        return "\n".join(formatted)
+        return buf.getvalue()
 
     async def ingest_document(
         self, path: str | Path, metadata: dict[str, Any] | None = None
@@ -374,9 +513,10 @@ class RagService:
             logger.warning(f"No chunks created for {path}")
             return
 
-        # Add documents to vector store
-        # Note: LangChain vector stores use synchronous add_documents, so we run in executor
-        await asyncio.to_thread(self._vector_store.add_documents, documents)
+        # Embed in batches and add the precomputed vectors to the vector store
+        async for embedded in self.embed_chunks(documents):
+            await asyncio.to_thread(self._add_embedded_documents, embedded)
+        self.clear_query_cache()
 
         logger.info(
             "Document ingested successfully",
@@ -392,6 +532,8 @@ class RagService:
         directory: str | Path,
         file_patterns: list[str] | None = None,
         recursive: bool = True,
+        batch_size: int | None = None,
+        skip_existing: bool = False,
     ) -> dict[str, Any]:
         """
         Ingest all documents in a directory into the vector store.
@@ -400,6 +542,11 @@ class RagService:
             directory: Directory to ingest
             file_patterns: File patterns to match (e.g., ["*.md", "*.py"])
             recursive: Whether to search recursively
+            batch_size: Chunks per embedding request (defaults to RAG_INGESTION_BATCH_SIZE)
+            skip_existing: Skip files whose text and metadata (sha256) are already in
+                the vector store, so re-ingesting an unchanged directory embeds nothing. An edited
+                file is re-ingested, but the chunks of its previous version stay in the
+                store until the collection is rebuilt (see delete_document)
 
         Returns:
             Dictionary with ingestion statistics:
@@ -444,21 +591,35 @@ class RagService:
                 "errors": result["errors"],
             }
 
-        # Add documents to vector store in batches
-        # Note: LangChain vector stores use synchronous add_documents, so we run in executor
-        batch_size = RAG_INGESTION_BATCH_SIZE
-
-        def _add_documents_batch(docs: list[Any]) -> None:
-            """Helper function to add documents batch."""
-            self._vector_store.add_documents(docs)
+        if skip_existing:
+            documents = await self._drop_existing_documents(documents)
 
-        for i in range(0, len(documents), batch_size):
-            batch = documents[i : i + batch_size]
-            await asyncio.to_thread(_add_documents_batch, batch)
-            logger.debug(
-                f"Added batch {i // batch_size + 1} to vector store",
-                extra={"batch_size": len(batch), "total": len(documents)},
-            )
+        # Add documents to vector store in batches
+        # Each batch is embedded with a single embed_documents request; the write of
+        # batch N overlaps with the embedding request for batch N + 1
+        pending_write: asyncio.Task[None] | None = None
+        batch_number = 0
+        try:
+            async for embedded in self.embed_chunks(documents, batch_size=batch_size):
+                if pending_write is not None:
+                    await pending_write
+                pending_write = asyncio.create_task(
+                    asyncio.to_thread(self._add_embedded_documents, embedded)
+                )
+                batch_number += 1
+                logger.debug(
+                    f"Queued batch {batch_number} for vector store write",
+                    extra={"batch_size": len(embedded), "total": len(documents)},
+                )
+            if pending_write is not None:
+                await pending_write
+        finally:
+            if pending_write is not None:
+                # The write runs in a thread and can't be cancelled; if embedding failed,
+                # wait for it so it doesn't outlive this call, and retrieve its exception
+                # so the embedding error is the one raised
+                await asyncio.gather(pending_write, return_exceptions=True)
+        self.clear_query_cache()
 
         logger.info(
             "Directory ingestion completed",
@@ -476,6 +637,106 @@ class RagService:
             "errors": result["errors"],
         }
 
+    async def embed_chunks(
+        self, docs: list[Document], batch_size: int | None = None
+    ) -> AsyncIterator[list[tuple[Document, list[float]]]]:
+        """
+        Embed chunked documents in fixed-size batches.
+
+        Each batch is sent as a single embed_documents request instead of one
+        request per chunk, so N chunks cost N / batch_size round trips.
+
+        Args:
+            docs: Chunked documents to embed
+            batch_size: Documents per embedding request (defaults to RAG_INGESTION_BATCH_SIZE)
+
+        Yields:
+            Lists of (document, embedding vector) pairs, one list per batch
+
+        Raises:
+            RuntimeError: If the embedding model is not initialized
+        """
+        if self._embedding_model is None:
+            raise RuntimeError("Embedding model not initialized. Cannot embed documents.")
+
+        batch_size = batch_size or RAG_INGESTION_BATCH_SIZE
+        for i in range(0, len(docs), batch_size):
+            batch = docs[i : i + batch_size]
+            vectors = await asyncio.to_thread(
+                self._embedding_model.embed_documents, [doc.page_content for doc in batch]
+            )
+            yield list(zip(batch, vectors, strict=True))
+
+    async def _drop_existing_documents(self, docs: list[Document]) -> list[Document]:
+        """
+        Drop chunks of files whose content is already stored in the vector store.
+
+        Args:
+            docs: Chunked documents carrying the ingestion sha256 metadata
+
+        Returns:
+            Chunks of new or changed files
+        """
+        digests = {doc.metadata["sha256"] for doc in docs if "sha256" in doc.metadata}
+        if not digests:
+            return docs
+        existing = await asyncio.to_thread(self._existing_digests, digests)
+        if not existing:
+            return docs
+
+        remaining = [doc for doc in docs if doc.metadata.get("sha256") not in existing]
+        logger.info(
+            "Skipping unchanged documents",
+            extra={"files": len(existing), "chunks": len(docs) - len(remaining)},
+        )
+        return remaining
+
+    def _existing_digests(self, digests: set[str]) -> set[str]:
+        """
+        Find which content digests already have chunks in the collection.
+
+        Each digest is looked up with a metadata-filtered similarity search for a
+        single chunk, so only the public vector store API is used. The filter alone
+        decides the match; the query vector just has to have the store's dimension.
+
+        Args:
+            digests: sha256 digests to look up
+
+        Returns:
+            The subset of digests found in the vector store
+
+        Raises:
+            RuntimeError: If vector store or embedding model is not initialized
+        """
+        store = self._vector_store
+        if store is None or self._embedding_model is None:
+            raise RuntimeError("Vector store not initialized")
+
+        probe = self._embedding_model.embed_query("sha256")
+        return {
+            digest
+            for digest in digests
+            if store.similarity_search_by_vector(probe, k=1, filter={"sha256": digest})
+        }
+
+    def _add_embedded_documents(self, embedded: list[tuple[Document, list[float]]]) -> None:
+        """
+        Add documents with precomputed embeddings to the vector store.
+
+        Args:
+            embedded: (document, embedding vector) pairs from embed_chunks
+
+        Raises:
+            RuntimeError: If vector store is not initialized
+        """
+        if self._vector_store is None:
+            raise RuntimeError("Vector store not initialized")
+        self._vector_store.add_embeddings(
+            texts=[doc.page_content for doc, _ in embedded],
+            embeddings=[vector for _, vector in embedded],
+            metadatas=[doc.metadata for doc, _ in embedded],
+        )
+
     async def delete_document(self, source: str) -> None:  # noqa: ARG002
         """
         Delete a document from the vector store by source path.
@@ -519,8 +780,7 @@ class RagService:
             List of document metadata dictionaries
 
         Note:
-            This is a debugging utility. Implementation depends on vector store type.
-            For FAISS, this may not be fully supported.
+            This is a debugging utility and is not yet implemented for pgvector.
 
         Example:
             >>> docs = await service.list_documents()
@@ -5,14 +5,94 @@ Helper functions for path validation, file operations, and common utilities.
 """
 
 import asyncio
+import atexit
+import codecs
+import functools
 import logging
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
 from pathlib import Path
 
-from agentic_py.config.rag import RAG_ALLOWED_BASE_DIRS, RAG_MAX_FILE_SIZE
+from agentic_py.config.rag import (
+    RAG_ALLOWED_BASE_DIRS,
+    RAG_FILE_READ_CONCURRENCY,
+    RAG_IO_WORKERS,
+    RAG_MAX_FILE_SIZE,
+)
 from agentic_py.rag.exceptions import RAGFileError, RAGPathError
 
 logger = logging.getLogger(__name__)
 
+# Dedicated executor for ingestion file I/O; the default executor is capped well
+# below the queue depth that many small, I/O-bound reads can use
+_IO_EXECUTOR = ThreadPoolExecutor(
+    max_workers=RAG_IO_WORKERS,
+    thread_name_prefix="rag-io",
+)
+atexit.register(_IO_EXECUTOR.shutdown)
+
+# Recently rejected (path, base_dirs) pairs, so repeated probes fail without re-resolving
+_NEGATIVE_PATH_CACHE_SIZE = 1024
+_negative_path_cache: OrderedDict[tuple[str, tuple[str, ...] | None], str] = OrderedDict()
+_negative_path_lock = threading.Lock()
+
+
+@lru_cache(maxsize=32)
+def _resolve_base(base_dir_str: str) -> Path | None:
+    """Resolve an allowed base directory (cached). Returns None if it can't be resolved."""
+    try:
+        return Path(base_dir_str).resolve()
+    except (OSError, RuntimeError) as e:
+        logger.warning("Invalid base directory %s: %s", base_dir_str, e)
+        return None
+
+
+def _resolve_bases(base_dirs: list[str]) -> tuple[str, ...]:
+    """
+    Resolve allowed base directories to separator-terminated prefixes.
+
+    Blank and unresolvable entries are skipped. The trailing separator keeps
+    "/data/docs" from matching "/data/docs-private".
+    """
+    resolved = (_resolve_base(b) for b in base_dirs if b and b.strip())
+    return tuple(os.path.join(str(b), "") for b in resolved if b is not None)
+
+
+@cache
+def _get_default_bases() -> tuple[str, ...]:
+    """Resolve RAG_ALLOWED_BASE_DIRS once; the configured list is static."""
+    return _resolve_bases(RAG_ALLOWED_BASE_DIRS)
+
+
+def _clear_path_caches() -> None:
+    """Clear cached path resolutions (e.g. after symlinks or allowed directories change)."""
+    _resolve_base.cache_clear()
+    _get_default_bases.cache_clear()
+    with _negative_path_lock:
+        _negative_path_cache.clear()
+
+
+def _invalidate_path(path: str | Path) -> None:
+    """Forget cached rejections for a path (e.g. after it was created or moved)."""
+    path_str = os.path.join(os.getcwd(), str(path))
+    with _negative_path_lock:
+        for key in [k for k in _negative_path_cache if k[0] == path_str]:
+            del _negative_path_cache[key]
+
+
+def _reject_path(key: tuple[str, tuple[str, ...] | None], message: str) -> RAGPathError:
+    """Record a rejected path in the negative cache and build the error to raise."""
+    with _negative_path_lock:
+        _negative_path_cache[key] = message
+        if len(_negative_path_cache) > _NEGATIVE_PATH_CACHE_SIZE:
+            _negative_path_cache.popitem(last=False)
+    return RAGPathError(message)
+
 
 def validate_path(path: str | Path, base_dirs: list[str] | None = None) -> Path:
     """
@@ -29,99 +109,273 @@ def validate_path(path: str | Path, base_dirs: list[str] | None = None) -> Path:
     Raises:
         RAGPathError: If path is outside allowed directories or invalid
 
+    Note:
+        The input path is resolved on every call, so symlinks swapped in after an
+        earlier validation are always followed. Rejections and the allowed base
+        directories are cached; call validate_path.invalidate(path) once a rejected
+        path becomes valid, or validate_path.cache_clear() after the base
+        directories change.
+
     Example:
         >>> validate_path("../sensitive/file.txt", base_dirs=["/allowed/dir"])
         RAGPathError: Path is outside allowed directory
     """
     path = Path(path)
-    base_dirs = base_dirs if base_dirs is not None else RAG_ALLOWED_BASE_DIRS
+    use_defaults = base_dirs is None
+    allowed_dirs = RAG_ALLOWED_BASE_DIRS if base_dirs is None else base_dirs
+
+    # Resolve the path to handle .. and symlinks. Relative paths are anchored to the
+    # current directory first so cached entries stay correct across chdir.
+    path_str = os.path.join(os.getcwd(), str(path))
+    cache_key = (path_str, None if use_defaults else tuple(allowed_dirs))
+    with _negative_path_lock:
+        cached_error = _negative_path_cache.get(cache_key)
+        if cached_error is not None:
+            _negative_path_cache.move_to_end(cache_key)
+    if cached_error is not None:
+        raise RAGPathError(cached_error)
 
-    # Resolve the path to handle .. and symlinks
     try:
-        resolved = path.resolve()
+        resolved = Path(path_str).resolve()
     except (OSError, RuntimeError) as e:
-        raise RAGPathError(f"Failed to resolve path {path}: {e}") from e
+        raise _reject_path(cache_key, f"Failed to resolve path {path}: {e}") from e
 
     # If no base directories specified, allow all paths (no restriction)
-    if not base_dirs:
+    if not allowed_dirs:
         return resolved
 
     # Check if path is within any allowed base directory
-    is_allowed = False
-    for base_dir_str in base_dirs:
-        if not base_dir_str or not base_dir_str.strip():
-            continue
-        try:
-            base_dir = Path(base_dir_str).resolve()
-            # Use pathlib's is_relative_to if available (Python 3.9+), otherwise string comparison
-            try:
-                is_allowed = resolved.is_relative_to(base_dir)
-            except AttributeError:
-                # Fallback for Python < 3.9
-                is_allowed = str(resolved).startswith(str(base_dir))
-            if is_allowed:
-                break
-        except (OSError, RuntimeError) as e:
-            logger.warning(f"Invalid base directory {base_dir_str}: {e}")
-            continue
-
-    if not is_allowed:
-        raise RAGPathError(f"Path {resolved} is outside allowed directories. Allowed: {base_dirs}")
+    bases = _get_default_bases() if use_defaults else _resolve_bases(allowed_dirs)
+    # Both sides are resolved and separator-terminated, so a prefix check is exact.
+    # str.startswith accepts the whole tuple, checking every base in one C call.
+    if not os.path.join(str(resolved), "").startswith(bases):
+        raise _reject_path(
+            cache_key, f"Path {resolved} is outside allowed directories. Allowed: {allowed_dirs}"
+        )
 
     return resolved
 
 
-def validate_file_size(path: Path) -> None:
+validate_path.cache_clear = _clear_path_caches  # type: ignore[attr-defined]
+validate_path.invalidate = _invalidate_path  # type: ignore[attr-defined]
+
+
+def _validate_and_stat(path: str | Path, base_dirs: list[str] | None) -> tuple[Path, int]:
+    """Validate one path and return it with its size (runs in a worker thread)."""
+    resolved = validate_path(path, base_dirs=base_dirs)
+    return resolved, validate_file_size(resolved).st_size
+
+
+async def validate_paths(
+    paths: list[str | Path], base_dirs: list[str] | None = None
+) -> list[tuple[Path, int]]:
+    """
+    Validate many paths and their file sizes concurrently.
+
+    Equivalent to calling validate_path and validate_file_size for each path,
+    with resolution and stat calls spread across worker threads.
+
+    Args:
+        paths: Paths to validate
+        base_dirs: Allowed base directories (see validate_path)
+
+    Returns:
+        (resolved_path, size_in_bytes) tuples in the same order as ``paths``
+
+    Raises:
+        RAGPathError: If any path is outside allowed directories or invalid
+        RAGFileError: If any file exceeds maximum size
+        FileNotFoundError: If any file doesn't exist
+    """
+    semaphore = asyncio.Semaphore(RAG_FILE_READ_CONCURRENCY)
+
+    async def _validate(path: str | Path) -> tuple[Path, int]:
+        async with semaphore:
+            return await _to_io_thread(_validate_and_stat, path, base_dirs)
+
+    return list(await asyncio.gather(*(_validate(p) for p in paths)))
+
+
+def validate_file_size(path: Path) -> os.stat_result:
     """
     Validate that a file does not exceed the maximum allowed size.
 
+    Uses a single stat call; the result is returned so callers can reuse it.
+
     Args:
         path: Path to the file
 
+    Returns:
+        The file's stat result
+
     Raises:
-        RAGFileError: If file exceeds maximum size
+        RAGFileError: If file exceeds maximum size or cannot be stat'ed
         FileNotFoundError: If file doesn't exist
 
     Example:
         >>> validate_file_size(Path("large_file.txt"))
         RAGFileError: File exceeds maximum size
     """
-    if not path.exists():
-        raise FileNotFoundError(f"File not found: {path}")
+    try:
+        stat_info = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {path}") from None
+    except OSError as e:
+        raise RAGFileError(f"Failed to stat file {path}: {e}") from e
 
-    file_size = path.stat().st_size
-    if file_size > RAG_MAX_FILE_SIZE:
+    if stat_info.st_size > RAG_MAX_FILE_SIZE:
         raise RAGFileError(
             f"File {path} exceeds maximum size of {RAG_MAX_FILE_SIZE} bytes "
-            f"(got {file_size} bytes). Increase RAG_MAX_FILE_SIZE if needed."
+            f"(got {stat_info.st_size} bytes). Increase RAG_MAX_FILE_SIZE if needed."
         )
 
+    return stat_info
+
+
+async def _to_io_thread[**P, T](fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Run a blocking I/O call on the dedicated ingestion executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_IO_EXECUTOR, functools.partial(fn, *args, **kwargs))
+
+
+def _read_bytes(path: Path, size: int) -> bytes:
+    """Read ``size`` bytes from an unbuffered file descriptor into a single buffer."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = os.read(fd, size)
+        # Regular files normally return everything at once; only loop on short reads
+        while len(data) < size:
+            more = os.read(fd, size - len(data))
+            if not more:
+                break
+            data += more
+        return data
+    finally:
+        os.close(fd)
+
+
+# Files at least this large are decoded from a memory map instead of a read buffer
+_MMAP_THRESHOLD = 1 << 20
+
+# Checked in order: the UTF-32 LE BOM starts with the UTF-16 LE BOM
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _decode_bytes(data: bytes | mmap.mmap, encoding: str, path: Path) -> str:
+    """
+    Decode file contents once, picking the cheapest codec that is correct.
+
+    A byte-order mark selects its Unicode codec. Pure-ASCII input under a UTF-8
+    encoding takes the ASCII fast path. Anything else is decoded with
+    ``encoding``. Either codec falls back to latin-1 on failure, e.g. for data
+    that merely starts with BOM-like bytes. ``data`` may be a memory map, which
+    is decoded in place without first copying it into bytes.
+    """
+    head = data[:4]
+    codec = encoding
+    for bom, bom_encoding in _BOM_ENCODINGS:
+        if head.startswith(bom):
+            codec = bom_encoding
+            break
+    else:
+        if isinstance(data, bytes) and data.isascii() and codecs.lookup(encoding).name == "utf-8":
+            return data.decode("ascii")
+    try:
+        return str(data, codec)
+    except UnicodeDecodeError:
+        logger.warning("%s decode failed for %s, trying latin-1", codec, path)
+        return str(data, "latin-1")
+
+
+def _read_mmap_then_decode(path: Path, encoding: str) -> str:
+    """Decode a large file straight from a read-only memory map."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        with mmap.mmap(fd, 0, prot=mmap.PROT_READ) as mm:
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            return _decode_bytes(mm, encoding, path)
+    finally:
+        os.close(fd)
+
+
+def _normalize_newlines(text: str) -> str:
+    """Translate CRLF and CR line endings to LF, as text-mode reads (universal newlines) do."""
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
 
-async def read_file_async(path: Path, encoding: str = "utf-8") -> str:
+def _read_bytes_then_decode(path: Path, size: int, encoding: str) -> str:
+    """Read a file in a single call and decode it without re-reading on fallback."""
+    if size >= _MMAP_THRESHOLD:
+        # Avoids holding a full bytes copy alongside the decoded string
+        return _normalize_newlines(_read_mmap_then_decode(path, encoding))
+    return _normalize_newlines(_decode_bytes(_read_bytes(path, size), encoding, path))
+
+
+async def read_file_async(
+    path: Path, encoding: str = "utf-8", stat_info: os.stat_result | None = None
+) -> str:
     """
-    Read a file asynchronously using asyncio.to_thread.
+    Read a file asynchronously on the dedicated I/O executor.
+
+    Oversized files are rejected before any data is read.
 
     Args:
         path: Path to the file
         encoding: File encoding (default: utf-8)
+        stat_info: Stat result from validate_file_size, if the caller already has one
 
     Returns:
         File contents as string
 
     Raises:
-        RAGFileError: If file reading fails
+        RAGFileError: If file reading fails or the file exceeds RAG_MAX_FILE_SIZE
     """
     try:
-        # Use asyncio.to_thread for async execution
-        content = await asyncio.to_thread(path.read_text, encoding=encoding)
-        return content
-    except UnicodeDecodeError:
-        # Try with different encoding
-        logger.warning(f"UTF-8 decode failed for {path}, trying latin-1")
-        try:
-            content = await asyncio.to_thread(path.read_text, encoding="latin-1")
-            return content
-        except Exception as e2:
-            raise RAGFileError(f"Failed to read file {path}: {e2}") from e2
+        if stat_info is None:
+            stat_info = await _to_io_thread(validate_file_size, path)
+        elif stat_info.st_size > RAG_MAX_FILE_SIZE:
+            raise RAGFileError(
+                f"File {path} exceeds maximum size of {RAG_MAX_FILE_SIZE} bytes "
+                f"(got {stat_info.st_size} bytes). Increase RAG_MAX_FILE_SIZE if needed."
+            )
+        return await _to_io_thread(_read_bytes_then_decode, path, stat_info.st_size, encoding)
     except (PermissionError, OSError) as e:
         raise RAGFileError(f"Failed to read file {path}: {e}") from e
+
+
+async def read_files_async(
+    paths: list[Path], encoding: str = "utf-8", concurrency: int | None = None
+) -> list[str]:
+    """
+    Read many files concurrently, preserving input order.
+
+    At most ``concurrency`` reads are in flight at once so large ingestion runs
+    don't flood the thread pool.
+
+    Args:
+        paths: Paths to read
+        encoding: File encoding (default: utf-8)
+        concurrency: Maximum concurrent reads (default: RAG_FILE_READ_CONCURRENCY)
+
+    Returns:
+        File contents in the same order as ``paths``
+
+    Raises:
+        RAGFileError: If any file fails to read
+    """
+    semaphore = asyncio.Semaphore(concurrency or RAG_FILE_READ_CONCURRENCY)
+
+    async def _read(path: Path) -> str:
+        async with semaphore:
+            return await read_file_async(path, encoding=encoding)
+
+    return list(await asyncio.gather(*(_read(p) for p in paths)))
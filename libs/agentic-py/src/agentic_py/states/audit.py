@@ -4,7 +4,9 @@ Code Audit State
 State definition for the Code Audit Workflow.
 """
 
-from typing import Any, TypedDict
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
+from typing import Any, TypedDict, cast
 
 
 class AuditState(TypedDict, total=False):
@@ -22,12 +24,34 @@ class AuditState(TypedDict, total=False):
     file_extensions: set[str]  # File extensions in diff
     added_lines: int  # Count of added lines
     removed_lines: int  # Count of removed lines
+    diff_added_lines: list[tuple[int, str]]  # (diff line number, content) of each added line
+    is_binary: bool  # Set by parse_diff when the diff is a binary file
     violation_details: list[dict[str, Any]]  # Enhanced violation information
     # Tool call results (for agentic workflows)
     retrieved_context: str | None
     tool_calls: list[dict] | None
 
 
+# Defaults for audit state fields that may be missing (containers are handled separately)
+_AUDIT_STATE_DEFAULTS: Mapping[str, Any] = MappingProxyType(
+    {
+        "diff_content": "",
+        "status": "pending",
+        "added_lines": 0,
+        "removed_lines": 0,
+        "retrieved_context": None,
+        "tool_calls": None,
+    }
+)
+_AUDIT_STATE_CONTAINER_FIELDS: tuple[tuple[str, Callable[[], Any]], ...] = (
+    ("violations", list),
+    ("parsed_files", list),
+    ("parsed_hunks", list),
+    ("file_extensions", set),
+    ("violation_details", list),
+)
+
+
 def validate_audit_state(state: AuditState) -> AuditState:
     """
     Validate and normalize audit state structure.
@@ -44,15 +68,12 @@ def validate_audit_state(state: AuditState) -> AuditState:
     Raises:
         ValueError: If state structure is invalid
     """
-    validated = state.copy()
-
-    # Ensure required fields have defaults
-    if "diff_content" not in validated:
-        validated["diff_content"] = ""
-    if "violations" not in validated:
-        validated["violations"] = []
-    if "status" not in validated:
-        validated["status"] = "pending"
+    # Missing fields are filled from the defaults table in a single merge; list and set
+    # fields get a fresh container per call so states never share them
+    validated = {**_AUDIT_STATE_DEFAULTS, **state}
+    for field, factory in _AUDIT_STATE_CONTAINER_FIELDS:
+        if field not in validated:
+            validated[field] = factory()
 
     # Validate types
     if not isinstance(validated["diff_content"], str):
@@ -62,22 +83,4 @@ def validate_audit_state(state: AuditState) -> AuditState:
     if validated["status"] not in ("pass", "fail", "pending", "remediation_required"):
         raise ValueError(f"Invalid status: {validated['status']}")
 
-    # Ensure optional fields have defaults if missing
-    if "parsed_files" not in validated:
-        validated["parsed_files"] = []
-    if "parsed_hunks" not in validated:
-        validated["parsed_hunks"] = []
-    if "file_extensions" not in validated:
-        validated["file_extensions"] = set()
-    if "added_lines" not in validated:
-        validated["added_lines"] = 0
-    if "removed_lines" not in validated:
-        validated["removed_lines"] = 0
-    if "violation_details" not in validated:
-        validated["violation_details"] = []
-    if "retrieved_context" not in validated:
-        validated["retrieved_context"] = None
-    if "tool_calls" not in validated:
-        validated["tool_calls"] = None
-
-    return validated
+    return cast(AuditState, validated)
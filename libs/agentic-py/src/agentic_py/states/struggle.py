@@ -4,7 +4,9 @@ Struggle Detection State
 State definition for the Struggle Detection Workflow.
 """
 
-from typing import Literal, TypedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Literal, TypedDict, cast
 
 # Signal types supported by the enhanced detection system
 SignalType = Literal["undo_redo", "time_pattern", "terminal", "debug", "semantic", "edit_pattern"]
@@ -55,6 +57,33 @@ class StruggleState(TypedDict, total=False):
     code_snippet: str | None
 
 
+# Defaults for struggle state fields that may be missing (list fields are handled separately)
+_STRUGGLE_STATE_DEFAULTS: Mapping[str, Any] = MappingProxyType(
+    {
+        # Core struggle indicators
+        "edit_frequency": 0.0,
+        "is_struggling": False,
+        "lesson_recommendation": None,
+        "retrieved_context": None,
+        "tool_calls": None,
+        # Enhanced signal fields
+        "combined_score": None,
+        "primary_signal": None,
+        "signals": None,
+        "undo_redo_pattern": None,
+        "hesitation_ms": None,
+        "terminal_errors": None,
+        "debug_breakpoint_changes": None,
+        # Client context
+        "source": None,
+        "file_path": None,
+        "language_id": None,
+        "code_snippet": None,
+    }
+)
+_STRUGGLE_STATE_LIST_FIELDS = ("error_logs", "history")
+
+
 def validate_struggle_state(state: StruggleState) -> StruggleState:
     """
     Validate and normalize struggle state structure.
@@ -71,49 +100,12 @@ def validate_struggle_state(state: StruggleState) -> StruggleState:
     Raises:
         ValueError: If state structure is invalid
     """
-    validated = state.copy()
-
-    # Ensure required fields have defaults
-    if "edit_frequency" not in validated:
-        validated["edit_frequency"] = 0.0
-    if "error_logs" not in validated:
-        validated["error_logs"] = []
-    if "history" not in validated:
-        validated["history"] = []
-    if "is_struggling" not in validated:
-        validated["is_struggling"] = False
-    if "lesson_recommendation" not in validated:
-        validated["lesson_recommendation"] = None
-    if "retrieved_context" not in validated:
-        validated["retrieved_context"] = None
-    if "tool_calls" not in validated:
-        validated["tool_calls"] = None
-
-    # Enhanced signal fields defaults
-    if "combined_score" not in validated:
-        validated["combined_score"] = None
-    if "primary_signal" not in validated:
-        validated["primary_signal"] = None
-    if "signals" not in validated:
-        validated["signals"] = None
-    if "undo_redo_pattern" not in validated:
-        validated["undo_redo_pattern"] = None
-    if "hesitation_ms" not in validated:
-        validated["hesitation_ms"] = None
-    if "terminal_errors" not in validated:
-        validated["terminal_errors"] = None
-    if "debug_breakpoint_changes" not in validated:
-        validated["debug_breakpoint_changes"] = None
-
-    # Client context defaults
-    if "source" not in validated:
-        validated["source"] = None
-    if "file_path" not in validated:
-        validated["file_path"] = None
-    if "language_id" not in validated:
-        validated["language_id"] = None
-    if "code_snippet" not in validated:
-        validated["code_snippet"] = None
+    # Missing fields are filled from the defaults table in a single merge; list fields
+    # get a fresh list per call so states never share them
+    validated = {**_STRUGGLE_STATE_DEFAULTS, **state}
+    for field in _STRUGGLE_STATE_LIST_FIELDS:
+        if field not in validated:
+            validated[field] = []
 
     # Validate types
     if not isinstance(validated["edit_frequency"], int | float):
@@ -153,4 +145,4 @@ def validate_struggle_state(state: StruggleState) -> StruggleState:
         if validated["debug_breakpoint_changes"] < 0:
             raise ValueError("debug_breakpoint_changes must be non-negative")
 
-    return validated
+    return cast(StruggleState, validated)
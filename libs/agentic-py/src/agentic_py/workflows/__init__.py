@@ -1,12 +1,15 @@
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from agentic_py.states.audit import AuditState, validate_audit_state
 from agentic_py.states.struggle import StruggleState, validate_struggle_state
 
-# Import workflow builders (avoid circular import by importing after state imports)
-from agentic_py.workflows.audit import build_audit_graph  # noqa: E402
-from agentic_py.workflows.struggle import build_struggle_graph  # noqa: E402
-from agentic_py.workflows.struggle_agentic import build_struggle_graph_agentic  # noqa: E402
+if TYPE_CHECKING:
+    from agentic_py.workflows.audit import build_audit_graph
+    from agentic_py.workflows.struggle import build_struggle_graph
+    from agentic_py.workflows.struggle_agentic import build_struggle_graph_agentic
 
-__all__ = [
+__all__ = (
     "build_struggle_graph",
     "build_struggle_graph_agentic",
     "StruggleState",
@@ -14,4 +17,22 @@ __all__ = [
     "build_audit_graph",
     "AuditState",
     "validate_audit_state",
-]
+)
+
+# Graph builders pull in LangGraph and the LLM stack, so they're imported on first use.
+# Maps attribute name -> (submodule, attribute).
+_LAZY_ATTRS = {
+    "build_audit_graph": ("audit", "build_audit_graph"),
+    "build_struggle_graph": ("struggle", "build_struggle_graph"),
+    "build_struggle_graph_agentic": ("struggle_agentic", "build_struggle_graph_agentic"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module_name}", __name__), attr)
+    globals()[name] = value
+    return value
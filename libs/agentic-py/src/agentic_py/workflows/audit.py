@@ -6,18 +6,113 @@ It parses diffs and checks for violations against coding standards.
 """
 
 import ast
+import asyncio
+import hashlib
+import heapq
+import json
 import logging
+import os
 import re
-from typing import Any
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from dataclasses import dataclass
+from functools import cache, lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, cast
 
+import orjson
 from langgraph.graph import END, StateGraph
 
-from agentic_py.config.workflows import AUDIT_FUNCTION_LENGTH_THRESHOLD
-from agentic_py.prompts.loader import load_prompt
+from agentic_py.config.workflows import (
+    AUDIT_FUNCTION_LENGTH_THRESHOLD,
+    AUDIT_PARSE_CACHE_SIZE,
+)
+from agentic_py.prompts.loader import load_prompt, load_prompt_renderer
+from agentic_py.prompts.remediations import render_remediation
 from agentic_py.states.audit import AuditState
 
 logger = logging.getLogger(__name__)
 
+# Unified diff file headers: --- a/path and +++ b/path. Kept as two patterns so the
+# caller's prefix check picks one instead of the engine trying an alternation.
+_OLD_HEADER_RE = re.compile(r"^---\s+(.+?)(?:\s+\d{4}-\d{2}-\d{2})?\s*$")
+_NEW_HEADER_RE = re.compile(r"^\+\+\+\s+(.+?)(?:\s+\d{4}-\d{2}-\d{2})?\s*$")
+
+# Hardcoded secret patterns (basic patterns), fused into one alternation so each
+# line is scanned once; the named group that matched selects the message.
+# Quoted values are capped at 256 characters so long generated lines (minified JS,
+# base64 blobs) can't make each match attempt scan to the end of the line.
+# ML Engineer will optimize these patterns
+_SECRET_VALUE = r'["\'][^"\'\n]{1,256}["\']'
+_SECRET_PATTERNS = {
+    "password": (rf"password\s*=\s*{_SECRET_VALUE}", "Hardcoded password detected"),
+    "api_key": (rf"api_key\s*=\s*{_SECRET_VALUE}", "Hardcoded API key detected"),
+    "secret": (rf"secret\s*=\s*{_SECRET_VALUE}", "Hardcoded secret detected"),
+    "token": (rf"token\s*=\s*{_SECRET_VALUE}", "Hardcoded token detected"),
+}
+_SECRET_UNION_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, (pattern, _) in _SECRET_PATTERNS.items()),
+    re.IGNORECASE,
+)
+_SECRET_MESSAGES = {name: message for name, (_, message) in _SECRET_PATTERNS.items()}
+# Literal each secret pattern starts with (its name). Searching a casefolded line for
+# these is far cheaper than a case-insensitive regex search, so lines mentioning none
+# of them skip the regex entirely.
+_SECRET_KEYWORDS = tuple(_SECRET_PATTERNS)
+
+# Maps control characters other than tab, newline and carriage return to 1, all else to 0
+_NONPRINT_TABLE = bytes(1 if i < 32 and i not in (9, 10, 13) else 0 for i in range(256))
+
+# Path-segment indicators for test and config files
+_TEST_DIRS = frozenset({"test", "tests"})
+_TEST_PREFIXES = ("test_",)
+_TEST_SUFFIXES = ("_test",)
+_CONFIG_DIRS = frozenset({"config"})
+_CONFIG_NAME_PREFIXES = (".env", "settings.", "conf.")
+
+# Calls that run arbitrary code or shell commands: builtins by name, plus os.system
+_DYNAMIC_EXECUTION_BUILTINS = frozenset({"eval", "exec"})
+
+# Remediation cache keys: numeric literals are dropped so the same fix is reused
+# across, e.g., different timeouts or port numbers
+_NUMERIC_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+# Diffs larger than this are parsed on every call rather than kept in the parse cache
+_PARSE_CACHE_MAX_DIFF_CHARS = 200_000
+
+# Batched violation analysis: approximate token budget per prompt (~4 characters per
+# token) and how much of the diff is included as shared context
+_ANALYSIS_MAX_PROMPT_TOKENS = 6000
+_ANALYSIS_DIFF_CONTEXT_CHARS = 4000
+
+
+@dataclass(slots=True)
+class ViolationDetail:
+    """A single detected violation.
+
+    Used while checking and filtering; check_violations converts each one to a dict
+    for the workflow state.
+    """
+
+    file_path: str
+    line_number: int
+    severity: str
+    rule_name: str
+    message: str
+    remediation: str
+    code_context: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the violation as a plain dictionary."""
+        return {
+            "file_path": self.file_path,
+            "line_number": self.line_number,
+            "severity": self.severity,
+            "rule_name": self.rule_name,
+            "message": self.message,
+            "remediation": self.remediation,
+            "code_context": self.code_context,
+        }
+
 
 def parse_diff(state: AuditState) -> AuditState:
     """
@@ -29,14 +124,50 @@ def parse_diff(state: AuditState) -> AuditState:
     - Code blocks (added/removed lines)
     - File extensions for language-specific checks
 
+    Parse results are cached by diff content, so re-auditing the same diff (e.g. a
+    retry after an LLM failure) skips parsing. Each call gets its own copies of the
+    parsed containers, so callers may mutate them freely.
+
     Args:
         state: Current workflow state with diff_content
 
     Returns:
         Updated state with parsed diff information
     """
-    diff_content = state.get("diff_content", "")
+    diff_content = state.get("diff_content") or ""
+    if len(diff_content) > _PARSE_CACHE_MAX_DIFF_CHARS:
+        return _parse_diff_content(diff_content)
+    return _copy_parse_result(_parse_diff_content_cached(diff_content))
+
+
+def _copy_parse_result(cached: AuditState) -> AuditState:
+    """Copy a cached parse result down to the line lists, so callers can't alter the cache."""
+    result = AuditState(**cached)
+    result["parsed_files"] = [dict(f) for f in cached.get("parsed_files", [])]
+    result["parsed_hunks"] = [
+        {
+            **hunk,
+            "added_lines": list(hunk["added_lines"]),
+            "removed_lines": list(hunk["removed_lines"]),
+        }
+        for hunk in cached.get("parsed_hunks", [])
+    ]
+    result["file_extensions"] = set(cached.get("file_extensions", ()))
+    if "diff_added_lines" in cached:
+        result["diff_added_lines"] = list(cached["diff_added_lines"])
+    return result
+
 
+def _parse_diff_content(diff_content: str) -> AuditState:
+    """
+    Parse unified diff content into the parse_diff state update.
+
+    Args:
+        diff_content: Raw unified diff
+
+    Returns:
+        Parsed diff information
+    """
     if not diff_content or not diff_content.strip():
         logger.debug("Empty diff content, returning empty parsed data")
         return {
@@ -59,8 +190,12 @@ def parse_diff(state: AuditState) -> AuditState:
     ):
         is_binary = True
     elif len(diff_content) > 100:
-        # Check for high ratio of non-printable characters (excluding newlines and tabs)
-        non_printable = sum(1 for c in diff_content if ord(c) < 32 and c not in "\n\r\t")
+        # Check for high ratio of non-printable characters (excluding newlines and tabs).
+        # Counted with bytes.translate so the scan runs in C rather than per character;
+        # characters outside latin-1 become "?" which is printable.
+        non_printable = (
+            diff_content.encode("latin-1", "replace").translate(_NONPRINT_TABLE).count(1)
+        )
         if non_printable / len(diff_content) > 0.1:  # More than 10% non-printable
             is_binary = True
 
@@ -77,6 +212,7 @@ def parse_diff(state: AuditState) -> AuditState:
             "file_extensions": set(),
             "added_lines": 0,
             "removed_lines": 0,
+            "is_binary": True,
         }
 
     if has_merge_conflicts:
@@ -91,14 +227,6 @@ def parse_diff(state: AuditState) -> AuditState:
     total_added = 0
     total_removed = 0
 
-    # Pattern for unified diff file header: --- a/path or +++ b/path
-    file_header_pattern = re.compile(
-        r"^---\s+(.+?)(?:\s+\d{4}-\d{2}-\d{2})?\s*$|^\+\+\+\s+(.+?)(?:\s+\d{4}-\d{2}-\d{2})?\s*$"
-    )
-    # Pattern for hunk header: @@ -old_start,old_count +new_start,new_count @@
-    hunk_header_pattern = re.compile(r"^@@\s+-(\d+)(?:,(\d+))?\s+\+(\d+)(?:,(\d+))?\s+@@")
-
-    lines = diff_content.split("\n")
     current_file = None
     current_old_path = None
     current_new_path = None
@@ -106,20 +234,35 @@ def parse_diff(state: AuditState) -> AuditState:
     in_hunk = False
     hunk_added_lines: list[str] = []
     hunk_removed_lines: list[str] = []
+    # Added lines with their 1-based line number in the diff, reused by the pattern checks
+    diff_added_lines: list[tuple[int, str]] = []
+    # Bound append methods for the per-line hot path; rebound whenever a new hunk starts
+    append_diff_added = diff_added_lines.append
+    append_hunk_added = hunk_added_lines.append
+    append_hunk_removed = hunk_removed_lines.append
+
+    for line_num, line in enumerate(_iter_lines(diff_content), start=1):
+        # Dispatch on the first character, testing the common case (context) first.
+        # Regexes only run on the few lines that can be headers.
+        first = line[:1]
+        if first == " " or not first:
+            # Context line (unchanged) or empty line in diff, we can track if needed
+            continue
 
-    for line in lines:
-        # Check for file header (--- or +++)
-        file_match = file_header_pattern.match(line)
-        if file_match:
-            if line.startswith("---"):
-                current_old_path = file_match.group(1)
-                # Remove a/ or b/ prefix if present
-                if current_old_path.startswith("a/"):
-                    current_old_path = current_old_path[2:]
-                elif current_old_path.startswith("/dev/null"):
-                    current_old_path = None
-            elif line.startswith("+++"):
-                current_new_path = file_match.group(2)
+        if first == "+":
+            if line[:3] != "+++":
+                # Added line (skip the + prefix)
+                content = line[1:]
+                append_diff_added((line_num, content))
+                if in_hunk and current_hunk is not None:
+                    append_hunk_added(content)
+                    total_added += 1
+                continue
+
+            # Check for new file header (+++)
+            file_match = _NEW_HEADER_RE.match(line)
+            if file_match:
+                current_new_path = file_match.group(1)
                 # Remove a/ or b/ prefix if present
                 if current_new_path.startswith("b/"):
                     current_new_path = current_new_path[2:]
@@ -143,24 +286,35 @@ def parse_diff(state: AuditState) -> AuditState:
                         current_file = file_path
             continue
 
+        if first == "-":
+            if line[:3] != "---":
+                # Removed line (skip the - prefix)
+                if in_hunk and current_hunk is not None:
+                    append_hunk_removed(line[1:])
+                    total_removed += 1
+                continue
+
+            # Check for old file header (---)
+            file_match = _OLD_HEADER_RE.match(line)
+            if file_match:
+                current_old_path = file_match.group(1)
+                # Remove a/ or b/ prefix if present
+                if current_old_path.startswith("a/"):
+                    current_old_path = current_old_path[2:]
+                elif current_old_path.startswith("/dev/null"):
+                    current_old_path = None
+            continue
+
         # Check for hunk header
-        hunk_match = hunk_header_pattern.match(line)
-        if hunk_match:
+        hunk_range = _parse_hunk_header(line) if first == "@" else None
+        if hunk_range:
             # Save previous hunk if exists
             if current_hunk is not None and in_hunk:
                 current_hunk["added_lines"] = hunk_added_lines
                 current_hunk["removed_lines"] = hunk_removed_lines
                 parsed_hunks.append(current_hunk)
 
-            try:
-                old_start = int(hunk_match.group(1))
-                old_count = int(hunk_match.group(2)) if hunk_match.group(2) else 1
-                new_start = int(hunk_match.group(3))
-                new_count = int(hunk_match.group(4)) if hunk_match.group(4) else 1
-            except (ValueError, IndexError) as e:
-                logger.warning(f"Failed to parse hunk header: {line}, error: {e}")
-                continue
-
+            old_start, old_count, new_start, new_count = hunk_range
             current_hunk = {
                 "file_path": current_file,
                 "old_start": old_start,
@@ -172,27 +326,9 @@ def parse_diff(state: AuditState) -> AuditState:
             }
             hunk_added_lines = []
             hunk_removed_lines = []
+            append_hunk_added = hunk_added_lines.append
+            append_hunk_removed = hunk_removed_lines.append
             in_hunk = True
-            continue
-
-        # Process hunk content
-        if in_hunk and current_hunk is not None:
-            if line.startswith("+") and not line.startswith("+++"):
-                # Added line (skip the + prefix, but not +++ file headers)
-                content = line[1:]
-                hunk_added_lines.append(content)
-                total_added += 1
-            elif line.startswith("-") and not line.startswith("---"):
-                # Removed line (skip the - prefix, but not --- file headers)
-                content = line[1:]
-                hunk_removed_lines.append(content)
-                total_removed += 1
-            elif line.startswith(" "):
-                # Context line (unchanged), we can track if needed
-                pass
-            elif line.strip() == "":
-                # Empty line in diff
-                pass
 
     # Save last hunk if exists
     if current_hunk is not None and in_hunk:
@@ -217,9 +353,65 @@ def parse_diff(state: AuditState) -> AuditState:
         "file_extensions": file_extensions,
         "added_lines": total_added,
         "removed_lines": total_removed,
+        "diff_added_lines": diff_added_lines,
     }
 
 
+_parse_diff_content_cached = lru_cache(maxsize=AUDIT_PARSE_CACHE_SIZE)(_parse_diff_content)
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """
+    Lazily yield the same lines as ``text.split("\n")``.
+
+    Avoids materializing a list of every line for large diffs; each line is a
+    slice that can be freed as soon as the caller moves on.
+    """
+    start = 0
+    end = len(text)
+    find = text.find
+    while start <= end:
+        newline = find("\n", start)
+        if newline < 0:
+            newline = end
+        yield text[start:newline]
+        start = newline + 1
+
+
+def _parse_hunk_header(line: str) -> tuple[int, int, int, int] | None:
+    """
+    Parse a hunk header of the form ``@@ -old_start,old_count +new_start,new_count @@``.
+
+    The format is fixed, so it is split on whitespace rather than matched with a
+    regex. Counts default to 1 when omitted.
+
+    Args:
+        line: Diff line starting with "@"
+
+    Returns:
+        Tuple of (old_start, old_count, new_start, new_count), or None if the line
+        is not a well-formed hunk header
+    """
+    parts = line.split(None, 3)
+    if len(parts) < 4 or parts[0] != "@@" or not parts[3].startswith("@@"):
+        return None
+    old_range = _parse_hunk_range(parts[1], "-")
+    new_range = _parse_hunk_range(parts[2], "+")
+    if old_range is None or new_range is None:
+        return None
+    return old_range + new_range
+
+
+def _parse_hunk_range(text: str, sign: str) -> tuple[int, int] | None:
+    """Parse one ``-start[,count]`` or ``+start[,count]`` hunk header range."""
+    if text[:1] != sign:
+        return None
+    start, comma, count = text[1:].partition(",")
+    if not start.isdecimal() or (comma and not count.isdecimal()):
+        return None
+    return int(start), int(count) if comma else 1
+
+
 def _extract_extension(file_path: str) -> str | None:
     """
     Extract file extension from file path.
@@ -232,12 +424,10 @@ def _extract_extension(file_path: str) -> str | None:
     """
     if not file_path:
         return None
-    # Handle paths with dots (e.g., .github/workflows/file.yml)
-    parts = file_path.split("/")
-    filename = parts[-1]
-    if "." in filename:
-        return filename.split(".")[-1].lower()
-    return None
+    # Only look at the last path segment to handle directories with dots
+    # (e.g., .github/workflows/file.yml)
+    _, dot, ext = file_path.rpartition("/")[2].rpartition(".")
+    return ext.lower() if dot else None
 
 
 async def check_violations(state: AuditState) -> AuditState:
@@ -256,130 +446,212 @@ async def check_violations(state: AuditState) -> AuditState:
     Returns:
         Updated state with violations list, status, and violation details
     """
-    violations = []
-    violation_details = []
+    violation_details = [detail async for detail in iter_violations(state)]
+    violations = [detail["message"] for detail in violation_details]
+    status = "fail" if violations else "pass"
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Violation check completed",
+            extra={
+                "violation_count": len(violations),
+                "status": status,
+                "diff_length": len(state.get("diff_content", "")),
+                "files_checked": len(state.get("parsed_files", [])),
+            },
+        )
+
+    return {"violations": violations, "status": status, "violation_details": violation_details}
+
+
+async def iter_violations(state: AuditState) -> AsyncIterator[dict[str, Any]]:
+    """
+    Check the diff for violations, yielding each one that survives false positive filtering.
+
+    Yields the same violations, in the same order, as check_violations returns.
+    Violations settled by heuristics are yielded as soon as the scans finish, before
+    any that need LLM analysis, so callers that only count or forward violations
+    don't have to hold the whole list.
+
+    Args:
+        state: Current workflow state with diff_content and parsed information
+
+    Yields:
+        Violation details as dictionaries
+    """
     diff_content = state.get("diff_content", "")
     parsed_hunks = state.get("parsed_hunks", [])
     parsed_files = state.get("parsed_files", [])
 
+    # Nothing parsed and nothing to scan: skip the checks and the filtering entirely
+    if not parsed_files and not parsed_hunks and not diff_content.strip():
+        logger.debug("Empty diff content, skipping violation checks")
+        return
+
+    # parse_diff found a binary file, so no code was added; don't rescan the raw diff
+    # content. Hunkless text diffs (e.g. a bare "+line" snippet) still get the pattern scan.
+    if state.get("is_binary"):
+        logger.debug("Binary diff, skipping violation checks")
+        return
+
+    violation_details: list[ViolationDetail] = []
+
     # Get file extensions to determine which checks to run
     file_extensions = state.get("file_extensions", set())
 
-    # Check Python files using AST parsing
+    # The AST and pattern checks are independent, so they run side by side in worker
+    # threads. This keeps the event loop free while large diffs are checked.
+    scans = []
     if "py" in file_extensions:
-        violations_py, details_py = _check_python_violations(parsed_hunks, parsed_files)
-        violations.extend(violations_py)
-        violation_details.extend(details_py)
-
-    # Basic pattern-based checks for all files
-    violations_pattern, details_pattern = _check_pattern_violations(diff_content)
-    violations.extend(violations_pattern)
-    violation_details.extend(details_pattern)
-
-    # Apply context-aware filtering to reduce false positives
-    if violation_details:
-        violation_details = await _filter_false_positives(
-            violation_details, parsed_files, parsed_hunks, file_extensions
+        # Parse results are shared across hunks for this run, so code blocks repeated
+        # across commits are parsed once
+        parse_cache: dict[str, ast.AST | None] = {}
+        scans.append(
+            asyncio.to_thread(_check_python_violations, parsed_hunks, parsed_files, parse_cache)
         )
-        # Rebuild violations list from filtered details
-        violations = [detail["message"] for detail in violation_details]
-
-    status = "fail" if violations else "pass"
-
-    logger.info(
-        "Violation check completed",
-        extra={
-            "violation_count": len(violations),
-            "status": status,
-            "diff_length": len(diff_content),
-            "files_checked": len(parsed_files),
-        },
+    # Basic pattern-based checks for all files
+    scans.append(
+        asyncio.to_thread(_check_pattern_violations, diff_content, state.get("diff_added_lines"))
     )
 
-    return {
-        "violations": violations,
-        "status": status,
-        "violation_details": violation_details,
-    }
+    for _, details_scan in await asyncio.gather(*scans):
+        violation_details.extend(details_scan)
+
+    # Apply context-aware filtering to reduce false positives
+    async for detail in _iter_true_positives(violation_details):
+        yield detail.to_dict()
 
 
 def _check_python_violations(
     parsed_hunks: list[dict[str, Any]],
-    parsed_files: list[dict[str, Any]],  # noqa: ARG001
-) -> tuple[list[str], list[dict[str, Any]]]:
+    parsed_files: list[dict[str, Any]],
+    parse_cache: dict[str, ast.AST | None] | None = None,
+) -> tuple[list[str], list[ViolationDetail]]:
     """
     Check Python-specific violations using AST parsing.
 
     Args:
         parsed_hunks: List of parsed diff hunks
-        parsed_files: List of parsed file information (reserved for future use)
+        parsed_files: List of parsed file information, used to select Python files
+        parse_cache: Parse results keyed by source text (None for a syntax error),
+            shared by the caller across calls. A fresh cache is used when omitted.
 
     Returns:
         Tuple of (violations list, violation details list)
     """
     violations = []
-    violation_details = []
+    violation_details: list[ViolationDetail] = []
+
+    # Only hunks from .py files with added lines are worth handing to ast.parse
+    py_files = {f["new_path"] or f["old_path"] for f in parsed_files if f.get("extension") == "py"}
+    py_hunks = [
+        hunk
+        for hunk in parsed_hunks
+        if hunk.get("file_path", "unknown") in py_files and hunk.get("added_lines")
+    ]
+    if parse_cache is None:
+        parse_cache = {}
 
-    # Process each hunk that contains Python code
-    for hunk in parsed_hunks:
-        file_path = hunk.get("file_path", "unknown")
-        added_lines = hunk.get("added_lines", [])
+    for hunk in py_hunks:
+        violations_hunk, details_hunk = _process_one_hunk(hunk, parse_cache)
+        violations.extend(violations_hunk)
+        violation_details.extend(details_hunk)
 
-        # Combine added lines to form code blocks for AST parsing
-        if not added_lines:
-            continue
+    return violations, violation_details
 
-        code_block = "\n".join(added_lines)
-
-        # Try to parse as Python code
-        # Strip common leading whitespace to handle indented code blocks
-        lines = code_block.split("\n")
-        if lines:
-            # Find minimum indentation (excluding empty lines)
-            non_empty_lines = [line for line in lines if line.strip()]
-            if non_empty_lines:
-                min_indent = min(len(line) - len(line.lstrip()) for line in non_empty_lines)
-                # Strip common indentation
-                dedented_lines = [
-                    line[min_indent:] if len(line) > min_indent else line for line in lines
-                ]
-                code_block_dedented = "\n".join(dedented_lines)
-            else:
-                code_block_dedented = code_block
-        else:
-            code_block_dedented = code_block
-
-        # Try to parse as Python code
-        parsed = False
-        for attempt in [
-            code_block_dedented,  # Try with dedented code
-            code_block,  # Try as-is
-            f"def _temp_check():\n{code_block}",  # Try wrapped in function
-        ]:
-            try:
-                tree = ast.parse(attempt, filename=file_path)
-                wrapped = attempt.startswith("def _temp_check()")
-                violations_ast, details_ast = _check_ast_violations(tree, file_path, hunk, wrapped)
-                violations.extend(violations_ast)
-                violation_details.extend(details_ast)
-                parsed = True
-                break
-            except SyntaxError:
+
+def _process_one_hunk(
+    hunk: dict[str, Any], parse_cache: dict[str, ast.AST | None] | None = None
+) -> tuple[list[str], list[ViolationDetail]]:
+    """
+    Check the added lines of a single Python hunk using AST parsing.
+
+    Args:
+        hunk: Parsed diff hunk from a Python file
+        parse_cache: Parse results keyed by source text, shared across hunks.
+            A fresh cache is used when omitted.
+
+    Returns:
+        Tuple of (violations list, violation details list)
+    """
+    file_path = hunk.get("file_path", "unknown")
+    added_lines = hunk.get("added_lines", [])
+
+    # Combine added lines to form code blocks for AST parsing
+    if not added_lines:
+        return [], []
+    if parse_cache is None:
+        parse_cache = {}
+
+    code_block = "\n".join(added_lines)
+
+    # Try to parse as Python code
+    # Strip common leading whitespace to handle indented code blocks.
+    # Find minimum indentation (excluding blank lines) in a single pass over the
+    # added lines; lstrip() returns the line itself when there is nothing to strip.
+    min_indent = None
+    for line in added_lines:
+        content_len = len(line.lstrip())
+        if content_len:
+            indent = len(line) - content_len
+            if min_indent is None or indent < min_indent:
+                min_indent = indent
+                if not indent:
+                    break
+
+    if min_indent:
+        # Strip common indentation
+        code_block_dedented = "\n".join(
+            line[min_indent:] if len(line) > min_indent else line for line in added_lines
+        )
+    else:
+        code_block_dedented = code_block
+
+    # Try to parse as Python code
+    attempts = [code_block_dedented]  # Try with dedented code
+    if code_block != code_block_dedented:
+        attempts.append(code_block)  # Try as-is
+    attempts.append(f"def _temp_check():\n{code_block}")  # Try wrapped in function
+
+    for attempt in attempts:
+        try:
+            tree = _parse_cached(attempt, file_path, parse_cache)
+            if tree is None:
                 continue
-            except Exception as e:
-                logger.warning(f"Error parsing Python AST for {file_path}: {e}")
-                break
+            wrapped = attempt.startswith("def _temp_check()")
+            return _check_ast_violations(tree, file_path, hunk, wrapped)
+        except Exception as e:
+            logger.warning(f"Error parsing Python AST for {file_path}: {e}")
+            break
 
-        if not parsed:
-            # Not valid Python syntax, skip AST checks but do pattern checks
-            logger.debug(f"Could not parse as Python AST: {file_path}")
+    # Not valid Python syntax, skip AST checks but do pattern checks
+    logger.debug("Could not parse as Python AST: %s", file_path)
+    return [], []
 
-    return violations, violation_details
+
+def _parse_cached(
+    source: str, file_path: str, parse_cache: dict[str, ast.AST | None]
+) -> ast.AST | None:
+    """
+    Parse Python source, reusing an earlier result for identical source.
+
+    Returns None if the source is not valid Python syntax.
+    """
+    try:
+        return parse_cache[source]
+    except KeyError:
+        pass
+    try:
+        tree = ast.parse(source, filename=file_path)
+    except SyntaxError:
+        tree = None
+    parse_cache[source] = tree
+    return tree
 
 
 def _check_ast_violations(
     tree: ast.AST, file_path: str, hunk: dict[str, Any], wrapped_in_function: bool = False
-) -> tuple[list[str], list[dict[str, Any]]]:
+) -> tuple[list[str], list[ViolationDetail]]:
     """
     Check violations using AST analysis.
 
@@ -393,108 +665,125 @@ def _check_ast_violations(
         Tuple of (violations list, violation details list)
     """
     new_start = hunk.get("new_start", 1)
+    violations: list[str] = []
+    details: list[ViolationDetail] = []
+    # If wrapped in function, offset by 1 for the function definition line
+    line_offset = new_start - (2 if wrapped_in_function else 1)
 
-    class ViolationVisitor(ast.NodeVisitor):
-        def __init__(self):
-            self.violations = []
-            self.details = []
-            # If wrapped in function, offset by 1 for the function definition line
-            self.line_offset = new_start - (2 if wrapped_in_function else 1)
-
-        def visit_Call(self, node):
-            # Check for print statements
-            if isinstance(node.func, ast.Name) and node.func.id == "print":
-                line_no = node.lineno + self.line_offset
-                msg = "Avoid using print statements in production code. Use logging instead."
-                self.violations.append(msg)
-                self.details.append(
-                    {
-                        "file_path": file_path,
-                        "line_number": line_no,
-                        "severity": "error",
-                        "rule_name": "no_print_statements",
-                        "message": msg,
-                        "remediation": "Replace print() with logger.debug() or logger.info()",
-                    }
-                )
-
-            # Check for debugger calls
-            if isinstance(node.func, ast.Name) and node.func.id in ("pdb", "ipdb", "breakpoint"):
-                line_no = node.lineno + self.line_offset
-                msg = f"Avoid using {node.func.id} debugger calls in production code."
-                self.violations.append(msg)
-                self.details.append(
-                    {
-                        "file_path": file_path,
-                        "line_number": line_no,
-                        "severity": "error",
-                        "rule_name": "no_debugger_calls",
-                        "message": msg,
-                        "remediation": "Remove debugger calls before committing",
-                    }
+    # If wrapped in function, visit the function body instead of the whole tree
+    roots: list[ast.AST] = [tree]
+    if (
+        wrapped_in_function
+        and isinstance(tree, ast.Module)
+        and len(tree.body) > 0
+        and isinstance(tree.body[0], ast.FunctionDef | ast.AsyncFunctionDef)
+    ):
+        roots = list(tree.body[0].body)
+
+    # Depth-first, pre-order walk (same order as ast.NodeVisitor) with a single type
+    # dispatch per node instead of a visit_<ClassName> method lookup
+    stack = roots[::-1]
+    while stack:
+        node = stack.pop()
+        node_type = type(node)
+
+        if node_type is ast.Call:
+            # type() dispatch doesn't narrow for the type checker
+            call = cast(ast.Call, node)
+            func = call.func
+            if type(func) is ast.Name:
+                # Check for print statements
+                if func.id == "print":
+                    msg = "Avoid using print statements in production code. Use logging instead."
+                    violations.append(msg)
+                    details.append(
+                        ViolationDetail(
+                            file_path=file_path,
+                            line_number=call.lineno + line_offset,
+                            severity="error",
+                            rule_name="no_print_statements",
+                            message=msg,
+                            remediation="Replace print() with logger.debug() or logger.info()",
+                        )
+                    )
+                # Check for debugger calls
+                elif func.id in ("pdb", "ipdb", "breakpoint"):
+                    msg = f"Avoid using {func.id} debugger calls in production code."
+                    violations.append(msg)
+                    details.append(
+                        ViolationDetail(
+                            file_path=file_path,
+                            line_number=call.lineno + line_offset,
+                            severity="error",
+                            rule_name="no_debugger_calls",
+                            message=msg,
+                            remediation="Remove debugger calls before committing",
+                        )
+                    )
+                # Check for dynamic code execution
+                elif func.id in _DYNAMIC_EXECUTION_BUILTINS:
+                    msg = f"Avoid {func.id}() on dynamic input; it can execute arbitrary code."
+                    violations.append(msg)
+                    details.append(
+                        ViolationDetail(
+                            file_path=file_path,
+                            line_number=call.lineno + line_offset,
+                            severity="error",
+                            rule_name="no_dynamic_code_execution",
+                            message=msg,
+                            remediation="Parse data with ast.literal_eval or json instead",
+                        )
+                    )
+            # Check for shell commands run through os.system
+            elif (
+                type(func) is ast.Attribute
+                and func.attr == "system"
+                and type(func.value) is ast.Name
+                and func.value.id == "os"
+            ):
+                msg = "Avoid os.system(); it runs commands through the shell."
+                violations.append(msg)
+                details.append(
+                    ViolationDetail(
+                        file_path=file_path,
+                        line_number=call.lineno + line_offset,
+                        severity="error",
+                        rule_name="no_shell_commands",
+                        message=msg,
+                        remediation="Use subprocess.run with a list of arguments",
+                    )
                 )
 
-            self.generic_visit(node)
-
-        def visit_FunctionDef(self, node):
+        elif node_type is ast.FunctionDef or node_type is ast.AsyncFunctionDef:
+            function = cast(ast.FunctionDef | ast.AsyncFunctionDef, node)
             # Check for long functions (threshold configurable via AUDIT_FUNCTION_LENGTH_THRESHOLD)
-            if hasattr(node, "end_lineno") and node.end_lineno:
-                function_length = node.end_lineno - node.lineno
-                if function_length > AUDIT_FUNCTION_LENGTH_THRESHOLD:
-                    line_no = node.lineno + self.line_offset
-                    msg = f"Function '{node.name}' is too long ({function_length} lines). Consider breaking it into smaller functions."
-                    self.violations.append(msg)
-                    self.details.append(
-                        {
-                            "file_path": file_path,
-                            "line_number": line_no,
-                            "severity": "warning",
-                            "rule_name": "long_function",
-                            "message": msg,
-                            "remediation": "Break function into smaller, focused functions",
-                        }
-                    )
-
-            self.generic_visit(node)
-
-        def visit_AsyncFunctionDef(self, node):
-            # Same check for async functions (threshold configurable via AUDIT_FUNCTION_LENGTH_THRESHOLD)
-            if hasattr(node, "end_lineno") and node.end_lineno:
-                function_length = node.end_lineno - node.lineno
+            if function.end_lineno:
+                function_length = function.end_lineno - function.lineno
                 if function_length > AUDIT_FUNCTION_LENGTH_THRESHOLD:
-                    line_no = node.lineno + self.line_offset
-                    msg = f"Async function '{node.name}' is too long ({function_length} lines). Consider breaking it into smaller functions."
-                    self.violations.append(msg)
-                    self.details.append(
-                        {
-                            "file_path": file_path,
-                            "line_number": line_no,
-                            "severity": "warning",
-                            "rule_name": "long_function",
-                            "message": msg,
-                            "remediation": "Break function into smaller, focused functions",
-                        }
+                    kind = "Async function" if node_type is ast.AsyncFunctionDef else "Function"
+                    msg = f"{kind} '{function.name}' is too long ({function_length} lines). Consider breaking it into smaller functions."
+                    violations.append(msg)
+                    details.append(
+                        ViolationDetail(
+                            file_path=file_path,
+                            line_number=function.lineno + line_offset,
+                            severity="warning",
+                            rule_name="long_function",
+                            message=msg,
+                            remediation="Break function into smaller, focused functions",
+                        )
                     )
 
-            self.generic_visit(node)
-
-    visitor = ViolationVisitor()
-
-    # If wrapped in function, visit the function body instead of the whole tree
-    if wrapped_in_function and isinstance(tree, ast.Module) and len(tree.body) > 0:
-        if isinstance(tree.body[0], ast.FunctionDef | ast.AsyncFunctionDef):
-            # Visit the function body
-            for node in tree.body[0].body:
-                visitor.visit(node)
-        else:
-            visitor.visit(tree)
-    else:
-        visitor.visit(tree)
+        children = list(ast.iter_child_nodes(node))
+        children.reverse()
+        stack.extend(children)
 
-    return visitor.violations, visitor.details
+    return violations, details
 
 
-def _check_pattern_violations(diff_content: str) -> tuple[list[str], list[dict[str, Any]]]:
+def _check_pattern_violations(
+    diff_content: str, diff_added_lines: Iterable[tuple[int, str]] | None = None
+) -> tuple[list[str], list[ViolationDetail]]:
     """
     Check violations using pattern matching (regex).
 
@@ -503,52 +792,62 @@ def _check_pattern_violations(diff_content: str) -> tuple[list[str], list[dict[s
 
     Args:
         diff_content: Full diff content
+        diff_added_lines: Added lines with their diff line numbers, as collected by
+            parse_diff; any iterable is accepted and consumed once. When omitted, they
+            are extracted lazily from diff_content, one line at a time.
 
     Returns:
         Tuple of (violations list, violation details list)
     """
     violations = []
-    violation_details = []
-
-    # Check for hardcoded secrets (basic patterns)
-    # ML Engineer will optimize these patterns
-    secret_patterns = [
-        (r'password\s*=\s*["\'][^"\']+["\']', "Hardcoded password detected"),
-        (r'api_key\s*=\s*["\'][^"\']+["\']', "Hardcoded API key detected"),
-        (r'secret\s*=\s*["\'][^"\']+["\']', "Hardcoded secret detected"),
-        (r'token\s*=\s*["\'][^"\']+["\']', "Hardcoded token detected"),
-    ]
+    violation_details: list[ViolationDetail] = []
 
-    lines = diff_content.split("\n")
-    for line_num, line in enumerate(lines, start=1):
+    if diff_added_lines is None:
         # Only check added lines (lines starting with +)
         # Skip diff metadata lines (+++ file paths)
-        if line.startswith("+") and not line.startswith("+++"):
-            content = line[1:]  # Remove + prefix
-            for pattern, message in secret_patterns:
-                if re.search(pattern, content, re.IGNORECASE):
-                    violations.append(message)
-                    violation_details.append(
-                        {
-                            "file_path": "unknown",  # Would need file context from parsed diff
-                            "line_number": line_num,
-                            "severity": "error",
-                            "rule_name": "hardcoded_secret",
-                            "message": message,
-                            "remediation": "Use environment variables or secure secret management",
-                        }
-                    )
-                    break  # Only report once per line
+        diff_added_lines = (
+            (line_num, line[1:])
+            for line_num, line in enumerate(_iter_lines(diff_content), start=1)
+            if line[:1] == "+" and line[:3] != "+++"
+        )
+
+    for line_num, content in diff_added_lines:
+        # Every secret pattern needs an assignment and a keyword; skip the regex for
+        # lines without them
+        if "=" not in content:
+            continue
+        folded = content.casefold()
+        for keyword in _SECRET_KEYWORDS:
+            if keyword in folded:
+                break
+        else:
+            continue
+        # Only report once per line
+        match = _SECRET_UNION_RE.search(content)
+        # Every alternative is a named group, so a match always has a lastgroup
+        if match and match.lastgroup:
+            message = _SECRET_MESSAGES[match.lastgroup]
+            violations.append(message)
+            violation_details.append(
+                ViolationDetail(
+                    file_path="unknown",  # Would need file context from parsed diff
+                    line_number=line_num,
+                    severity="error",
+                    rule_name="hardcoded_secret",
+                    message=message,
+                    remediation="Use environment variables or secure secret management",
+                )
+            )
 
     return violations, violation_details
 
 
 async def _filter_false_positives(
-    violation_details: list[dict[str, Any]],
+    violation_details: list[ViolationDetail],
     parsed_files: list[dict[str, Any]],  # noqa: ARG001
     parsed_hunks: list[dict[str, Any]],  # noqa: ARG001
     file_extensions: set[str],  # noqa: ARG001
-) -> list[dict[str, Any]]:
+) -> list[ViolationDetail]:
     """
     Filter false positives using context-aware heuristics and LLM analysis.
 
@@ -566,56 +865,69 @@ async def _filter_false_positives(
     Returns:
         Filtered list of violations with false positives removed
     """
+    filtered = [violation async for violation in _iter_true_positives(violation_details)]
+
+    logger.debug(
+        "Filtered %d violations to %d after false positive filtering",
+        len(violation_details),
+        len(filtered),
+    )
+
+    return filtered
+
+
+async def _iter_true_positives(
+    violation_details: list[ViolationDetail],
+) -> AsyncIterator[ViolationDetail]:
+    """
+    Yield the violations kept by the false positive heuristics and LLM analysis.
+
+    Violations settled by the heuristics are yielded first, in order, followed by the
+    ones kept after LLM analysis.
+
+    Args:
+        violation_details: List of detected violations
+
+    Yields:
+        Violations that are not false positives
+    """
     from agentic_py.ai.batching import batch_llm_calls
     from agentic_py.config.llm import LLM_ENABLED
-    from agentic_py.prompts.loader import load_prompt
 
-    filtered = []
     violations_needing_llm = []
 
     # First pass: apply heuristics that don't require LLM
     for violation in violation_details:
-        file_path = violation.get("file_path", "unknown")
-        rule_name = violation.get("rule_name", "")
-
-        # Context-aware filtering heuristics
-        should_keep = True
+        file_path = violation.file_path
+        rule_name = violation.rule_name
 
-        # Skip violations in test files for certain rules (e.g., print statements in tests are OK)
-        if _is_test_file(file_path) and rule_name in ("no_print_statements",):
-            logger.debug(f"Filtering violation in test file: {file_path}, rule: {rule_name}")
-            should_keep = False
+        # Skip violations in test files for certain rules (e.g., print statements in tests are OK).
+        # The rule name is checked first so paths are only classified when it matters.
+        if rule_name in ("no_print_statements",) and _is_test_file(file_path):
+            logger.debug("Filtering violation in test file: %s, rule: %s", file_path, rule_name)
         # Config files need LLM analysis - collect for batching
-        elif _is_config_file(file_path) and rule_name == "hardcoded_secret" and LLM_ENABLED:
+        elif rule_name == "hardcoded_secret" and LLM_ENABLED and _is_config_file(file_path):
             violations_needing_llm.append((violation, file_path))
-            continue  # Will be processed in batch
         else:
             # Keep all other violations
-            filtered.append(violation)
+            yield violation
 
     # Batch process violations that need LLM analysis
     if violations_needing_llm and LLM_ENABLED:
+        kept_by_llm = []
         try:
-            # Load prompt template once
-            prompt_template = load_prompt("violation_analysis/violation_analysis_ambiguous")
-
-            # Generate prompts for all violations needing analysis
-            prompts = []
+            # Generate prompts for all violations needing analysis. Identical prompts
+            # (same rule, context and file type) are sent once and the answer is shared.
+            unique_prompts: dict[str, int] = {}
+            prompt_indices = []
             for violation, file_path in violations_needing_llm:
-                code_context = violation.get("code_context", "Code context not available")
-                formatted_prompt = prompt_template.format(
-                    violation_message=violation.get("message", ""),
-                    file_path=file_path,
-                    line_number=violation.get("line_number", 0),
-                    rule_name=violation.get("rule_name", "unknown"),
-                    code_context=code_context,
-                    file_extension=file_path.split(".")[-1] if "." in file_path else "unknown",
-                    project_context="Python project with standard coding practices",
-                )
-                prompts.append(formatted_prompt)
+                formatted_prompt = _format_ambiguous_prompt(violation, file_path)
+                index = unique_prompts.setdefault(formatted_prompt, len(unique_prompts))
+                prompt_indices.append(index)
 
             # Batch process LLM calls
-            analyses = await batch_llm_calls(prompts)
+            unique_analyses = await batch_llm_calls(list(unique_prompts))
+            analyses = [unique_analyses[i] for i in prompt_indices]
 
             # Process results
             for (violation, file_path), analysis in zip(
@@ -623,15 +935,15 @@ async def _filter_false_positives(
             ):
                 analysis_upper = analysis.upper()
                 if "FLAGGED" in analysis_upper:
-                    logger.debug(f"LLM analysis: Keep violation in {file_path}")
-                    filtered.append(violation)
+                    logger.debug("LLM analysis: Keep violation in %s", file_path)
+                    kept_by_llm.append(violation)
                 elif "IGNORED" in analysis_upper:
-                    logger.debug(f"LLM analysis: Filter violation in {file_path} (false positive)")
-                    # Don't add to filtered (filtered out)
+                    logger.debug("LLM analysis: Filter violation in %s (false positive)", file_path)
+                    # Don't keep it (filtered out)
                 else:
                     # Default to keeping if unclear
                     logger.warning(f"LLM analysis unclear for {file_path}, keeping violation")
-                    filtered.append(violation)
+                    kept_by_llm.append(violation)
 
         except Exception as e:
             logger.error(
@@ -639,36 +951,57 @@ async def _filter_false_positives(
                 exc_info=True,
             )
             # Fallback to individual analysis
+            kept_by_llm = []
             for violation, file_path in violations_needing_llm:
                 should_keep = await _analyze_ambiguous_violation(violation, file_path)
                 if should_keep:
-                    filtered.append(violation)
-
-    logger.debug(
-        f"Filtered {len(violation_details)} violations to {len(filtered)} after false positive filtering"
+                    kept_by_llm.append(violation)
+
+        for violation in kept_by_llm:
+            yield violation
+
+
+def _format_ambiguous_prompt(violation: ViolationDetail, file_path: str) -> str:
+    """Format the ambiguous violation analysis prompt for a single violation."""
+    render = load_prompt_renderer("violation_analysis/violation_analysis_ambiguous")
+    return render(
+        violation_message=violation.message,
+        file_path=file_path,
+        line_number=violation.line_number,
+        rule_name=violation.rule_name or "unknown",
+        code_context=violation.code_context or "Code context not available",
+        file_extension=file_path.split(".")[-1] if "." in file_path else "unknown",
+        project_context="Python project with standard coding practices",
     )
 
-    return filtered
-
 
+@lru_cache(maxsize=1024)
 def _is_test_file(file_path: str) -> bool:
     """Check if file is a test file."""
-    test_indicators = ["test_", "_test", "/tests/", "/test/"]
-    return any(indicator in file_path.lower() for indicator in test_indicators)
+    segments = file_path.lower().split("/")
+    if not _TEST_DIRS.isdisjoint(segments[:-1]):
+        return True
+    return any(
+        segment.startswith(_TEST_PREFIXES) or segment.partition(".")[0].endswith(_TEST_SUFFIXES)
+        for segment in segments
+    )
 
 
+@lru_cache(maxsize=1024)
 def _is_config_file(file_path: str) -> bool:
     """Check if file is a configuration file."""
-    config_indicators = [".config.", "config/", ".env", "settings.", "conf."]
-    return any(indicator in file_path.lower() for indicator in config_indicators)
+    *dirs, name = file_path.lower().split("/")
+    if not _CONFIG_DIRS.isdisjoint(dirs):
+        return True
+    return name.startswith(_CONFIG_NAME_PREFIXES) or ".config." in name or name.endswith(".env")
 
 
-async def _analyze_ambiguous_violation(violation: dict[str, Any], file_path: str) -> bool:
+async def _analyze_ambiguous_violation(violation: ViolationDetail, file_path: str) -> bool:
     """
     Use LLM to analyze ambiguous violations and determine if they should be flagged.
 
     Args:
-        violation: Violation detail dictionary
+        violation: Violation detail
         file_path: Path to the file
 
     Returns:
@@ -682,25 +1015,7 @@ async def _analyze_ambiguous_violation(violation: dict[str, Any], file_path: str
         return True
 
     try:
-        # Load the ambiguous violation analysis prompt
-        prompt_template = load_prompt("violation_analysis/violation_analysis_ambiguous")
-
-        # Get code context from violation
-        code_context = violation.get("code_context", "")
-        if not code_context:
-            # Try to extract from parsed hunks if available
-            code_context = "Code context not available"
-
-        # Format prompt
-        formatted_prompt = prompt_template.format(
-            violation_message=violation.get("message", ""),
-            file_path=file_path,
-            line_number=violation.get("line_number", 0),
-            rule_name=violation.get("rule_name", "unknown"),
-            code_context=code_context,
-            file_extension=file_path.split(".")[-1] if "." in file_path else "unknown",
-            project_context="Python project with standard coding practices",
-        )
+        formatted_prompt = _format_ambiguous_prompt(violation, file_path)
 
         # Call LLM for analysis with retry logic
         analysis = await invoke_llm_with_retry(formatted_prompt)
@@ -709,10 +1024,10 @@ async def _analyze_ambiguous_violation(violation: dict[str, Any], file_path: str
         # Look for "FLAGGED" or "IGNORED" in response
         analysis_upper = analysis.upper()
         if "FLAGGED" in analysis_upper:
-            logger.debug(f"LLM analysis: Keep violation in {file_path}")
+            logger.debug("LLM analysis: Keep violation in %s", file_path)
             return True
         elif "IGNORED" in analysis_upper:
-            logger.debug(f"LLM analysis: Filter violation in {file_path} (false positive)")
+            logger.debug("LLM analysis: Filter violation in %s (false positive)", file_path)
             return False
         else:
             # Default to keeping if unclear
@@ -728,7 +1043,7 @@ async def _analyze_ambiguous_violation(violation: dict[str, Any], file_path: str
     except Exception as e:
         logger.error(
             f"Failed to analyze ambiguous violation with LLM: {e}",
-            extra={"file_path": file_path, "rule_name": violation.get("rule_name")},
+            extra={"file_path": file_path, "rule_name": violation.rule_name},
             exc_info=True,
         )
         # Default to keeping violation if LLM analysis fails
@@ -744,8 +1059,10 @@ async def analyze_violations_with_llm(
     """
     Analyze violations using LLM-based prompt templates.
 
-    WARNING: This function is not yet implemented and will raise NotImplementedError.
-    This is a placeholder for future ML integration.
+    All violations are packed into a single prompt and the LLM answers with a JSON
+    array, so N violations cost one round trip instead of N. Prompts estimated to
+    exceed _ANALYSIS_MAX_PROMPT_TOKENS are split into chunks that are sent
+    concurrently. Violations missing from the response are analyzed individually.
 
     Args:
         violation_details: List of violation detail dictionaries
@@ -754,19 +1071,169 @@ async def analyze_violations_with_llm(
         file_extensions: Set of file extensions in the diff
 
     Returns:
-        Dictionary with LLM analysis results
-
-    Raises:
-        NotImplementedError: This function is not yet implemented
+        Dictionary with LLM analysis results:
+        - analysis_complete (bool): Whether the batched LLM analysis succeeded
+        - results (list): One {"id", "keep", "reason"} dict per violation, in order
+        - message (str, optional): Status message if LLM is disabled
+        - error (str, optional): Error message if analysis failed
 
     Note:
-        This function should be implemented using `invoke_llm_with_retry()` from
-        `agentic_py.ai.llm` when LLM-based violation analysis is needed.
+        Violations are kept by default whenever the LLM is unavailable or unclear.
     """
-    raise NotImplementedError(
-        "analyze_violations_with_llm() is not yet implemented. "
-        "This function requires LLM integration for batch violation analysis. "
-        "For now, use the rule-based violation detection in check_violations()."
+    from agentic_py.ai.llm import invoke_llm_with_retry
+    from agentic_py.config.llm import LLM_ENABLED
+
+    if not violation_details:
+        return {"analysis_complete": True, "results": []}
+
+    if not LLM_ENABLED:
+        return {
+            "analysis_complete": False,
+            "message": "LLM integration disabled - enable LLM_ENABLED=true",
+            "results": [
+                _analysis_result(i, True, "LLM analysis unavailable")
+                for i in range(len(violation_details))
+            ],
+        }
+
+    try:
+        prompt_template = load_prompt("violation_analysis/violation_analysis_base")
+        files_str = "\n".join(f"- {f.get('new_path') or f.get('old_path')}" for f in parsed_files)
+        prompt_vars = {
+            "parsed_files": files_str or "None",
+            "diff_context": diff_content[:_ANALYSIS_DIFF_CONTEXT_CHARS],
+            "file_extensions": ", ".join(sorted(file_extensions)) or "None",
+        }
+        base_tokens = len(prompt_template.format(violation_details="", **prompt_vars)) // 4
+
+        # Pack violation sections into as few prompts as the token budget allows
+        chunks: list[list[str]] = [[]]
+        chunk_tokens = base_tokens
+        for i, detail in enumerate(violation_details):
+            section = _format_violation_section(i, detail)
+            section_tokens = len(section) // 4
+            if chunks[-1] and chunk_tokens + section_tokens > _ANALYSIS_MAX_PROMPT_TOKENS:
+                chunks.append([])
+                chunk_tokens = base_tokens
+            chunks[-1].append(section)
+            chunk_tokens += section_tokens
+
+        responses = await asyncio.gather(
+            *(
+                invoke_llm_with_retry(
+                    prompt_template.format(violation_details="\n".join(chunk), **prompt_vars)
+                )
+                for chunk in chunks
+            )
+        )
+    except Exception as e:
+        logger.error(f"Batched violation analysis failed: {e}", exc_info=True)
+        return {
+            "analysis_complete": False,
+            "error": str(e),
+            "results": [
+                _analysis_result(i, True, "LLM analysis failed")
+                for i in range(len(violation_details))
+            ],
+        }
+
+    answers: dict[int, dict[str, Any]] = {}
+    for response in responses:
+        answers.update(_parse_analysis_response(response, len(violation_details)))
+
+    # Fall back to one call per violation only for ids the LLM did not answer
+    missing = [i for i in range(len(violation_details)) if i not in answers]
+    if missing:
+        logger.warning(
+            f"Batched analysis missing {len(missing)} of {len(violation_details)} violations, "
+            "analyzing them individually"
+        )
+        kept = await asyncio.gather(
+            *(
+                _analyze_ambiguous_violation(
+                    _violation_from_dict(violation_details[i]),
+                    violation_details[i].get("file_path", "unknown"),
+                )
+                for i in missing
+            )
+        )
+        for i, keep in zip(missing, kept, strict=True):
+            answers[i] = _analysis_result(i, keep, "Analyzed individually")
+
+    logger.info(
+        "Violation analysis completed",
+        extra={
+            "violation_count": len(violation_details),
+            "llm_calls": len(chunks) + len(missing),
+        },
+    )
+
+    return {
+        "analysis_complete": True,
+        "results": [answers[i] for i in range(len(violation_details))],
+    }
+
+
+def _format_violation_section(violation_id: int, detail: dict[str, Any]) -> str:
+    """Format one violation for the batched analysis prompt."""
+    return (
+        f"- id: {violation_id}\n"
+        f"  file: {detail.get('file_path', 'unknown')}:{detail.get('line_number', 0)}\n"
+        f"  rule: {detail.get('rule_name', 'unknown')}\n"
+        f"  message: {detail.get('message', '')}\n"
+        f"  snippet: {detail.get('code_context') or 'Code context not available'}"
+    )
+
+
+def _parse_analysis_response(response: str, violation_count: int) -> dict[int, dict[str, Any]]:
+    """
+    Parse the JSON array returned by the batched analysis prompt.
+
+    Tolerates surrounding prose or code fences. Entries without a valid id are
+    ignored, so their violations fall back to individual analysis.
+
+    Returns:
+        Mapping of violation id to {"id", "keep", "reason"}
+    """
+    start = response.find("[")
+    end = response.rfind("]")
+    if start < 0 or end < start:
+        return {}
+    try:
+        items = json.loads(response[start : end + 1])
+    except json.JSONDecodeError:
+        logger.warning("Batched analysis response was not valid JSON")
+        return {}
+
+    answers: dict[int, dict[str, Any]] = {}
+    for item in items if isinstance(items, list) else ():
+        if not isinstance(item, dict):
+            continue
+        violation_id = item.get("id")
+        if type(violation_id) is not int or not 0 <= violation_id < violation_count:
+            continue
+        keep = item.get("keep", True)
+        answers[violation_id] = _analysis_result(
+            violation_id, keep if isinstance(keep, bool) else True, str(item.get("reason", ""))
+        )
+    return answers
+
+
+def _analysis_result(violation_id: int, keep: bool, reason: str) -> dict[str, Any]:
+    """Build one per-violation analysis result."""
+    return {"id": violation_id, "keep": keep, "reason": reason}
+
+
+def _violation_from_dict(detail: dict[str, Any]) -> ViolationDetail:
+    """Build a ViolationDetail from a violation detail dictionary."""
+    return ViolationDetail(
+        file_path=detail.get("file_path", "unknown"),
+        line_number=detail.get("line_number", 0),
+        severity=detail.get("severity", "error"),
+        rule_name=detail.get("rule_name", "unknown"),
+        message=detail.get("message", ""),
+        remediation=detail.get("remediation", ""),
+        code_context=detail.get("code_context") or "",
     )
 
 
@@ -778,6 +1245,8 @@ async def generate_remediation(
 
     This function uses LLM to generate personalized remediation suggestions for code violations.
     It loads the remediation suggestion prompt template and calls the LLM with retry logic.
+    Rules with a fixed remedy (see REMEDIATION_TEMPLATES) are answered from a template
+    instead, without calling the LLM.
 
     Args:
         violation_detail: Single violation detail dictionary
@@ -797,10 +1266,234 @@ async def generate_remediation(
     """
     try:
         # Load the remediation suggestion prompt template
-        prompt_template = load_prompt("violation_analysis/remediation_suggestion")
+        render_prompt = load_prompt_renderer("violation_analysis/remediation_suggestion")
+    except Exception as e:
+        return _remediation_failure(violation_detail, e)
+
+    return await _remediate_single(render_prompt, violation_detail, code_context, violated_code)
+
+
+async def generate_remediations_batch(
+    violation_details: list[dict[str, Any]],
+    code_contexts: list[str],
+    violated_codes: list[str],
+    concurrency: int | None = None,
+    output_jsonl: Path | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Generate remediation suggestions for many violations concurrently.
+
+    Collects the results of ``stream_remediations``; see it for how concurrency and
+    the ``output_jsonl`` checkpoint work. Each result has the same shape as
+    ``generate_remediation``'s.
+
+    Args:
+        violation_details: Violation detail dictionaries
+        code_contexts: Surrounding code context for each violation
+        violated_codes: The specific violating code for each violation
+        concurrency: Maximum concurrent LLM calls (defaults to REMEDIATION_CONCURRENCY)
+        output_jsonl: Optional checkpoint file with one JSON object per remediation
+
+    Returns:
+        List of remediation dictionaries in the same order as violation_details
+
+    Raises:
+        ValueError: If the input lists have different lengths
+    """
+    results: list[dict[str, Any]] = [{}] * len(violation_details)
+    async for i, result in stream_remediations(
+        violation_details, code_contexts, violated_codes, concurrency, output_jsonl
+    ):
+        results[i] = result
+    return results
+
+
+async def stream_remediations(
+    violation_details: list[dict[str, Any]],
+    code_contexts: list[str],
+    violated_codes: list[str],
+    concurrency: int | None = None,
+    output_jsonl: Path | None = None,
+    ordered: bool = False,
+) -> AsyncIterator[tuple[int, dict[str, Any]]]:
+    """
+    Generate remediation suggestions concurrently, yielding each as soon as it's ready.
+
+    The prompt template is loaded once and the per-violation LLM calls run
+    concurrently, with at most ``concurrency`` in flight to respect provider rate
+    limits. Results are yielded in completion order, so a consumer can write them out
+    while slower LLM calls are still running. With ``ordered=True``, completed
+    results are buffered and yielded in input order as soon as every earlier one is
+    ready.
+
+    When ``output_jsonl`` is given, each successful remediation is appended to it as
+    soon as it completes, and violations already recorded there by an earlier,
+    interrupted run are yielded from the file instead of calling the LLM again.
+
+    Args:
+        violation_details: Violation detail dictionaries
+        code_contexts: Surrounding code context for each violation
+        violated_codes: The specific violating code for each violation
+        concurrency: Maximum concurrent LLM calls (defaults to REMEDIATION_CONCURRENCY)
+        output_jsonl: Optional checkpoint file with one JSON object per remediation
+        ordered: Yield results in input order instead of completion order
+
+    Yields:
+        Tuples of (index into violation_details, remediation dictionary)
+
+    Raises:
+        ValueError: If the input lists have different lengths
+    """
+    from agentic_py.config.llm import REMEDIATION_CONCURRENCY
+
+    if not len(violation_details) == len(code_contexts) == len(violated_codes):
+        raise ValueError(
+            "violation_details, code_contexts and violated_codes must have the same length"
+        )
+
+    heap: list[tuple[int, dict[str, Any]]] = []
+    next_index = 0
+
+    def _release(i: int, result: dict[str, Any]) -> list[tuple[int, dict[str, Any]]]:
+        """Return the results that can be yielded now that result i is ready."""
+        nonlocal next_index
+        if not ordered:
+            return [(i, result)]
+        heapq.heappush(heap, (i, result))
+        ready = []
+        while heap and heap[0][0] == next_index:
+            ready.append(heapq.heappop(heap))
+            next_index += 1
+        return ready
+
+    violation_ids = [_violation_id(detail) for detail in violation_details]
+    done = _load_remediation_checkpoint(output_jsonl) if output_jsonl is not None else {}
+    pending = [i for i, vid in enumerate(violation_ids) if vid not in done]
+    if done:
+        logger.info(
+            "Resuming remediation batch from checkpoint",
+            extra={"completed": len(violation_details) - len(pending), "pending": len(pending)},
+        )
+    for i, vid in enumerate(violation_ids):
+        if vid in done:
+            for item in _release(i, done[vid]):
+                yield item
+    if not pending:
+        return
+
+    try:
+        render_prompt = load_prompt_renderer("violation_analysis/remediation_suggestion")
+    except Exception as e:
+        for i in pending:
+            for item in _release(i, _remediation_failure(violation_details[i], e)):
+                yield item
+        return
+
+    semaphore = asyncio.Semaphore(concurrency or REMEDIATION_CONCURRENCY)
+    checkpoint = _open_remediation_checkpoint(output_jsonl) if output_jsonl is not None else None
+
+    async def _remediate_bounded(i: int) -> tuple[int, dict[str, Any]]:
+        try:
+            async with semaphore:
+                result = await _remediate_single(
+                    render_prompt, violation_details[i], code_contexts[i], violated_codes[i]
+                )
+        except Exception as e:
+            return i, _remediation_failure(violation_details[i], e)
+        # Only LLM-generated suggestions are worth keeping; fallbacks are retried on resume.
+        # The write and flush don't await, so concurrent tasks can't interleave lines.
+        if checkpoint is not None and result.get("remediation_complete"):
+            checkpoint.write(orjson.dumps({"violation_id": violation_ids[i], **result}) + b"\n")
+            checkpoint.flush()
+        return i, result
+
+    tasks = [asyncio.ensure_future(_remediate_bounded(i)) for i in pending]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            i, result = await next_done
+            for item in _release(i, result):
+                yield item
+    finally:
+        # Stop outstanding LLM calls if the consumer stops early
+        for task in tasks:
+            task.cancel()
+        if checkpoint is not None:
+            checkpoint.close()
+
+
+def _violation_id(detail: dict[str, Any]) -> str:
+    """Identify a violation across runs by its location and rule."""
+    return (
+        f"{detail.get('file_path', 'unknown')}:{detail.get('line_number', 0)}:"
+        f"{detail.get('rule_name', 'unknown')}"
+    )
+
+
+def _open_remediation_checkpoint(path: Path) -> BinaryIO:
+    """Open a JSONL checkpoint for appending, terminating any line truncated by a crash."""
+    truncated = False
+    if path.exists() and path.stat().st_size > 0:
+        with path.open("rb") as f:
+            f.seek(-1, os.SEEK_END)
+            truncated = f.read(1) != b"\n"
+    checkpoint = path.open("ab")
+    if truncated:
+        checkpoint.write(b"\n")
+    return checkpoint
+
+
+def _load_remediation_checkpoint(path: Path) -> dict[str, dict[str, Any]]:
+    """
+    Load completed remediations from a JSONL checkpoint file.
+
+    Lines that can't be parsed, such as one truncated by a crash mid-write, are
+    skipped so their violations are remediated again.
+
+    Returns:
+        Mapping of violation id to remediation result
+    """
+    done: dict[str, dict[str, Any]] = {}
+    try:
+        with path.open("rb") as f:
+            for line in f:
+                try:
+                    row = orjson.loads(line)
+                    violation_id = row.pop("violation_id")
+                except (orjson.JSONDecodeError, AttributeError, KeyError):
+                    logger.warning("Skipping unreadable remediation checkpoint line in %s", path)
+                    continue
+                done[violation_id] = row
+    except FileNotFoundError:
+        pass
+    return done
+
+
+async def _remediate_single(
+    render_prompt: Callable[..., str],
+    violation_detail: dict[str, Any],
+    code_context: str,
+    violated_code: str,
+) -> dict[str, Any]:
+    """
+    Generate a remediation suggestion for one violation with a precompiled prompt.
+
+    Args:
+        render_prompt: Remediation suggestion prompt renderer
+        violation_detail: Single violation detail dictionary
+        code_context: Surrounding code context
+        violated_code: The specific code that violates the rule
+
+    Returns:
+        Remediation dictionary, as described in generate_remediation
+    """
+    # Rules with a fixed remedy are answered from a template, without the LLM
+    suggestion = render_remediation(violation_detail)
+    if suggestion is not None:
+        return {"remediation_complete": True, "suggestion": suggestion}
 
+    try:
         # Format the prompt with violation data
-        formatted_prompt = prompt_template.format(
+        formatted_prompt = render_prompt(
             file_path=violation_detail.get("file_path", "unknown"),
             line_number=violation_detail.get("line_number", 0),
             rule_name=violation_detail.get("rule_name", "unknown"),
@@ -811,17 +1504,30 @@ async def generate_remediation(
         )
 
         # Log formatted prompt length for debugging
-        logger.debug(f"Formatted remediation prompt length: {len(formatted_prompt)}")
+        logger.debug("Formatted remediation prompt length: %d", len(formatted_prompt))
 
         # Call LLM for remediation generation with retry logic
         from agentic_py.ai.llm import invoke_llm_with_retry
         from agentic_py.config.llm import LLM_ENABLED
 
         if LLM_ENABLED:
+            # Audits re-flag the same rules on the same code, so a suggestion generated
+            # for one occurrence is reused for the others
+            cache_key = _remediation_cache_key(violation_detail, code_context, violated_code)
+            cached = await _get_cached_remediation(cache_key) if cache_key else None
+            if cached is not None:
+                logger.debug("Returning cached remediation")
+                return {
+                    "remediation_complete": True,
+                    "suggestion": cached,
+                }
+
             try:
                 remediation = await invoke_llm_with_retry(formatted_prompt)
 
                 logger.info("Remediation generated with LLM")
+                if cache_key:
+                    await _set_cached_remediation(cache_key, remediation)
 
                 return {
                     "remediation_complete": True,
@@ -841,23 +1547,87 @@ async def generate_remediation(
         }
 
     except Exception as e:
-        logger.error(
-            "Failed to generate remediation",
-            extra={
-                "error": str(e),
-                "error_type": type(e).__name__,
-                "violation_rule": violation_detail.get("rule_name", "unknown"),
-            },
-            exc_info=True,
-        )
-        return {
-            "remediation_complete": False,
-            "error": str(e),
-            "suggestion": violation_detail.get("remediation", "Manual review required"),
-        }
+        return _remediation_failure(violation_detail, e)
 
 
-def build_audit_graph(checkpointer=None):
+def _remediation_cache_key(
+    violation_detail: dict[str, Any], code_context: str, violated_code: str
+) -> str | None:
+    """
+    Build the cache key for a remediation suggestion.
+
+    The key covers everything the prompt renders except the exact path and line:
+    rule, message, file extension, code context and violated code. The code is
+    normalized so trivially different occurrences share a key: whitespace is
+    collapsed and numeric literals are dropped. Case is kept, since identifiers
+    that differ only in case are different code.
+
+    Returns:
+        The cache key, or None when there is no violated code to key on
+    """
+    normalized_code = _normalize_remediation_code(violated_code)
+    if not normalized_code:
+        return None
+    parts = (
+        violation_detail.get("rule_name", "unknown"),
+        violation_detail.get("message", ""),
+        _extract_extension(violation_detail.get("file_path", "")) or "",
+        _normalize_remediation_code(code_context),
+        normalized_code,
+    )
+    digest = hashlib.blake2b("\x00".join(parts).encode(), digest_size=16).hexdigest()
+    return f"remediation:{digest}"
+
+
+def _normalize_remediation_code(code: str) -> str:
+    """Collapse whitespace and replace numeric literals for remediation cache keys."""
+    return _NUMERIC_LITERAL_RE.sub("0", " ".join(code.split()))
+
+
+async def _get_cached_remediation(cache_key: str) -> str | None:
+    """Look up a cached remediation suggestion, treating cache errors as a miss."""
+    from agentic_py.ai.cache import get_cached_response
+    from agentic_py.config.llm import LLM_MODEL, LLM_TEMPERATURE
+
+    try:
+        return await get_cached_response(cache_key, LLM_MODEL, LLM_TEMPERATURE)
+    except RuntimeError as e:
+        logger.debug("Remediation cache unavailable: %s", e)
+        return None
+
+
+async def _set_cached_remediation(cache_key: str, suggestion: str) -> None:
+    """Store a remediation suggestion, ignoring cache errors."""
+    from agentic_py.ai.cache import set_cached_response
+    from agentic_py.config.llm import LLM_MODEL, LLM_TEMPERATURE
+
+    try:
+        await set_cached_response(cache_key, suggestion, LLM_MODEL, LLM_TEMPERATURE)
+    except RuntimeError as e:
+        logger.debug("Remediation cache unavailable: %s", e)
+
+
+def _remediation_failure(violation_detail: dict[str, Any], error: Exception) -> dict[str, Any]:
+    """Log a failed remediation and return the fallback result."""
+    logger.error(
+        "Failed to generate remediation",
+        extra={
+            "error": str(error),
+            "error_type": type(error).__name__,
+            "violation_rule": violation_detail.get("rule_name", "unknown"),
+        },
+        exc_info=error,
+    )
+    return {
+        "remediation_complete": False,
+        "error": str(error),
+        "suggestion": violation_detail.get("remediation", "Manual review required"),
+    }
+
+
+@cache
+def _compile_audit_graph():
+    """Compile the audit workflow without a checkpointer, once per process."""
     workflow = StateGraph(AuditState)
 
     workflow.add_node("parse_diff", parse_diff)
@@ -867,4 +1637,23 @@ def build_audit_graph(checkpointer=None):
     workflow.add_edge("parse_diff", "check_violations")
     workflow.add_edge("check_violations", END)
 
-    return workflow.compile(checkpointer=checkpointer)
+    return workflow.compile()
+
+
+def build_audit_graph(checkpointer=None):
+    """
+    Build the code audit workflow.
+
+    The graph is compiled once and reused; a checkpointer is attached to a shallow
+    copy, which is much cheaper than recompiling for every request.
+
+    Args:
+        checkpointer: Optional checkpointer for state persistence
+
+    Returns:
+        Compiled LangGraph workflow
+    """
+    graph = _compile_audit_graph()
+    if checkpointer is None:
+        return graph
+    return graph.copy(update={"checkpointer": checkpointer})
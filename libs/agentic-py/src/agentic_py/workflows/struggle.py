@@ -6,11 +6,16 @@ based on edit frequency and error patterns. When struggling is detected, it gene
 a lesson recommendation.
 """
 
+import asyncio
+from functools import cache
+
+from langgraph.config import get_stream_writer
 from langgraph.graph import END, StateGraph
 from loguru import logger
 
 from agentic_py.config.rag import RAG_TOP_K
 from agentic_py.config.workflows import (
+    LESSON_PROMPT_MAX_ITEMS,
     STRUGGLE_THRESHOLD_EDIT_FREQUENCY,
     STRUGGLE_THRESHOLD_ERROR_COUNT,
 )
@@ -51,20 +56,22 @@ def detect_struggle(state: StruggleState) -> StruggleState:
         )
         return {"is_struggling": True}
 
-    # Legacy fallback: use server-side thresholds
+    # Legacy fallback: use server-side thresholds. The error logs are only counted
+    # when the edit frequency alone doesn't indicate struggling.
     edit_freq = state["edit_frequency"]
-    error_count = len(state["error_logs"])
-
     is_struggling = (
         edit_freq > STRUGGLE_THRESHOLD_EDIT_FREQUENCY
-        or error_count > STRUGGLE_THRESHOLD_ERROR_COUNT
+        or len(state["error_logs"]) > STRUGGLE_THRESHOLD_ERROR_COUNT
     )
 
-    logger.info(
-        f"Struggle detection evaluated, edit_frequency: {edit_freq}, error_count: {error_count}",
-        extra={
+    # Lazy so the message and extras are only built when debug logging is enabled
+    logger.opt(lazy=True).debug(
+        "Struggle detection evaluated, edit_frequency: {}, error_count: {}",
+        lambda: edit_freq,
+        lambda: len(state["error_logs"]),
+        extra=lambda: {
             "edit_frequency": edit_freq,
-            "error_count": error_count,
+            "error_count": len(state["error_logs"]),
             "is_struggling": is_struggling,
             "threshold_frequency": STRUGGLE_THRESHOLD_EDIT_FREQUENCY,
             "threshold_errors": STRUGGLE_THRESHOLD_ERROR_COUNT,
@@ -75,17 +82,46 @@ def detect_struggle(state: StruggleState) -> StruggleState:
     return {"is_struggling": is_struggling}
 
 
+def detect_struggle_batch(states: list[StruggleState]) -> list[bool]:
+    """
+    Evaluate struggle detection for many states at once.
+
+    Applies the same rules as detect_struggle (a positive client combined_score wins,
+    otherwise the server-side thresholds) in a single comprehension, without building
+    a state update or logging per state. Use this for offline evaluation of recorded
+    sessions.
+
+    Args:
+        states: Struggle states with edit frequency and error logs
+
+    Returns:
+        Whether each state indicates struggling, in input order
+    """
+    max_frequency = STRUGGLE_THRESHOLD_EDIT_FREQUENCY
+    max_errors = STRUGGLE_THRESHOLD_ERROR_COUNT
+    return [
+        (state.get("combined_score") or 0) > 0
+        or state["edit_frequency"] > max_frequency
+        or len(state["error_logs"]) > max_errors
+        for state in states
+    ]
+
+
 async def _generate_lesson_with_llm(formatted_prompt: str) -> str:
     """
     Generate lesson recommendation using LLM with retry logic and error handling.
 
+    The response is streamed, and when running inside a graph each chunk is also
+    emitted as ``{"lesson_chunk": ...}`` on LangGraph's custom stream, so callers using
+    ``stream_mode="custom"`` can show the lesson while it is being generated.
+
     Args:
         formatted_prompt: Formatted prompt with all context
 
     Returns:
         Generated lesson recommendation string
     """
-    from agentic_py.ai.llm import invoke_llm_with_retry
+    from agentic_py.ai.llm import invoke_llm_stream
     from agentic_py.config.llm import LLM_ENABLED
 
     if not LLM_ENABLED:
@@ -96,7 +132,18 @@ async def _generate_lesson_with_llm(formatted_prompt: str) -> str:
         )
 
     try:
-        lesson = await invoke_llm_with_retry(formatted_prompt)
+        write = get_stream_writer()
+    except RuntimeError:
+        # Called outside a graph run, so there's no stream to forward chunks to
+        write = None
+
+    try:
+        chunks = []
+        async for chunk in invoke_llm_stream(formatted_prompt):
+            chunks.append(chunk)
+            if write is not None:
+                write({"lesson_chunk": chunk})
+        lesson = "".join(chunks)
 
         logger.info(
             "Lesson generated with LLM",
@@ -143,20 +190,29 @@ async def generate_lesson(state: StruggleState) -> StruggleState:
     """
     if state["is_struggling"]:
         try:
-            # Load the lesson generation prompt template
-            prompt_template = load_prompt("lesson_generation/lesson_generation_base")
-
-            # Prepare variables for the prompt
-            error_logs_str = "\n".join(f"- {error}" for error in state.get("error_logs", []))
-            history_str = "\n".join(f"- {item}" for item in state.get("history", [])) or "None"
+            # Prepare variables for the prompt, bounded so very long sessions don't
+            # produce unbounded prompts: the first errors and the most recent history
+            error_logs_list = state.get("error_logs", [])
+            error_logs_str = "\n".join(
+                f"- {error}" for error in error_logs_list[:LESSON_PROMPT_MAX_ITEMS]
+            )
+            history_str = (
+                "\n".join(
+                    f"- {item}" for item in state.get("history", [])[-LESSON_PROMPT_MAX_ITEMS:]
+                )
+                or "None"
+            )
 
-            # Query RAG service for relevant context based on error patterns
+            # Load the lesson generation prompt template off the event loop while the RAG
+            # service is queried for relevant context based on error patterns
             rag_service = get_rag_service()
-            error_logs_list = state.get("error_logs", [])
-            rag_context = await rag_service.query_knowledge(
-                query=f"Help with errors: {', '.join(error_logs_list[:3])}",  # Use first 3 errors
-                error_patterns=error_logs_list,
-                top_k=RAG_TOP_K,
+            prompt_template, rag_context = await asyncio.gather(
+                asyncio.to_thread(load_prompt, "lesson_generation/lesson_generation_base"),
+                rag_service.query_knowledge(
+                    query=f"Help with errors: {', '.join(error_logs_list[:3])}",  # First 3 errors
+                    error_patterns=error_logs_list,
+                    top_k=RAG_TOP_K,
+                ),
             )
 
             # Format the prompt with current state
@@ -168,7 +224,7 @@ async def generate_lesson(state: StruggleState) -> StruggleState:
             )
 
             # Log formatted prompt length for debugging
-            logger.debug(f"Formatted prompt length: {len(formatted_prompt)}")
+            logger.debug("Formatted prompt length: {}", len(formatted_prompt))
 
             # Call LLM to generate lesson recommendation
             lesson = await _generate_lesson_with_llm(formatted_prompt)
@@ -200,10 +256,37 @@ async def generate_lesson(state: StruggleState) -> StruggleState:
     return {"lesson_recommendation": None}
 
 
+@cache
+def _compile_struggle_graph():
+    """Compile the procedural struggle workflow without a checkpointer, once per process."""
+    workflow = StateGraph(StruggleState)
+
+    workflow.add_node("detect_struggle", detect_struggle)
+    workflow.add_node("generate_lesson", generate_lesson)
+
+    workflow.set_entry_point("detect_struggle")
+
+    def decide_next_step(state: StruggleState):
+        if state["is_struggling"]:
+            return "generate_lesson"
+        return END
+
+    workflow.add_conditional_edges(
+        "detect_struggle", decide_next_step, {"generate_lesson": "generate_lesson", END: END}
+    )
+
+    workflow.add_edge("generate_lesson", END)
+
+    return workflow.compile()
+
+
 def build_struggle_graph(checkpointer=None, use_agent: bool = False):
     """
     Build struggle detection workflow.
 
+    The graph is compiled once and reused; a checkpointer is attached to a shallow
+    copy, which is much cheaper than recompiling for every request.
+
     Args:
         checkpointer: Optional checkpointer for state persistence
         use_agent: If True, uses agentic approach where agent decides tool usage.
@@ -220,23 +303,7 @@ def build_struggle_graph(checkpointer=None, use_agent: bool = False):
             "Agentic workflow requires async. Use build_struggle_graph_agentic() directly."
         )
 
-    # Procedural approach (backward compatible)
-    workflow = StateGraph(StruggleState)
-
-    workflow.add_node("detect_struggle", detect_struggle)
-    workflow.add_node("generate_lesson", generate_lesson)
-
-    workflow.set_entry_point("detect_struggle")
-
-    def decide_next_step(state: StruggleState):
-        if state["is_struggling"]:
-            return "generate_lesson"
-        return END
-
-    workflow.add_conditional_edges(
-        "detect_struggle", decide_next_step, {"generate_lesson": "generate_lesson", END: END}
-    )
-
-    workflow.add_edge("generate_lesson", END)
-
-    return workflow.compile(checkpointer=checkpointer)
+    graph = _compile_struggle_graph()
+    if checkpointer is None:
+        return graph
+    return graph.copy(update={"checkpointer": checkpointer})
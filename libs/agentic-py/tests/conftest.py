@@ -0,0 +1,39 @@
+"""Shared fixtures for agentic-py tests."""
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from agentic_py.workflows.audit import AuditState
+from agentic_py.workflows.struggle import StruggleState
+
+
+@pytest.fixture
+def struggle_state() -> Callable[..., StruggleState]:
+    """Build a StruggleState with non-struggling defaults, overridden by keyword."""
+
+    def _make(**overrides: Any) -> StruggleState:
+        base: dict[str, Any] = {
+            "edit_frequency": 0.0,
+            "error_logs": [],
+            "history": [],
+            "is_struggling": False,
+            "lesson_recommendation": None,
+        }
+        base.update(overrides)
+        return StruggleState(**base)
+
+    return _make
+
+
+@pytest.fixture
+def audit_state() -> Callable[..., AuditState]:
+    """Build a pending AuditState for a diff, overridden by keyword."""
+
+    def _make(diff_content: str = "", **overrides: Any) -> AuditState:
+        base: dict[str, Any] = {"diff_content": diff_content, "violations": [], "status": "pending"}
+        base.update(overrides)
+        return AuditState(**base)
+
+    return _make
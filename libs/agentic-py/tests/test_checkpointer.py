@@ -0,0 +1,80 @@
+"""
+Tests for the Postgres checkpointer connection pool handling.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agentic_py.workflows import checkpointer as checkpointer_module
+from agentic_py.workflows.checkpointer import close_checkpointer_pool, get_checkpointer
+
+
+def _mock_pool():
+    pool = MagicMock()
+    pool.closed = False
+    pool.open = AsyncMock()
+    pool.close = AsyncMock()
+    return pool
+
+
+@pytest.fixture(autouse=True)
+def reset_pool():
+    """Ensure each test starts without a shared pool."""
+    checkpointer_module._pool = None
+    yield
+    checkpointer_module._pool = None
+
+
+@pytest.mark.asyncio
+async def test_get_checkpointer_reuses_pool():
+    """Test the connection pool is created once and shared across checkpointers."""
+    pool = _mock_pool()
+    with (
+        patch.object(checkpointer_module, "AsyncConnectionPool", return_value=pool) as pool_cls,
+        patch.object(checkpointer_module, "AsyncPostgresSaver") as saver_cls,
+    ):
+        async with get_checkpointer():
+            pass
+        async with get_checkpointer():
+            pass
+
+    assert pool_cls.call_count == 1
+    assert pool_cls.call_args.kwargs["conninfo"].startswith("postgresql://")
+    assert pool_cls.call_args.kwargs["kwargs"] == {"autocommit": True, "prepare_threshold": 0}
+    assert pool_cls.call_args.kwargs["max_waiting"] == checkpointer_module.POOL_MAX_WAITING
+    pool.open.assert_awaited_once_with(wait=True)
+    pool.close.assert_not_awaited()
+    assert [c.args for c in saver_cls.call_args_list] == [(pool,), (pool,)]
+
+
+@pytest.mark.asyncio
+async def test_close_checkpointer_pool():
+    """Test closing the pool releases it and the next checkpointer opens a new one."""
+    first, second = _mock_pool(), _mock_pool()
+    with (
+        patch.object(checkpointer_module, "AsyncConnectionPool", side_effect=[first, second]),
+        patch.object(checkpointer_module, "AsyncPostgresSaver"),
+    ):
+        async with get_checkpointer():
+            pass
+        await close_checkpointer_pool()
+        async with get_checkpointer():
+            pass
+
+    first.close.assert_awaited_once()
+    assert checkpointer_module._pool is second
+
+
+@pytest.mark.asyncio
+async def test_get_checkpointer_open_failure_not_cached():
+    """Test a pool that fails to open is closed and not reused."""
+    pool = _mock_pool()
+    pool.open.side_effect = OSError("connection refused")
+    with patch.object(checkpointer_module, "AsyncConnectionPool", return_value=pool):
+        with pytest.raises(OSError):
+            async with get_checkpointer():
+                pass
+
+    pool.close.assert_awaited_once()
+    assert checkpointer_module._pool is None
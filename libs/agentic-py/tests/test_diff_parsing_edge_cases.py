@@ -213,3 +213,22 @@ def test_parse_diff_very_long_line():
     # Should handle long lines without crashing
     assert isinstance(result, dict)
     assert len(result["parsed_hunks"]) > 0
+
+
+def test_iter_lines_matches_split():
+    """Test the lazy line iterator yields exactly what str.split("\\n") would."""
+    from agentic_py.workflows.audit import _iter_lines
+
+    for text in ["", "a", "a\n", "\n\n", "+x\n-y\n z", "a\r\nb\n"]:
+        assert list(_iter_lines(text)) == text.split("\n")
+
+
+def test_parse_hunk_header():
+    """Test hunk headers are parsed without a regex, rejecting malformed ones."""
+    from agentic_py.workflows.audit import _parse_hunk_header
+
+    assert _parse_hunk_header("@@ -1,5 +1,6 @@") == (1, 5, 1, 6)
+    assert _parse_hunk_header("@@ -3 +4 @@ def foo():") == (3, 1, 4, 1)
+    assert _parse_hunk_header("@@  -10,0\t+11,3  @@") == (10, 0, 11, 3)
+    for line in ["@@ -1,5 +1,6@@", "@@@ -1 +1 @@", "@@ -1, +1 @@", "@@ -1_0 +1 @@", "@@ +1 -1 @@"]:
+        assert _parse_hunk_header(line) is None
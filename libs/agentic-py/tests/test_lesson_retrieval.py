@@ -6,7 +6,7 @@ and difficulty levels. These tests verify that the RAG system can properly
 retrieve relevant educational content based on student queries.
 """
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -44,15 +44,13 @@ async def test_retrieve_python_beginner_lesson():
     service._vector_store = mock_vector_store
     service._embedding_model = MagicMock()
 
-    with patch("asyncio.get_event_loop") as mock_loop:
-        mock_loop.return_value.run_in_executor = AsyncMock(return_value=[mock_doc])
-        result = await service.query_knowledge(
-            query="How do I create variables in Python?",
-            top_k=1,
-        )
+    result = await service.query_knowledge(
+        query="How do I create variables in Python?",
+        top_k=1,
+    )
 
-        assert "variable" in result.lower() or "Variables" in result
-        assert "python" in result.lower()
+    assert "variable" in result.lower() or "Variables" in result
+    assert "python" in result.lower()
 
 
 @pytest.mark.asyncio
@@ -84,15 +82,13 @@ async def test_retrieve_typescript_intermediate_lesson():
     service._vector_store = mock_vector_store
     service._embedding_model = MagicMock()
 
-    with patch("asyncio.get_event_loop") as mock_loop:
-        mock_loop.return_value.run_in_executor = AsyncMock(return_value=[mock_doc])
-        result = await service.query_knowledge(
-            query="How do I use generics in TypeScript?",
-            top_k=1,
-        )
+    result = await service.query_knowledge(
+        query="How do I use generics in TypeScript?",
+        top_k=1,
+    )
 
-        assert "generic" in result.lower() or "Generics" in result
-        assert "typescript" in result.lower()
+    assert "generic" in result.lower() or "Generics" in result
+    assert "typescript" in result.lower()
 
 
 @pytest.mark.asyncio
@@ -125,15 +121,13 @@ async def test_retrieve_java_advanced_lesson():
     service._vector_store = mock_vector_store
     service._embedding_model = MagicMock()
 
-    with patch("asyncio.get_event_loop") as mock_loop:
-        mock_loop.return_value.run_in_executor = AsyncMock(return_value=[mock_doc])
-        result = await service.query_knowledge(
-            query="How do I create threads in Java?",
-            top_k=1,
-        )
+    result = await service.query_knowledge(
+        query="How do I create threads in Java?",
+        top_k=1,
+    )
 
-        assert "thread" in result.lower() or "Thread" in result
-        assert "java" in result.lower()
+    assert "thread" in result.lower() or "Thread" in result
+    assert "java" in result.lower()
 
 
 @pytest.mark.asyncio
@@ -166,21 +160,17 @@ async def test_retrieve_with_error_patterns():
     service._vector_store = mock_vector_store
     service._embedding_model = MagicMock()
 
-    with patch("asyncio.get_event_loop") as mock_loop:
-        mock_loop.return_value.run_in_executor = AsyncMock(return_value=[mock_doc])
-        result = await service.query_knowledge(
-            query="Python error",
-            error_patterns=["NameError: name 'x' is not defined"],
-            top_k=1,
-        )
+    result = await service.query_knowledge(
+        query="Python error",
+        error_patterns=["NameError: name 'x' is not defined"],
+        top_k=1,
+    )
 
-        # Verify query was enhanced with error pattern
-        enhanced_query = service._enhance_query(
-            "Python error", ["NameError: name 'x' is not defined"]
-        )
-        assert "NameError" in enhanced_query
+    # Verify query was enhanced with error pattern
+    enhanced_query = service._enhance_query("Python error", ["NameError: name 'x' is not defined"])
+    assert "NameError" in enhanced_query
 
-        assert "error" in result.lower() or "Error" in result
+    assert "error" in result.lower() or "Error" in result
 
 
 @pytest.mark.asyncio
@@ -204,17 +194,15 @@ async def test_retrieve_multiple_lessons():
     service._vector_store = mock_vector_store
     service._embedding_model = MagicMock()
 
-    with patch("asyncio.get_event_loop") as mock_loop:
-        mock_loop.return_value.run_in_executor = AsyncMock(return_value=mock_docs)
-        result = await service.query_knowledge(
-            query="Python for loops",
-            top_k=3,
-        )
+    result = await service.query_knowledge(
+        query="Python for loops",
+        top_k=3,
+    )
 
-        # Should contain content from multiple documents
-        assert "Lesson content 1" in result
-        assert "Lesson content 2" in result
-        assert "Lesson content 3" in result
+    # Should contain content from multiple documents
+    assert "Lesson content 1" in result
+    assert "Lesson content 2" in result
+    assert "Lesson content 3" in result
 
 
 @pytest.mark.asyncio
@@ -227,15 +215,13 @@ async def test_retrieve_no_results():
     service._vector_store = mock_vector_store
     service._embedding_model = MagicMock()
 
-    with patch("asyncio.get_event_loop") as mock_loop:
-        mock_loop.return_value.run_in_executor = AsyncMock(return_value=[])
-        result = await service.query_knowledge(
-            query="Completely unrelated query",
-            top_k=5,
-        )
+    result = await service.query_knowledge(
+        query="Completely unrelated query",
+        top_k=5,
+    )
 
-        # Should return a message indicating no results
-        assert "not found" in result.lower() or "no relevant" in result.lower()
+    # Should return a message indicating no results
+    assert "not found" in result.lower() or "no relevant" in result.lower()
 
 
 @pytest.mark.asyncio
@@ -257,15 +243,13 @@ async def test_retrieve_difficulty_filtering():
     service._vector_store = mock_vector_store
     service._embedding_model = MagicMock()
 
-    with patch("asyncio.get_event_loop") as mock_loop:
-        mock_loop.return_value.run_in_executor = AsyncMock(return_value=[mock_doc])
-        result = await service.query_knowledge(
-            query="Python basics for beginners",
-            top_k=1,
-        )
+    result = await service.query_knowledge(
+        query="Python basics for beginners",
+        top_k=1,
+    )
 
-        # Verify metadata is included in formatted results
-        assert "beginner" in result.lower() or "basics" in result.lower()
+    # Verify metadata is included in formatted results
+    assert "beginner" in result.lower() or "basics" in result.lower()
 
 
 @pytest.mark.asyncio
@@ -287,14 +271,12 @@ async def test_retrieve_cross_language_query():
     service._vector_store = mock_vector_store
     service._embedding_model = MagicMock()
 
-    with patch("asyncio.get_event_loop") as mock_loop:
-        mock_loop.return_value.run_in_executor = AsyncMock(return_value=[mock_doc])
-        result = await service.query_knowledge(
-            query="How do I use loops?",
-            top_k=1,
-        )
+    result = await service.query_knowledge(
+        query="How do I use loops?",
+        top_k=1,
+    )
 
-        assert "loop" in result.lower() or "Loop" in result
+    assert "loop" in result.lower() or "Loop" in result
 
 
 def test_enhance_query_with_error_patterns():
@@ -3,11 +3,21 @@ Tests for LLM utility functions and error handling.
 """
 
 import os
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from agentic_py.ai.llm import get_llm_client, invoke_llm_with_retry
+from agentic_py.ai.circuit import CircuitBreaker
+from agentic_py.ai.llm import get_llm_client, invoke_llm_stream, invoke_llm_with_retry
+
+
+@pytest.fixture(autouse=True)
+def llm_circuit(monkeypatch):
+    """Give each test a closed circuit breaker so failures don't leak between tests."""
+    circuit = CircuitBreaker(failure_threshold=5, cooldown=30.0)
+    monkeypatch.setattr("agentic_py.ai.llm._llm_circuit", circuit)
+    return circuit
 
 
 @pytest.mark.asyncio
@@ -25,8 +35,7 @@ async def test_get_llm_client_enabled():
     with patch.dict(os.environ, {"LLM_ENABLED": "true"}):
         with patch("agentic_py.ai.llm.LLM_ENABLED", True):
             with patch("langchain_openai.ChatOpenAI") as mock_llm:
-                mock_instance = MagicMock()
-                mock_llm.return_value = mock_instance
+                mock_llm.return_value = SimpleNamespace()
 
                 client = await get_llm_client()
                 assert client is not None
@@ -65,10 +74,9 @@ async def test_invoke_llm_with_retry_empty_prompt():
 async def test_invoke_llm_with_retry_success():
     """Test successful LLM invocation."""
     with patch("agentic_py.ai.llm.LLM_ENABLED", True):
-        mock_llm = MagicMock()
-        mock_response = MagicMock()
-        mock_response.content = "Test response"
-        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_llm = SimpleNamespace(
+            ainvoke=AsyncMock(return_value=SimpleNamespace(content="Test response"))
+        )
 
         with patch("agentic_py.ai.llm.get_llm_client", return_value=mock_llm):
             with patch("agentic_py.ai.cache.get_cached_response", return_value=None):
@@ -83,17 +91,13 @@ async def test_invoke_llm_with_retry_rate_limit():
     """Test LLM invocation with rate limit error and retry."""
 
     with patch("agentic_py.ai.llm.LLM_ENABLED", True):
-        mock_llm = MagicMock()
-
         # First call raises rate limit, second succeeds
-        mock_response = MagicMock()
-        mock_response.content = "Success after retry"
+        mock_response = SimpleNamespace(content="Success after retry")
 
         rate_limit_error = Exception("Rate limit exceeded")
-        rate_limit_error.response = MagicMock()
-        rate_limit_error.response.status_code = 429
+        rate_limit_error.response = SimpleNamespace(status_code=429)
 
-        mock_llm.ainvoke = AsyncMock(side_effect=[rate_limit_error, mock_response])
+        mock_llm = SimpleNamespace(ainvoke=AsyncMock(side_effect=[rate_limit_error, mock_response]))
 
         with patch("agentic_py.ai.llm.get_llm_client", return_value=mock_llm):
             with patch("agentic_py.ai.cache.get_cached_response", return_value=None):
@@ -104,13 +108,53 @@ async def test_invoke_llm_with_retry_rate_limit():
                         assert mock_llm.ainvoke.call_count == 2
 
 
+@pytest.mark.asyncio
+async def test_invoke_llm_with_retry_honors_retry_after():
+    """Test a rate limit waits as long as the Retry-After header says, not a jittered delay."""
+    with patch("agentic_py.ai.llm.LLM_ENABLED", True):
+        mock_response = SimpleNamespace(content="Success after retry")
+
+        rate_limit_error = Exception("Rate limit exceeded")
+        rate_limit_error.response = SimpleNamespace(headers={"Retry-After": "7"})
+
+        mock_llm = SimpleNamespace(ainvoke=AsyncMock(side_effect=[rate_limit_error, mock_response]))
+
+        with patch("agentic_py.ai.llm.get_llm_client", return_value=mock_llm):
+            with patch("agentic_py.ai.cache.get_cached_response", return_value=None):
+                with patch("agentic_py.ai.cache.set_cached_response", new_callable=AsyncMock):
+                    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+                        result = await invoke_llm_with_retry("test prompt", max_retries=3)
+
+    assert result == "Success after retry"
+    mock_sleep.assert_awaited_once_with(7.0)
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"retry-after": "2.5"}, 2.5),
+        ({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0.0),
+        ({"Retry-After": "soon"}, None),
+        ({"Retry-After": "nan"}, None),
+        ({}, None),
+    ],
+)
+def test_retry_after_seconds(headers, expected):
+    """Test Retry-After parsing for seconds, past HTTP dates and malformed values."""
+    from agentic_py.ai.llm import _retry_after_seconds
+
+    error = Exception("Rate limit exceeded")
+    error.response = SimpleNamespace(headers=headers)
+
+    assert _retry_after_seconds(error) == expected
+
+
 @pytest.mark.asyncio
 async def test_invoke_llm_with_retry_quota_exceeded():
     """Test LLM invocation with quota exceeded error (should not retry)."""
     with patch("agentic_py.ai.llm.LLM_ENABLED", True):
-        mock_llm = MagicMock()
         quota_error = Exception("Insufficient quota")
-        mock_llm.ainvoke = AsyncMock(side_effect=quota_error)
+        mock_llm = SimpleNamespace(ainvoke=AsyncMock(side_effect=quota_error))
 
         with patch("agentic_py.ai.llm.get_llm_client", return_value=mock_llm):
             with patch("agentic_py.ai.cache.get_cached_response", return_value=None):
@@ -122,9 +166,8 @@ async def test_invoke_llm_with_retry_quota_exceeded():
 async def test_invoke_llm_with_retry_auth_error():
     """Test LLM invocation with authentication error (should not retry)."""
     with patch("agentic_py.ai.llm.LLM_ENABLED", True):
-        mock_llm = MagicMock()
         auth_error = Exception("Authentication failed")
-        mock_llm.ainvoke = AsyncMock(side_effect=auth_error)
+        mock_llm = SimpleNamespace(ainvoke=AsyncMock(side_effect=auth_error))
 
         with patch("agentic_py.ai.llm.get_llm_client", return_value=mock_llm):
             with patch("agentic_py.ai.cache.get_cached_response", return_value=None):
@@ -137,9 +180,8 @@ async def test_invoke_llm_with_retry_max_retries_exceeded():
     """Test LLM invocation when max retries are exceeded."""
 
     with patch("agentic_py.ai.llm.LLM_ENABLED", True):
-        mock_llm = MagicMock()
         generic_error = Exception("Generic error")
-        mock_llm.ainvoke = AsyncMock(side_effect=generic_error)
+        mock_llm = SimpleNamespace(ainvoke=AsyncMock(side_effect=generic_error))
 
         with patch("agentic_py.ai.llm.get_llm_client", return_value=mock_llm):
             with patch("agentic_py.ai.cache.get_cached_response", return_value=None):
@@ -151,15 +193,267 @@ async def test_invoke_llm_with_retry_max_retries_exceeded():
                     assert mock_llm.ainvoke.call_count == 3
 
 
+@pytest.mark.parametrize(
+    ("message", "expected"),
+    [
+        ("Error code: 429 - {'error': {'code': 'insufficient_quota'}}", "quota exceeded"),
+        ("Error code: 401 - Incorrect API key provided", "authentication failed"),
+        ("Rate limit exceeded", None),
+        ("Timed out on request req_4013 (author: batch)", None),
+    ],
+)
+def test_retry_delay_classifies_errors(message, expected):
+    """Test terminal errors win over rate limits and ids don't look like status codes."""
+    from agentic_py.ai.llm import _retry_delay
+
+    if expected is None:
+        assert _retry_delay(Exception(message), attempt=0, max_retries=3) is not None
+    else:
+        with pytest.raises(RuntimeError, match=expected):
+            _retry_delay(Exception(message), attempt=0, max_retries=3)
+
+
+def test_invoke_llm_with_retry_jitter_distribution():
+    """Test retry delays are spread uniformly up to the capped exponential backoff."""
+    import random
+
+    from agentic_py.ai import llm
+
+    rng = random.Random(0)
+    with (
+        patch.object(llm, "INITIAL_RETRY_DELAY", 1.0),
+        patch.object(llm, "RETRY_BACKOFF_FACTOR", 2.0),
+        patch.object(llm, "MAX_RETRY_DELAY", 30.0),
+        patch("agentic_py.ai.llm.random.random", side_effect=rng.random),
+    ):
+        for attempt, cap in [(0, 1.0), (2, 4.0), (10, 30.0)]:
+            delays = [llm._backoff_delay(attempt) for _ in range(1000)]
+
+            assert all(0 <= delay <= cap for delay in delays)
+            # Uniform over [0, cap]: every quarter of the range gets a fair share
+            quarters = [0] * 4
+            for delay in delays:
+                quarters[min(int(delay / cap * 4), 3)] += 1
+            assert all(200 < count < 300 for count in quarters)
+
+
 @pytest.mark.asyncio
 async def test_invoke_llm_with_retry_string_response():
     """Test LLM invocation when response is a string instead of object."""
     with patch("agentic_py.ai.llm.LLM_ENABLED", True):
-        mock_llm = MagicMock()
-        mock_llm.ainvoke = AsyncMock(return_value="String response")
+        mock_llm = SimpleNamespace(ainvoke=AsyncMock(return_value="String response"))
 
         with patch("agentic_py.ai.llm.get_llm_client", return_value=mock_llm):
             with patch("agentic_py.ai.cache.get_cached_response", return_value=None):
                 with patch("agentic_py.ai.cache.set_cached_response", new_callable=AsyncMock):
                     result = await invoke_llm_with_retry("test prompt")
                     assert result == "String response"
+
+
+def _fake_astream(*outcomes):
+    """Build an astream replacement where each call yields the next outcome's chunks."""
+    calls = iter(outcomes)
+
+    async def astream(prompt):
+        for item in next(calls):
+            if isinstance(item, Exception):
+                raise item
+            yield SimpleNamespace(content=item)
+
+    return astream
+
+
+@pytest.mark.asyncio
+async def test_invoke_llm_stream_yields_chunks_and_caches():
+    """Test streaming yields chunks as they arrive, retrying failures before output."""
+    mock_llm = SimpleNamespace(
+        astream=_fake_astream([Exception("connection reset")], ["Use ", "logging"])
+    )
+    with (
+        patch("agentic_py.ai.llm.LLM_ENABLED", True),
+        patch("agentic_py.ai.llm.get_llm_client", return_value=mock_llm),
+        patch("agentic_py.ai.cache.get_cached_response", return_value=None),
+        patch("agentic_py.ai.cache.set_cached_response", new_callable=AsyncMock) as mock_set,
+        patch("asyncio.sleep", new_callable=AsyncMock),
+    ):
+        chunks = [chunk async for chunk in invoke_llm_stream("test prompt")]
+
+    assert chunks == ["Use ", "logging"]
+    assert mock_set.await_args.args[:2] == ("test prompt", "Use logging")
+
+
+@pytest.mark.asyncio
+async def test_invoke_llm_stream_partial_failure_not_retried():
+    """Test a stream that breaks after yielding output raises instead of retrying."""
+    mock_llm = SimpleNamespace(
+        astream=_fake_astream(["Use ", Exception("connection reset")], ["never"])
+    )
+    with (
+        patch("agentic_py.ai.llm.LLM_ENABLED", True),
+        patch("agentic_py.ai.llm.get_llm_client", return_value=mock_llm),
+        patch("agentic_py.ai.cache.get_cached_response", return_value=None),
+        patch("agentic_py.ai.cache.set_cached_response", new_callable=AsyncMock) as mock_set,
+    ):
+        chunks = []
+        with pytest.raises(RuntimeError, match="partial output"):
+            async for chunk in invoke_llm_stream("test prompt"):
+                chunks.append(chunk)
+
+    assert chunks == ["Use "]
+    mock_set.assert_not_awaited()
+
+
+def test_canonicalize_prompt_ignores_formatting_only_differences():
+    """Test prompts differing only in line endings and blank lines canonicalize equally."""
+    from agentic_py.ai.cache import canonicalize_prompt
+
+    prompt = "Fix this:\n\ndef f():\n    return 1\n"
+    variant = "  \r\nFix this:   \r\n\r\n\r\n\r\ndef f():\t\r\n    return 1\r\n\r\n"
+
+    assert canonicalize_prompt(variant) == canonicalize_prompt(prompt) == prompt.strip()
+    # Indentation is significant in embedded code and is kept
+    assert canonicalize_prompt("def f():\n  return 1") != canonicalize_prompt(
+        "def f():\n    return 1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_cached_response_shared_across_whitespace_variants():
+    """Test a response cached for one prompt is returned for a whitespace variant of it."""
+    from agentic_py.ai.cache import get_cached_response, set_cached_response, set_redis_cache
+
+    class FakeCache:
+        def __init__(self):
+            self.data = {}
+
+        async def get(self, prompt, model=None, temperature=None):
+            return self.data.get((prompt, model, temperature))
+
+        async def set(self, prompt, response, model=None, temperature=None, ttl=None):
+            self.data[(prompt, model, temperature)] = response
+
+    fake_cache = FakeCache()
+    set_redis_cache(fake_cache)
+    try:
+        with patch("agentic_py.ai.cache.CACHE_ENABLED", True):
+            await set_cached_response("Explain this error:\nTypeError\n", "answer", "gpt", 0.0)
+            cached = await get_cached_response("Explain this error:  \r\nTypeError", "gpt", 0.0)
+    finally:
+        set_redis_cache(None)
+
+    assert cached == "answer"
+    assert len(fake_cache.data) == 1
+
+
+@pytest.mark.asyncio
+async def test_invoke_llm_coalesces_duplicate_inflight_prompts():
+    """Test identical concurrent prompts share one LLM call, and other prompts don't."""
+    import asyncio
+
+    from agentic_py.ai import llm
+
+    release = asyncio.Event()
+
+    async def slow_ainvoke(prompt):
+        await release.wait()
+        return SimpleNamespace(content=f"answer to {prompt}")
+
+    mock_llm = SimpleNamespace(ainvoke=AsyncMock(side_effect=slow_ainvoke))
+
+    with (
+        patch("agentic_py.ai.llm.LLM_ENABLED", True),
+        patch("agentic_py.ai.llm.get_llm_client", return_value=mock_llm),
+        patch("agentic_py.ai.cache.get_cached_response", return_value=None),
+        patch("agentic_py.ai.cache.set_cached_response", new_callable=AsyncMock),
+    ):
+        calls = [
+            asyncio.create_task(invoke_llm_with_retry(prompt))
+            for prompt in ["same prompt"] * 10 + ["other prompt"]
+        ]
+        await asyncio.sleep(0)
+        # One caller giving up must not cancel the shared call for the rest
+        calls[0].cancel()
+        release.set()
+        results = await asyncio.gather(*calls[1:])
+
+    assert results == ["answer to same prompt"] * 9 + ["answer to other prompt"]
+    assert mock_llm.ainvoke.await_count == 2
+    assert llm._inflight_invocations == {}
+
+
+@pytest.mark.asyncio
+async def test_invoke_llm_circuit_opens_after_threshold(llm_circuit):
+    """Test repeated failures open the circuit so later calls fail without calling the LLM."""
+    mock_llm = SimpleNamespace(ainvoke=AsyncMock(side_effect=Exception("connection reset")))
+
+    with (
+        patch("agentic_py.ai.llm.LLM_ENABLED", True),
+        patch("agentic_py.ai.llm.get_llm_client", return_value=mock_llm),
+        patch("agentic_py.ai.cache.get_cached_response", return_value=None),
+        patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+    ):
+        # Three attempts each; the circuit opens on the fifth failed attempt overall
+        with pytest.raises(RuntimeError, match="failed after"):
+            await invoke_llm_with_retry("first prompt", max_retries=2)
+        with pytest.raises(RuntimeError, match="circuit open"):
+            await invoke_llm_with_retry("second prompt", max_retries=2)
+        with pytest.raises(RuntimeError, match="circuit open"):
+            await invoke_llm_with_retry("third prompt", max_retries=2)
+
+    assert mock_llm.ainvoke.await_count == 5
+    # No backoff wait once the circuit has opened
+    assert mock_sleep.await_count == 3
+    assert llm_circuit.is_open
+
+
+@pytest.mark.asyncio
+async def test_invoke_llm_rate_limits_keep_circuit_closed(llm_circuit):
+    """Test rate limit failures are retried without counting toward the circuit breaker."""
+    rate_limit_error = Exception("Rate limit exceeded")
+    rate_limit_error.response = SimpleNamespace(headers={"Retry-After": "1"})
+    mock_llm = SimpleNamespace(ainvoke=AsyncMock(side_effect=rate_limit_error))
+
+    with (
+        patch("agentic_py.ai.llm.LLM_ENABLED", True),
+        patch("agentic_py.ai.llm.get_llm_client", return_value=mock_llm),
+        patch("agentic_py.ai.cache.get_cached_response", return_value=None),
+        patch("asyncio.sleep", new_callable=AsyncMock),
+    ):
+        for i in range(3):
+            with pytest.raises(RuntimeError, match="failed after"):
+                await invoke_llm_with_retry(f"prompt {i}", max_retries=2)
+
+    assert mock_llm.ainvoke.await_count == 9
+    assert not llm_circuit.is_open
+
+
+def test_circuit_breaker_half_open_probe():
+    """Test after the cooldown one probe call is let through and its outcome decides."""
+    circuit = CircuitBreaker(failure_threshold=2, cooldown=30.0)
+    with patch("agentic_py.ai.circuit.time.monotonic", return_value=100.0):
+        circuit.record_failure()
+        circuit.check()
+        circuit.record_failure()
+        with pytest.raises(RuntimeError, match="circuit open"):
+            circuit.check()
+
+    with patch("agentic_py.ai.circuit.time.monotonic", return_value=131.0):
+        circuit.check()  # The probe
+        with pytest.raises(RuntimeError, match="circuit open"):
+            circuit.check()
+        circuit.record_success()
+        circuit.check()
+
+    assert not circuit.is_open
+
+
+def test_circuit_breaker_trips_on_terminal_error(llm_circuit):
+    """Test quota and authentication errors open the circuit straight away."""
+    import asyncio
+
+    from agentic_py.ai.llm import _handle_failed_attempt
+
+    with pytest.raises(RuntimeError, match="quota exceeded"):
+        asyncio.run(_handle_failed_attempt(Exception("Insufficient quota"), 0, 3))
+
+    assert llm_circuit.is_open
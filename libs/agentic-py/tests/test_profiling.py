@@ -0,0 +1,69 @@
+"""
+Tests for sampled stage profiling.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from agentic_py.ai import profiling
+from agentic_py.ai.profiling import timed
+
+
+def test_timed_disabled_returns_function_unchanged():
+    """Test the decorator adds no wrapper when profiling is disabled."""
+
+    def stage():
+        return 1
+
+    with patch.object(profiling, "PROFILING_ENABLED", False):
+        assert timed("stage", sample_rate=1.0)(stage) is stage
+
+
+def test_timed_records_sampled_sync_calls():
+    """Test sampled calls are timed, including ones that raise."""
+    with (
+        patch.object(profiling, "PROFILING_ENABLED", True),
+        patch.object(profiling, "record_stage_duration") as mock_record,
+    ):
+
+        @timed("always", sample_rate=1.0)
+        def always(x):
+            if x < 0:
+                raise ValueError("negative")
+            return x * 2
+
+        @timed("never", sample_rate=1e-12)
+        def never():
+            return "ok"
+
+        assert always(2) == 4
+        with pytest.raises(ValueError):
+            always(-1)
+        assert never() == "ok"
+
+    assert [c.args[0] for c in mock_record.call_args_list] == ["always", "always"]
+    assert all(c.args[1] >= 0 for c in mock_record.call_args_list)
+    assert always.__name__ == "always"
+
+
+@pytest.mark.asyncio
+async def test_timed_records_async_calls():
+    """Test coroutine functions are awaited inside the timer."""
+    import asyncio
+
+    with (
+        patch.object(profiling, "PROFILING_ENABLED", True),
+        patch.object(profiling, "record_stage_duration") as mock_record,
+    ):
+
+        @timed("llm_invoke", sample_rate=1.0)
+        async def invoke():
+            await asyncio.sleep(0.01)
+            return "done"
+
+        assert await invoke() == "done"
+
+    stage, seconds = mock_record.call_args.args
+    assert stage == "llm_invoke"
+    assert seconds >= 0.01
@@ -149,6 +149,32 @@ def test_load_prompt_caching():
     assert template1 is template2
 
 
+def test_load_agent_user_message_template_caching():
+    """Test that agent prompt templates are cached instead of re-reading the file."""
+    from agentic_py.prompts.loader import load_agent_user_message_template
+
+    template = load_agent_user_message_template("agents/struggle_agent_user")
+    with patch("pathlib.Path.read_text", side_effect=AssertionError("read again")):
+        assert load_agent_user_message_template("agents/struggle_agent_user") is template
+
+
+def test_preload_prompts_warms_caches():
+    """Test preloading reads every template so later loads don't touch the disk."""
+    from agentic_py.prompts.loader import load_prompt_renderer, preload_prompts
+
+    load_prompt.cache_clear()
+    load_prompt_renderer.cache_clear()
+
+    loaded = preload_prompts()
+
+    assert "violation_analysis/remediation_suggestion" in loaded
+    assert "lesson_generation/lesson_generation_base" in loaded
+    assert "agents/struggle_agent_user" in loaded
+    with patch("pathlib.Path.read_text", side_effect=AssertionError("read again")):
+        load_prompt("lesson_generation/lesson_generation_base")
+        load_prompt_renderer("violation_analysis/remediation_suggestion")
+
+
 def test_load_prompt_validation_error():
     """Test loading prompt that fails validation."""
     # Create a mock file with invalid template syntax
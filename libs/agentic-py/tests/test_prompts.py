@@ -2,6 +2,9 @@
 Tests for prompt loading and template system.
 """
 
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
 
 from agentic_py.prompts.loader import get_prompt_path, load_prompt
@@ -88,6 +91,22 @@ def test_prompt_caching():
     assert template1 is template2
 
 
+def test_load_prompt_no_reread_on_second_call():
+    """Test that repeated loads read the prompt file and resolve its path only once."""
+    load_prompt.cache_clear()
+    get_prompt_path.cache_clear()
+
+    with (
+        patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as mock_read,
+        patch.object(Path, "exists", autospec=True, side_effect=Path.exists) as mock_exists,
+    ):
+        for _ in range(100):
+            load_prompt("lesson_generation/lesson_generation_base")
+
+    assert mock_read.call_count == 1
+    assert mock_exists.call_count == 1
+
+
 def test_prompt_with_system_message():
     """Test that prompts with system messages are parsed correctly."""
     template = load_prompt("lesson_generation/lesson_generation_base")
@@ -134,3 +153,25 @@ def test_prompt_with_all_variables():
     assert "42" in result
     assert "no_print_statements" in result
     assert "print('hello')" in result
+
+
+@pytest.mark.parametrize(
+    "template_name",
+    [
+        "violation_analysis/remediation_suggestion",
+        "violation_analysis/violation_analysis_ambiguous",
+        "violation_analysis/violation_analysis_base",
+    ],
+)
+def test_prompt_renderer_matches_template_format(template_name):
+    """Test the precompiled renderer produces exactly what PromptTemplate.format does."""
+    from agentic_py.prompts.loader import load_prompt_renderer
+
+    template = load_prompt(template_name)
+    render = load_prompt_renderer(template_name)
+    values = {name: f"<{name}> {{braces}}" for name in template.input_variables}
+
+    assert render(**values) == template.format(**values)
+    assert load_prompt_renderer(template_name) is render
+    with pytest.raises(KeyError):
+        render()
@@ -22,7 +22,12 @@ from agentic_py.rag.loaders import (
     load_text,
     load_typescript,
 )
-from agentic_py.rag.utils import validate_file_size, validate_path
+from agentic_py.rag.utils import (
+    read_files_async,
+    validate_file_size,
+    validate_path,
+    validate_paths,
+)
 
 
 def test_get_text_splitter_recursive():
@@ -71,6 +76,16 @@ def test_get_text_splitter_validation_overlap_too_large():
         get_text_splitter("recursive", chunk_size=100, chunk_overlap=100)
 
 
+def test_get_text_splitter_language_cached():
+    """Test language-specific recursive splitters are built once and reused."""
+    from langchain_text_splitters import Language
+
+    python_splitter = get_text_splitter("recursive", 200, 20, language=Language.PYTHON)
+    assert python_splitter is get_text_splitter("recursive", 200, 20, language=Language.PYTHON)
+    assert python_splitter is not get_text_splitter("recursive", 200, 20)
+    assert any("class " in sep for sep in python_splitter._separators)
+
+
 def test_chunk_text():
     """Test chunking text into pieces."""
     text = "This is a long text. " * 50  # Create long text
@@ -157,6 +172,13 @@ def test_load_document_not_found():
         load_document("/nonexistent/file.md")
 
 
+@pytest.mark.asyncio
+async def test_ingest_document_not_found(tmp_path):
+    """Test ingesting a missing file raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError, match="File not found"):
+        await ingest_document(tmp_path / "missing.md")
+
+
 def test_discover_files(tmp_path):
     """Test file discovery in directory."""
     # Create test files
@@ -203,6 +225,23 @@ async def test_ingest_document_with_metadata_override(tmp_path):
     assert docs[0].metadata.get("custom") == "value"
 
 
+@pytest.mark.asyncio
+async def test_ingest_document_content_digest(tmp_path):
+    """Test the sha256 metadata follows the stored text and source, not the file's mtime."""
+    first = tmp_path / "a.md"
+    second = tmp_path / "b.md"
+    first.write_text("# Same")
+    second.write_text("# Same")
+
+    digest = (await ingest_document(first))[0].metadata["sha256"]
+    os.utime(first, (0, 0))
+    assert (await ingest_document(first))[0].metadata["sha256"] == digest
+    assert (await ingest_document(second))[0].metadata["sha256"] != digest
+
+    first.write_text("# Edited")
+    assert (await ingest_document(first))[0].metadata["sha256"] != digest
+
+
 @pytest.mark.asyncio
 async def test_ingest_directory(tmp_path):
     """Test ingesting a directory of documents."""
@@ -219,6 +258,33 @@ async def test_ingest_directory(tmp_path):
     assert all(hasattr(doc, "page_content") for doc in result["documents"])
 
 
+@pytest.mark.asyncio
+async def test_ingest_directory_loads_files_off_loop_in_order(tmp_path):
+    """Test files are loaded on worker threads and their chunks kept in discovery order."""
+    import threading
+    from unittest.mock import patch
+
+    from agentic_py.rag import ingestion
+
+    for i in range(20):
+        (tmp_path / f"doc{i:02d}.md").write_text(f"# Doc {i}\n\nContent {i}")
+
+    load_document = ingestion.load_document
+    loader_threads = set()
+
+    def tracking_load(path):
+        loader_threads.add(threading.current_thread())
+        return load_document(path)
+
+    with patch.object(ingestion, "load_document", side_effect=tracking_load):
+        result = await ingest_directory(tmp_path, file_patterns=["*.md"], recursive=False)
+
+    sources = [os.path.basename(doc.metadata["source"]) for doc in result["documents"]]
+    assert sources == sorted(sources)
+    assert result["files_processed"] == 20
+    assert threading.current_thread() not in loader_threads
+
+
 @pytest.mark.asyncio
 @pytest.mark.asyncio
 async def test_ingest_directory_with_errors(tmp_path):
@@ -283,6 +349,163 @@ def test_validate_path_traversal_attempt(tmp_path):
         validate_path(base_dir / ".." / "sensitive" / "secret.txt", base_dirs=[str(base_dir)])
 
 
+def test_validate_path_sibling_prefix(tmp_path):
+    """Test that a sibling sharing the base directory's name prefix is rejected."""
+    base_dir = tmp_path / "docs"
+    base_dir.mkdir()
+    sibling = tmp_path / "docs-private"
+    sibling.mkdir()
+    secret = sibling / "secret.md"
+    secret.write_text("# Secret")
+
+    assert validate_path(base_dir, base_dirs=[str(base_dir)]) == base_dir.resolve()
+    with pytest.raises(RAGPathError, match="outside allowed directories"):
+        validate_path(secret, base_dirs=[str(base_dir)])
+
+
+def test_validate_path_symlinked_parent(tmp_path):
+    """Test that symlinked parent directories and '..' are resolved, not collapsed lexically."""
+    base_dir = tmp_path / "allowed"
+    base_dir.mkdir()
+    outside = tmp_path / "outside"
+    (outside / "nested").mkdir(parents=True)
+    (outside / "nested" / "secret.md").write_text("# Secret")
+    (base_dir / "escape").symlink_to(outside / "nested")
+
+    with pytest.raises(RAGPathError):
+        validate_path(base_dir / "escape" / "secret.md", base_dirs=[str(base_dir)])
+    # Lexically this is allowed/nested/secret.md, but ".." applies to the symlink target
+    escaped = base_dir / "escape" / ".." / "nested" / "secret.md"
+    with pytest.raises(RAGPathError):
+        validate_path(escaped, base_dirs=[str(base_dir)])
+
+
+def test_validate_path_multiple_bases(tmp_path):
+    """Test matching against several allowed bases, including the filesystem root."""
+    bases = [str(tmp_path / f"base{i}") for i in range(5)]
+    for base in bases:
+        os.makedirs(base)
+    target = tmp_path / "base3" / "doc.md"
+    target.write_text("# Doc")
+
+    assert validate_path(target, base_dirs=bases) == target.resolve()
+    assert validate_path(target, base_dirs=["/"]) == target.resolve()
+    with pytest.raises(RAGPathError):
+        validate_path(tmp_path / "base10" / "doc.md", base_dirs=bases)
+
+
+def test_validate_path_cache_clear(tmp_path):
+    """Test that cached resolutions are refreshed after cache_clear."""
+    base_dir = tmp_path / "allowed"
+    base_dir.mkdir()
+    target = base_dir / "target.md"
+    target.write_text("# Target")
+    link = tmp_path / "link.md"
+    link.symlink_to(target)
+
+    assert validate_path(link, base_dirs=[str(base_dir)]) == target
+
+    # Repoint the symlink outside the allowed directory
+    link.unlink()
+    link.symlink_to(tmp_path / "outside.md")
+    validate_path.cache_clear()
+
+    with pytest.raises(RAGPathError, match="outside allowed directories"):
+        validate_path(link, base_dirs=[str(base_dir)])
+
+
+def test_validate_path_file_swapped_for_symlink(tmp_path):
+    """Test a validated file later replaced by an escaping symlink is rejected without cache_clear."""
+    base_dir = tmp_path / "allowed"
+    base_dir.mkdir()
+    secret = tmp_path / "secret.txt"
+    secret.write_text("SECRET")
+    doc = base_dir / "doc.md"
+    doc.write_text("# Doc")
+
+    assert validate_path(doc, base_dirs=[str(base_dir)]) == doc.resolve()
+
+    doc.unlink()
+    doc.symlink_to(base_dir / ".." / "secret.txt")
+
+    with pytest.raises(RAGPathError, match="outside allowed directories"):
+        validate_path(doc, base_dirs=[str(base_dir)])
+
+
+def test_validate_path_parent_swapped_for_symlink(tmp_path):
+    """Test a validated file whose directory is later replaced by an escaping symlink is rejected."""
+    base_dir = tmp_path / "allowed"
+    sub_dir = base_dir / "sub"
+    sub_dir.mkdir(parents=True)
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "doc.md").write_text("SECRET")
+    doc = sub_dir / "doc.md"
+    doc.write_text("# Doc")
+
+    assert validate_path(doc, base_dirs=[str(base_dir)]) == doc.resolve()
+
+    doc.unlink()
+    sub_dir.rmdir()
+    sub_dir.symlink_to(outside)
+
+    with pytest.raises(RAGPathError, match="outside allowed directories"):
+        validate_path(doc, base_dirs=[str(base_dir)])
+
+
+def test_validate_path_default_bases(tmp_path, monkeypatch):
+    """Test that configured base directories are used when none are passed."""
+    from agentic_py.rag import utils
+
+    base_dir = tmp_path / "allowed"
+    base_dir.mkdir()
+    file_path = base_dir / "test.md"
+    file_path.write_text("# Test")
+
+    monkeypatch.setattr(utils, "RAG_ALLOWED_BASE_DIRS", [str(base_dir)])
+    validate_path.cache_clear()
+    try:
+        assert validate_path(file_path) == file_path.resolve()
+        with pytest.raises(RAGPathError):
+            validate_path(tmp_path / "outside.md")
+    finally:
+        monkeypatch.undo()
+        validate_path.cache_clear()
+
+
+def test_validate_path_negative_cache(tmp_path):
+    """Test that rejections are cached until the path is invalidated."""
+    from agentic_py.rag import utils
+
+    base_dir = tmp_path / "allowed"
+    base_dir.mkdir()
+    outside = tmp_path / "outside.md"
+
+    with pytest.raises(RAGPathError):
+        validate_path(outside, base_dirs=[str(base_dir)])
+    assert (str(outside), (str(base_dir),)) in utils._negative_path_cache
+
+    validate_path.invalidate(outside)
+    assert (str(outside), (str(base_dir),)) not in utils._negative_path_cache
+
+
+@pytest.mark.asyncio
+async def test_validate_paths(tmp_path):
+    """Test batch validation returns resolved paths and sizes in order."""
+    base_dir = tmp_path / "allowed"
+    base_dir.mkdir()
+    first = base_dir / "a.md"
+    first.write_text("abc")
+    second = base_dir / "b.md"
+    second.write_text("abcdef")
+
+    results = await validate_paths([second, first], base_dirs=[str(base_dir)])
+    assert results == [(second.resolve(), 6), (first.resolve(), 3)]
+
+    with pytest.raises(RAGPathError):
+        await validate_paths([first, tmp_path / "outside.md"], base_dirs=[str(base_dir)])
+
+
 def test_validate_path_no_restrictions(tmp_path):
     """Test path validation with no restrictions (empty base_dirs)."""
     file_path = tmp_path / "test.md"
@@ -298,8 +521,12 @@ def test_validate_file_size(tmp_path):
     small_file = tmp_path / "small.txt"
     small_file.write_text("small content")
 
-    # Should not raise for small file
-    validate_file_size(small_file)
+    # Should not raise for small file, and returns the stat result for reuse
+    stat_info = validate_file_size(small_file)
+    assert stat_info.st_size == len("small content")
+
+    with pytest.raises(FileNotFoundError):
+        validate_file_size(tmp_path / "missing.txt")
 
     # Create a large file (simulate)
     large_file = tmp_path / "large.txt"
@@ -310,6 +537,79 @@ def test_validate_file_size(tmp_path):
         validate_file_size(large_file)
 
 
+@pytest.mark.asyncio
+async def test_read_file_async_size_and_encoding(tmp_path, monkeypatch):
+    """Test reads reject oversized files, honour BOMs and fall back to latin-1."""
+    from agentic_py.rag import utils
+
+    latin_file = tmp_path / "latin.txt"
+    latin_file.write_bytes("café".encode("latin-1"))
+    assert await utils.read_file_async(latin_file) == "café"
+
+    bom_file = tmp_path / "bom.txt"
+    bom_file.write_bytes("\ufeffhello".encode("utf-8"))
+    assert await utils.read_file_async(bom_file) == "hello"
+
+    utf16_file = tmp_path / "utf16.txt"
+    utf16_file.write_text("héllo", encoding="utf-16")
+    assert await utils.read_file_async(utf16_file) == "héllo"
+
+    # BOM-like prefix that isn't valid UTF-16 falls back to latin-1 too
+    fake_bom_file = tmp_path / "fake_bom.txt"
+    fake_bom_file.write_bytes(b"\xff\xfeA")
+    assert await utils.read_file_async(fake_bom_file) == "ÿþA"
+
+    # Line endings are translated like a text-mode read
+    crlf_file = tmp_path / "crlf.md"
+    crlf_file.write_bytes(b"# T\r\n\r\nbody\r\nold mac\rend")
+    assert await utils.read_file_async(crlf_file) == "# T\n\nbody\nold mac\nend"
+
+    monkeypatch.setattr(utils, "RAG_MAX_FILE_SIZE", 2)
+    with pytest.raises(RAGFileError, match="exceeds maximum size"):
+        await utils.read_file_async(latin_file)
+
+    with pytest.raises(RAGFileError, match="Failed to read file"):
+        await utils.read_file_async(tmp_path / "missing.txt")
+
+
+@pytest.mark.asyncio
+async def test_read_file_async_mmap(tmp_path, monkeypatch):
+    """Test large files are decoded from a memory map with the same results."""
+    from agentic_py.rag import utils
+
+    monkeypatch.setattr(utils, "_MMAP_THRESHOLD", 4)
+
+    utf8_file = tmp_path / "utf8.md"
+    utf8_file.write_text("# Überschrift\n" * 10, encoding="utf-8")
+    assert await utils.read_file_async(utf8_file) == "# Überschrift\n" * 10
+
+    bom_file = tmp_path / "bom.md"
+    bom_file.write_text("héllo", encoding="utf-16")
+    assert await utils.read_file_async(bom_file) == "héllo"
+
+    latin_file = tmp_path / "latin.md"
+    latin_file.write_bytes("café au lait".encode("latin-1"))
+    assert await utils.read_file_async(latin_file) == "café au lait"
+
+    crlf_file = tmp_path / "crlf.md"
+    crlf_file.write_bytes(b"line one\r\nline two\r\n")
+    assert await utils.read_file_async(crlf_file) == "line one\nline two\n"
+
+
+@pytest.mark.asyncio
+async def test_read_files_async_preserves_order(tmp_path):
+    """Test batched reads return contents in input order."""
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"file{i}.md"
+        path.write_text(f"content {i}")
+        paths.append(path)
+
+    contents = await read_files_async(paths, concurrency=2)
+
+    assert contents == [f"content {i}" for i in range(5)]
+
+
 def test_discover_files_invalid_pattern(tmp_path):
     """Test that invalid file patterns raise RAGValidationError."""
     (tmp_path / "test.md").write_text("# Test")
@@ -410,3 +710,18 @@ async def test_ingest_directory_with_binary_file(tmp_path):
     result = await ingest_directory(tmp_path, file_patterns=["*"])
     # Should process text file, may skip or error on binary
     assert result["files_processed"] >= 0  # At least attempted
+
+
+def test_discover_files_mixed_patterns(tmp_path):
+    """Test discovery with suffix-only and wildcard patterns together."""
+    (tmp_path / "guide.md").write_text("# Guide")
+    (tmp_path / "test_utils.py").write_text("x = 1")
+    (tmp_path / "main.py").write_text("x = 2")
+    (tmp_path / "notes.txt").write_text("notes")
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "test_nested.py").write_text("x = 3")
+
+    files = discover_files(tmp_path, file_patterns=[".md", "test_*.py"], recursive=True)
+
+    assert [f.name for f in files] == ["guide.md", "test_nested.py", "test_utils.py"]
+    assert files == sorted(files)
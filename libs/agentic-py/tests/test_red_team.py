@@ -4,6 +4,8 @@ Red Team Testing
 Tests for edge cases and adversarial examples to ensure robustness.
 """
 
+import time
+
 import pytest
 
 from agentic_py.workflows.audit import AuditState, check_violations, parse_diff
@@ -26,6 +28,55 @@ async def test_adversarial_large_diff():
     assert "status" in result
 
 
+@pytest.mark.asyncio
+async def test_check_violations_scales_linearly_with_added_lines():
+    """Test a 10k-line diff is scanned in a single cheap pass per line."""
+    line_count = 10_000
+    lines = [
+        f'+const password = "hunter{i}";' if i % 100 == 0 else f"+const value{i} = compute({i});"
+        for i in range(line_count)
+    ]
+    large_diff = (
+        f"--- a/src/app.js\n+++ b/src/app.js\n@@ -0,0 +1,{line_count} @@\n"
+        + "\n".join(lines)
+        + "\n"
+    )
+
+    state = AuditState(diff_content=large_diff, violations=[], status="pending")
+    state.update(parse_diff(state))
+
+    start = time.perf_counter()
+    result = await check_violations(state)
+    elapsed = time.perf_counter() - start
+
+    assert len(result["violations"]) == line_count // 100
+    # Generous bound (a few microseconds per line is typical) so slow CI machines pass,
+    # while a per-rule or quadratic scan would still blow it
+    assert elapsed / line_count < 50e-6
+
+
+@pytest.mark.asyncio
+async def test_check_violations_large_python_diff():
+    """Test a 10k-print Python diff is flagged line by line without rescanning per rule."""
+    line_count = 10_000
+    large_diff = (
+        f"--- a/src/app.py\n+++ b/src/app.py\n@@ -0,0 +1,{line_count} @@\n"
+        + "+print('x')\n" * line_count
+    )
+
+    state = AuditState(diff_content=large_diff, violations=[], status="pending")
+    state.update(parse_diff(state))
+
+    start = time.perf_counter()
+    result = await check_violations(state)
+    elapsed = time.perf_counter() - start
+
+    assert len(result["violations"]) == line_count
+    assert {d["rule_name"] for d in result["violation_details"]} == {"no_print_statements"}
+    # Generous per-line bound; the added code is parsed once, not once per rule or line
+    assert elapsed / line_count < 200e-6
+
+
 @pytest.mark.asyncio
 async def test_adversarial_malformed_diff():
     """Test handling of intentionally malformed diffs."""
@@ -105,6 +156,33 @@ async def test_adversarial_code_injection_attempt():
     # Should detect violations (import os, eval, exec are suspicious)
 
 
+@pytest.mark.asyncio
+async def test_code_injection_calls_detected_by_ast():
+    """Test eval, exec and os.system calls are flagged, but strings mentioning them are not."""
+    diff_content = """--- a/app.py
++++ b/app.py
+@@ -1,0 +1,6 @@
++import os
++os.system('rm -rf /')
++eval('__import__("os").system("echo pwned")')
++exec('print(1)')
++note = "never call eval( or os.system( here"
++evaluate(config)
+"""
+
+    state = AuditState(diff_content=diff_content, violations=[], status="pending")
+    state.update(parse_diff(state))
+    result = await check_violations(state)
+
+    found = [(d["rule_name"], d["line_number"]) for d in result["violation_details"]]
+    assert found == [
+        ("no_shell_commands", 2),
+        ("no_dynamic_code_execution", 3),
+        ("no_dynamic_code_execution", 4),
+    ]
+    assert result["status"] == "fail"
+
+
 @pytest.mark.asyncio
 async def test_edge_case_unicode_characters():
     """Test handling of unicode and special characters in diffs."""
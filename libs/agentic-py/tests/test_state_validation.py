@@ -62,6 +62,19 @@ class TestAuditStateValidation:
         assert validated["violations"] == []
         assert validated["status"] == "pending"
 
+    def test_validate_audit_state_defaults_not_shared(self):
+        """Test default containers are fresh per call and the input state is not modified."""
+        state: AuditState = {"diff_content": "test"}
+
+        first = validate_audit_state(state)
+        first["violations"].append("violation1")
+        first["file_extensions"].add("py")
+        second = validate_audit_state(state)
+
+        assert second["violations"] == []
+        assert second["file_extensions"] == set()
+        assert state == {"diff_content": "test"}
+
     def test_validate_audit_state_invalid_status(self):
         """Test validation with invalid status."""
         state: AuditState = {
@@ -140,6 +153,18 @@ class TestStruggleStateValidation:
         assert validated["is_struggling"] is False
         assert validated["lesson_recommendation"] is None
 
+    def test_validate_struggle_state_defaults_not_shared(self):
+        """Test default lists are fresh per call and the input state is not modified."""
+        state: StruggleState = {"edit_frequency": 1.0}
+
+        first = validate_struggle_state(state)
+        first["error_logs"].append("error1")
+        second = validate_struggle_state(state)
+
+        assert second["error_logs"] == []
+        assert first["history"] is not second["history"]
+        assert state == {"edit_frequency": 1.0}
+
     def test_validate_struggle_state_negative_frequency(self):
         """Test validation with negative edit frequency."""
         state: StruggleState = {
@@ -1,169 +1,123 @@
 import pytest
 
-from agentic_py.workflows.audit import AuditState, check_violations, parse_diff
-from agentic_py.workflows.struggle import StruggleState, detect_struggle, generate_lesson
+from agentic_py.workflows.audit import check_violations, parse_diff
+from agentic_py.workflows.struggle import (
+    StruggleState,
+    build_struggle_graph,
+    detect_struggle,
+    detect_struggle_batch,
+    generate_lesson,
+)
 
 
-def test_detect_struggle_true():
-    state = StruggleState(
-        edit_frequency=15.0,
-        error_logs=["Error 1"],
-        history=[],
-        is_struggling=False,
-        lesson_recommendation=None,
+@pytest.mark.parametrize(
+    ("edit_frequency", "error_logs", "combined_score", "expected"),
+    [
+        pytest.param(15.0, ["Error 1"], None, True, id="struggling"),
+        pytest.param(5.0, [], None, False, id="not-struggling"),
+        # Exactly at a threshold (10.0 edits, 2 errors) doesn't trigger struggle
+        pytest.param(10.0, [], None, False, id="edit-frequency-at-threshold"),
+        pytest.param(10.1, [], None, True, id="edit-frequency-above-threshold"),
+        pytest.param(5.0, ["Error 1", "Error 2"], None, False, id="errors-at-threshold"),
+        pytest.param(5.0, ["Error 1", "Error 2", "Error 3"], None, True, id="errors-above"),
+        pytest.param(1000.0, [], None, True, id="extreme-edit-frequency"),
+        pytest.param(1.0, [f"Error {i}" for i in range(100)], None, True, id="many-errors"),
+        # A positive client combined_score is trusted over the legacy thresholds
+        pytest.param(1.0, [], 0.75, True, id="client-combined-score"),
+        # A zero or missing combined_score falls back to the legacy thresholds
+        pytest.param(1.0, [], 0.0, False, id="combined-score-zero"),
+        pytest.param(15.0, [], None, True, id="combined-score-none-fallback"),
+    ],
+)
+def test_detect_struggle(edit_frequency, error_logs, combined_score, expected, struggle_state):
+    """Test struggle detection against the thresholds and the client combined score."""
+    state = struggle_state(
+        edit_frequency=edit_frequency,
+        error_logs=error_logs,
+        combined_score=combined_score,
     )
-    result = detect_struggle(state)
-    assert result["is_struggling"] is True
+    assert detect_struggle(state)["is_struggling"] is expected
 
 
-def test_detect_struggle_false():
-    state = StruggleState(
-        edit_frequency=5.0,
-        error_logs=[],
-        history=[],
-        is_struggling=False,
-        lesson_recommendation=None,
-    )
-    result = detect_struggle(state)
-    assert result["is_struggling"] is False
-
-
-def test_detect_struggle_boundary_edit_frequency():
-    """Test boundary value: edit_frequency exactly at threshold."""
-    # Exactly at threshold (10.0) should not trigger struggle
-    state = StruggleState(
-        edit_frequency=10.0,
-        error_logs=[],
-        history=[],
-        is_struggling=False,
-        lesson_recommendation=None,
-    )
-    result = detect_struggle(state)
-    assert result["is_struggling"] is False
-
-    # Just above threshold
-    state["edit_frequency"] = 10.1
-    result = detect_struggle(state)
-    assert result["is_struggling"] is True
-
-
-def test_detect_struggle_boundary_error_count():
-    """Test boundary value: error_logs exactly at threshold."""
-    # Exactly at threshold (2 errors) should not trigger struggle
-    state = StruggleState(
-        edit_frequency=5.0,
-        error_logs=["Error 1", "Error 2"],
-        history=[],
-        is_struggling=False,
-        lesson_recommendation=None,
-    )
-    result = detect_struggle(state)
-    assert result["is_struggling"] is False
-
-    # Just above threshold (3 errors)
-    state["error_logs"] = ["Error 1", "Error 2", "Error 3"]
-    result = detect_struggle(state)
-    assert result["is_struggling"] is True
-
-
-def test_detect_struggle_extreme_values():
-    """Test with extreme values."""
-    # Very high edit frequency
-    state = StruggleState(
-        edit_frequency=1000.0,
-        error_logs=[],
-        history=[],
-        is_struggling=False,
-        lesson_recommendation=None,
-    )
-    result = detect_struggle(state)
-    assert result["is_struggling"] is True
-
-
-def test_detect_struggle_with_combined_score():
-    """Test that combined_score from client is trusted over legacy thresholds."""
-    # Low edit_frequency but combined_score provided - should trust client
-    state = StruggleState(
-        edit_frequency=1.0,  # Below legacy threshold
-        error_logs=[],  # No errors
-        history=[],
-        is_struggling=False,
-        lesson_recommendation=None,
-        combined_score=0.75,  # Client says user is struggling
-        primary_signal="time_pattern",
-    )
-    result = detect_struggle(state)
-    assert result["is_struggling"] is True
-
-
-def test_detect_struggle_combined_score_zero():
-    """Test that combined_score of 0 falls back to legacy detection."""
-    state = StruggleState(
-        edit_frequency=1.0,  # Below legacy threshold
-        error_logs=[],
-        history=[],
-        is_struggling=False,
-        lesson_recommendation=None,
-        combined_score=0.0,  # Zero score
-    )
-    result = detect_struggle(state)
-    assert result["is_struggling"] is False
-
-
-def test_detect_struggle_no_combined_score_fallback():
-    """Test fallback to legacy when combined_score is None."""
-    # No combined_score, but high edit_frequency - should use legacy
-    state = StruggleState(
-        edit_frequency=15.0,  # Above legacy threshold
-        error_logs=[],
-        history=[],
-        is_struggling=False,
-        lesson_recommendation=None,
-        combined_score=None,
-    )
-    result = detect_struggle(state)
-    assert result["is_struggling"] is True
-
-    # Many errors
-    state = StruggleState(
-        edit_frequency=1.0,
-        error_logs=[f"Error {i}" for i in range(100)],
-        history=[],
-        is_struggling=False,
-        lesson_recommendation=None,
+def test_detect_struggle_batch_matches_scalar():
+    """Test the batch evaluation agrees with detect_struggle on synthetic states."""
+    import random
+
+    rng = random.Random(0)
+    states = [
+        StruggleState(
+            edit_frequency=rng.uniform(0, 20),
+            error_logs=["Error"] * rng.randint(0, 5),
+            history=[],
+            combined_score=rng.choice([None, 0.0, rng.random()]),
+        )
+        for _ in range(10_000)
+    ]
+
+    assert detect_struggle_batch(states) == [
+        detect_struggle(state)["is_struggling"] for state in states
+    ]
+
+
+def test_detect_struggle_skips_error_count_on_high_edit_frequency(struggle_state):
+    """Test error logs aren't counted once edit frequency already indicates struggling."""
+    from unittest.mock import patch
+
+    class UncountableLogs(list):
+        def __len__(self):
+            raise AssertionError("error logs should not be counted")
+
+    state = struggle_state(
+        edit_frequency=50.0,
+        error_logs=UncountableLogs(),
     )
-    result = detect_struggle(state)
-    assert result["is_struggling"] is True
+    # The lazy debug log would count them when debug logging is enabled
+    with patch("agentic_py.workflows.struggle.logger"):
+        assert detect_struggle(state)["is_struggling"] is True
 
 
 @pytest.mark.asyncio
-async def test_generate_lesson_struggling():
-    state = StruggleState(
-        edit_frequency=15.0,
-        error_logs=[],
-        history=[],
-        is_struggling=True,
-        lesson_recommendation=None,
+@pytest.mark.parametrize(
+    ("edit_frequency", "is_struggling", "expects_lesson"),
+    [
+        pytest.param(15.0, True, True, id="struggling"),
+        pytest.param(5.0, False, False, id="not-struggling"),
+    ],
+)
+async def test_generate_lesson(edit_frequency, is_struggling, expects_lesson, struggle_state):
+    """Test generate_lesson only recommends a lesson when struggling."""
+    state = struggle_state(
+        edit_frequency=edit_frequency,
+        is_struggling=is_struggling,
     )
     result = await generate_lesson(state)
-    assert result["lesson_recommendation"] is not None
+    assert (result["lesson_recommendation"] is not None) is expects_lesson
 
 
 @pytest.mark.asyncio
-async def test_generate_lesson_not_struggling():
-    """Test generate_lesson when not struggling."""
-    state = StruggleState(
-        edit_frequency=5.0,
-        error_logs=[],
-        history=[],
-        is_struggling=False,
-        lesson_recommendation=None,
-    )
-    result = await generate_lesson(state)
-    assert result["lesson_recommendation"] is None
+async def test_struggle_graph_streams_lesson_chunks():
+    """Test the lesson is forwarded chunk by chunk on the graph's custom stream."""
+    from unittest.mock import patch
+
+    async def fake_stream(prompt):
+        for chunk in ["Check ", "for ", "None"]:
+            yield chunk
+
+    graph = build_struggle_graph()
+    state = StruggleState(edit_frequency=15.0, error_logs=["TypeError"], history=[])
+    with (
+        patch("agentic_py.config.llm.LLM_ENABLED", True),
+        patch("agentic_py.ai.llm.invoke_llm_stream", new=fake_stream),
+    ):
+        events = [event async for event in graph.astream(state, stream_mode=["custom", "values"])]
+
+    chunks = [data["lesson_chunk"] for mode, data in events if mode == "custom"]
+    final_state = [data for mode, data in events if mode == "values"][-1]
+    assert chunks == ["Check ", "for ", "None"]
+    assert final_state["lesson_recommendation"] == "Check for None"
 
 
-def test_parse_diff():
+def test_parse_diff(audit_state):
     """Test parse_diff function with standard git unified diff format."""
     diff_content = """--- a/src/file.py
 +++ b/src/file.py
@@ -172,7 +126,7 @@ def test_parse_diff():
 -    pass
 +    print('hello')
 """
-    state = AuditState(diff_content=diff_content, violations=[], status="pending")
+    state = audit_state(diff_content)
     result = parse_diff(state)
 
     assert isinstance(result, dict)
@@ -188,11 +142,17 @@ def test_parse_diff():
     assert result["added_lines"] > 0
 
 
-def test_parse_diff_empty_string():
-    """Test parse_diff with empty diff content."""
-    state = AuditState(diff_content="", violations=[], status="pending")
-    result = parse_diff(state)
-    assert isinstance(result, dict)
+@pytest.mark.parametrize(
+    "diff_content",
+    [
+        pytest.param("", id="empty"),
+        pytest.param("Binary files a/image.png and b/image.png differ", id="binary"),
+    ],
+)
+def test_parse_diff_without_hunks(diff_content, audit_state):
+    """Test parse_diff with diffs that have no text hunks to parse."""
+    result = parse_diff(audit_state(diff_content))
+
     assert result["parsed_files"] == []
     assert result["parsed_hunks"] == []
     assert result["file_extensions"] == set()
@@ -200,7 +160,7 @@ def test_parse_diff_empty_string():
     assert result["removed_lines"] == 0
 
 
-def test_parse_diff_multiple_files():
+def test_parse_diff_multiple_files(audit_state):
     """Test parse_diff with multiple files in diff."""
     diff_content = """--- a/src/file1.py
 +++ b/src/file1.py
@@ -213,7 +173,7 @@ def test_parse_diff_multiple_files():
 -old2
 +new2
 """
-    state = AuditState(diff_content=diff_content, violations=[], status="pending")
+    state = audit_state(diff_content)
     result = parse_diff(state)
 
     assert len(result["parsed_files"]) == 2
@@ -221,21 +181,108 @@ def test_parse_diff_multiple_files():
     assert result["parsed_files"][1]["new_path"] == "src/file2.py"
 
 
-def test_parse_diff_binary_file():
-    """Test parse_diff with binary file detection."""
-    diff_content = "Binary files a/image.png and b/image.png differ"
-    state = AuditState(diff_content=diff_content, violations=[], status="pending")
-    result = parse_diff(state)
+def test_parse_diff_reuses_parse_for_same_diff(audit_state):
+    """Test re-parsing an identical diff is served from the parse cache."""
+    from unittest.mock import patch
 
-    assert result["parsed_files"] == []
-    assert result["parsed_hunks"] == []
-    assert result["file_extensions"] == set()
+    from agentic_py.workflows import audit
+
+    diff_content = "--- a/m.py\n+++ b/m.py\n@@ -1,1 +1,2 @@\n x = 1\n+y = 2  # parse-cache\n"
+    state = audit_state(diff_content)
+    first = parse_diff(state)
+
+    with patch.object(audit, "_iter_lines", wraps=audit._iter_lines) as iter_lines:
+        second = parse_diff(audit_state(diff_content))
+        other = parse_diff(audit_state(diff_content + "+z = 3\n"))
+
+    assert second == first
+    assert second is not first
+    assert other["added_lines"] == 2
+    # Only the changed diff was parsed again
+    assert iter_lines.call_count == 1
+
+
+def test_parse_diff_cached_result_mutation_is_isolated(audit_state):
+    """Test mutating a parse result doesn't change what later parses of the diff return."""
+    diff_content = "--- a/m.py\n+++ b/m.py\n@@ -1,1 +1,2 @@\n x = 1\n+y = 2  # isolated\n"
+    first = parse_diff(audit_state(diff_content))
 
+    first["parsed_hunks"][0]["added_lines"].append("injected")
+    first["parsed_files"][0]["extension"] = "js"
+    first["file_extensions"].add("js")
+    first["diff_added_lines"].clear()
+    first["parsed_hunks"].clear()
 
-def test_parse_diff_malformed():
+    second = parse_diff(audit_state(diff_content))
+    assert second["parsed_hunks"][0]["added_lines"] == ["y = 2  # isolated"]
+    assert second["parsed_files"][0]["extension"] == "py"
+    assert second["file_extensions"] == {"py"}
+    assert second["diff_added_lines"] == [(5, "y = 2  # isolated")]
+
+
+@pytest.mark.asyncio
+async def test_iter_violations_matches_check_violations(audit_state):
+    """Test streamed violations are the ones check_violations returns, in the same order."""
+    from agentic_py.workflows.audit import iter_violations
+
+    diff_content = """--- a/src/app.py
++++ b/src/app.py
+@@ -1,0 +1,3 @@
++print("debug")
++breakpoint()
++token = "abc123"
+"""
+    state = audit_state(diff_content)
+    state.update(parse_diff(state))
+
+    streamed = [detail async for detail in iter_violations(state)]
+    result = await check_violations(state)
+
+    assert streamed == result["violation_details"]
+    assert [d["rule_name"] for d in streamed] == [
+        "no_print_statements",
+        "no_debugger_calls",
+        "hardcoded_secret",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_check_violations_skips_binary_fast(audit_state):
+    """Test a binary diff isn't rescanned once parse_diff has found no hunks in it."""
+    from unittest.mock import patch
+
+    diff_content = '--- a/blob.bin\n+++ b/blob.bin\n\x00\x00+password = "hunter2"\n'
+    state = audit_state(diff_content)
+    state.update(parse_diff(state))
+
+    with (
+        patch("agentic_py.workflows.audit._check_pattern_violations") as pattern_checks,
+        patch("agentic_py.workflows.audit._check_python_violations") as python_checks,
+    ):
+        result = await check_violations(state)
+
+    assert result == {"violations": [], "status": "pass", "violation_details": []}
+    pattern_checks.assert_not_called()
+    python_checks.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_check_violations_scans_hunkless_snippet(audit_state):
+    """Test a raw "+line" snippet without hunk headers still gets the secret scan."""
+    state = audit_state('+password = "hunter2supersecretvalue123"\n')
+    state.update(parse_diff(state))
+    assert state["parsed_hunks"] == []
+
+    result = await check_violations(state)
+
+    assert result["status"] == "fail"
+    assert "Hardcoded password detected" in result["violations"]
+
+
+def test_parse_diff_malformed(audit_state):
     """Test parse_diff with malformed diff (graceful handling)."""
     diff_content = "This is not a valid diff format\n--- random text\n+++ more text"
-    state = AuditState(diff_content=diff_content, violations=[], status="pending")
+    state = audit_state(diff_content)
     result = parse_diff(state)
 
     # Should not raise error, return empty or partial results
@@ -244,7 +291,7 @@ def test_parse_diff_malformed():
 
 
 @pytest.mark.asyncio
-async def test_check_violations_fail():
+async def test_check_violations_fail(audit_state):
     """Test check_violations with print statement (should fail)."""
     diff_content = """--- a/src/file.py
 +++ b/src/file.py
@@ -254,7 +301,7 @@ async def test_check_violations_fail():
 +    print('hello')
 """
     # Need to parse diff first to get parsed_hunks
-    state = AuditState(diff_content=diff_content, violations=[], status="pending")
+    state = audit_state(diff_content)
     parsed = parse_diff(state)
     state.update(parsed)
     result = await check_violations(state)
@@ -272,91 +319,765 @@ async def test_check_violations_fail():
     assert "remediation" in detail
 
 
-@pytest.mark.asyncio
-async def test_check_violations_pass():
-    """Test check_violations with clean code (should pass)."""
-    diff_content = """--- a/src/file.py
-+++ b/src/file.py
-@@ -1,3 +1,3 @@
- def foo():
--    pass
-+    return 'hello'
-"""
-    state = AuditState(diff_content=diff_content, violations=[], status="pending")
-    parsed = parse_diff(state)
-    state.update(parsed)
-    result = await check_violations(state)
-    assert len(result["violations"]) == 0
-    assert result["status"] == "pass"
+def _function_diff(*added_lines: str) -> str:
+    """Diff replacing the body of foo() in src/file.py with the added lines."""
+    return (
+        "--- a/src/file.py\n+++ b/src/file.py\n"
+        f"@@ -1,2 +1,{len(added_lines) + 1} @@\n def foo():\n-    pass\n"
+        + "".join(f"+{line}\n" for line in added_lines)
+    )
 
 
 @pytest.mark.asyncio
-async def test_check_violations_empty_diff():
-    """Test check_violations with empty diff content."""
-    state = AuditState(diff_content="", violations=[], status="pending")
-    parsed = parse_diff(state)
-    state.update(parsed)
+@pytest.mark.parametrize(
+    ("diff_content", "expected_status", "min_violations", "keyword"),
+    [
+        pytest.param("", "pass", 0, None, id="empty-diff"),
+        pytest.param(_function_diff("    return 'hello'"), "pass", 0, None, id="clean"),
+        pytest.param(
+            _function_diff("    print('one')", "    print('two')"), "fail", 2, "print", id="prints"
+        ),
+        pytest.param(_function_diff("    breakpoint()"), "fail", 1, "debugger", id="debugger"),
+        pytest.param(
+            _function_diff('    password = "secret123"'),
+            "fail",
+            1,
+            "password",
+            id="hardcoded-secret",
+        ),
+    ],
+)
+async def test_check_violations_rules(
+    diff_content, expected_status, min_violations, keyword, audit_state
+):
+    """Test check_violations flags each rule's added code and passes clean code."""
+    state = audit_state(diff_content)
+    state.update(parse_diff(state))
     result = await check_violations(state)
-    assert len(result["violations"]) == 0
-    assert result["status"] == "pass"
 
+    assert result["status"] == expected_status
+    assert len(result["violation_details"]) >= min_violations
+    if keyword is None:
+        assert result["violations"] == []
+    else:
+        assert any(keyword in v.lower() for v in result["violations"])
 
-@pytest.mark.asyncio
-async def test_check_violations_multiple_prints():
-    """Test check_violations with multiple print statements."""
-    diff_content = """--- a/src/file.py
-+++ b/src/file.py
-@@ -1,4 +1,4 @@
- def foo():
--    pass
-+    print('one')
-+    print('two')
+
+def test_secret_patterns_fused_into_one_regex():
+    """Test every secret rule is a named group of the single combined pattern."""
+    import re
+
+    from agentic_py.workflows.audit import _SECRET_KEYWORDS, _SECRET_PATTERNS, _SECRET_UNION_RE
+
+    assert _SECRET_UNION_RE.pattern.count("(?P<") == len(_SECRET_PATTERNS)
+    assert set(_SECRET_UNION_RE.groupindex) == set(_SECRET_PATTERNS)
+    # The keyword prefilter must not skip lines a rule could match
+    for name, (pattern, _) in _SECRET_PATTERNS.items():
+        assert any(keyword in name for keyword in _SECRET_KEYWORDS)
+        assert re.match(re.escape(name), pattern)
+
+
+def test_check_pattern_violations_accepts_lazy_added_lines():
+    """Test added lines can be streamed in as a generator instead of a list."""
+    from agentic_py.workflows.audit import _check_pattern_violations
+
+    def added_lines():
+        yield 3, "const a = 1;"
+        yield 4, 'password = "hunter2"'
+
+    violations, details = _check_pattern_violations("", added_lines())
+
+    assert violations == ["Hardcoded password detected"]
+    assert details[0].line_number == 4
+
+
+def test_check_pattern_violations_secret_messages():
+    """Test each secret kind is reported with its own message, once per line."""
+    from agentic_py.workflows.audit import _check_pattern_violations
+
+    diff_content = """+++ b/src/settings.py
++API_KEY = "abc123"
++auth_token='xyz'
++password = "hunter2"; secret = "s3cr3t"
+ password = "context lines are ignored"
+"""
+    violations, details = _check_pattern_violations(diff_content)
+    assert violations == [
+        "Hardcoded API key detected",
+        "Hardcoded token detected",
+        "Hardcoded password detected",
+    ]
+    assert [d.line_number for d in details] == [2, 3, 4]
+
+
+def test_check_pattern_violations_skips_lines_without_assignment():
+    """Test comments, blank lines and calls never reach the regex, even with keywords."""
+    from unittest.mock import patch
+
+    from agentic_py.workflows import audit
+
+    added_lines = [
+        (1, "# rotate the password and api_key monthly"),
+        (2, ""),
+        (3, "    refresh_token(session)"),
+        (4, '"""Secret handling lives in vault.py."""'),
+    ]
+    with patch.object(audit, "_SECRET_UNION_RE", wraps=audit._SECRET_UNION_RE) as mock_re:
+        violations, details = audit._check_pattern_violations("", added_lines)
+
+    assert violations == []
+    mock_re.search.assert_not_called()
+
+
+def test_check_pattern_violations_skips_regex_without_keyword():
+    """Test only assignments mentioning a secret keyword (any case) reach the regex."""
+    from unittest.mock import patch
+
+    from agentic_py.workflows import audit
+
+    added_lines = [(1, "x = compute(y)"), (2, "DB_Password = 'hunter2'"), (3, "retries = 3")]
+    with patch.object(audit, "_SECRET_UNION_RE", wraps=audit._SECRET_UNION_RE) as mock_re:
+        violations, details = audit._check_pattern_violations("", added_lines)
+
+    assert mock_re.search.call_count == 1
+    assert violations == ["Hardcoded password detected"]
+    assert [d.line_number for d in details] == [2]
+
+
+def test_parse_diff_collects_added_lines_for_pattern_checks(audit_state):
+    """Test parse_diff's added lines give the same pattern results as rescanning the diff."""
+    from agentic_py.workflows.audit import _check_pattern_violations
+
+    diff_content = """--- a/src/app.py
++++ b/src/app.py
+@@ -1,2 +1,3 @@
+ import os
+-token = os.environ["TOKEN"]
++token = "hardcoded"
++name = "ok"
 """
-    state = AuditState(diff_content=diff_content, violations=[], status="pending")
+    state = audit_state(diff_content)
     parsed = parse_diff(state)
-    state.update(parsed)
-    result = await check_violations(state)
-    assert len(result["violations"]) > 0
-    assert result["status"] == "fail"
-    # Should detect multiple violations
-    assert len(result["violation_details"]) >= 2
+
+    assert parsed["diff_added_lines"] == [(6, 'token = "hardcoded"'), (7, 'name = "ok"')]
+    assert _check_pattern_violations(
+        diff_content, parsed["diff_added_lines"]
+    ) == _check_pattern_violations(diff_content)
 
 
 @pytest.mark.asyncio
-async def test_check_violations_debugger_calls():
-    """Test check_violations detects debugger calls."""
-    diff_content = """--- a/src/file.py
-+++ b/src/file.py
-@@ -1,3 +1,3 @@
- def foo():
--    pass
-+    breakpoint()
+async def test_check_violations_python_checks_only_python_files(audit_state):
+    """Test AST checks run on .py hunks only, even when other files are in the diff."""
+    diff_content = """--- a/src/app.py
++++ b/src/app.py
+@@ -1,1 +1,2 @@
+ import os
++print("debug")
+--- a/web/app.ts
++++ b/web/app.ts
+@@ -1,1 +1,2 @@
+ const x = 1;
++print("not python")
 """
-    state = AuditState(diff_content=diff_content, violations=[], status="pending")
-    parsed = parse_diff(state)
-    state.update(parsed)
+    state = audit_state(diff_content)
+    state.update(parse_diff(state))
     result = await check_violations(state)
-    assert len(result["violations"]) > 0
-    assert result["status"] == "fail"
-    # Check that it's a debugger violation
-    assert any("debugger" in v.lower() for v in result["violations"])
+
+    print_violations = [
+        d for d in result["violation_details"] if d["rule_name"] == "no_print_statements"
+    ]
+    assert [d["file_path"] for d in print_violations] == ["src/app.py"]
+
+
+@pytest.mark.parametrize(
+    ("file_path", "is_test"),
+    [
+        ("tests/test_app.py", True),
+        ("src/pkg/tests/helpers.py", True),
+        ("src/app_test.go", True),
+        ("test_data/fixture.json", True),
+        ("src/latest_data.py", False),
+        ("src/pytest_plugin.py", False),
+        ("src/contest.py", False),
+    ],
+)
+def test_is_test_file(file_path, is_test):
+    """Test test-file detection works on path segments, not arbitrary substrings."""
+    from agentic_py.workflows.audit import _is_test_file
+
+    assert _is_test_file(file_path) is is_test
+
+
+@pytest.mark.parametrize(
+    ("file_path", "is_config"),
+    [
+        ("config/database.yml", True),
+        ("app/Config/secrets.py", True),
+        (".env", True),
+        ("deploy/.env.production", True),
+        ("deploy/prod.env", True),
+        ("src/settings.py", True),
+        ("docs/conf.py", True),
+        ("jest.config.js", True),
+        ("src/configure.py", False),
+        ("src/environment.py", False),
+    ],
+)
+def test_is_config_file(file_path, is_config):
+    """Test config-file detection works on path segments."""
+    from agentic_py.workflows.audit import _is_config_file
+
+    assert _is_config_file(file_path) is is_config
 
 
 @pytest.mark.asyncio
-async def test_check_violations_hardcoded_secret():
-    """Test check_violations detects hardcoded secrets."""
-    diff_content = """--- a/src/file.py
-+++ b/src/file.py
+async def test_filter_false_positives_dedupes_llm_prompts():
+    """Test identical ambiguous violations share a single LLM analysis."""
+    from unittest.mock import AsyncMock, patch
+
+    from agentic_py.workflows.audit import ViolationDetail, _filter_false_positives
+
+    violations = [
+        ViolationDetail(
+            file_path="config/settings.py",
+            line_number=3,
+            severity="error",
+            rule_name="hardcoded_secret",
+            message="Hardcoded password detected",
+            remediation="Use environment variables or secure secret management",
+        )
+        for _ in range(3)
+    ]
+
+    with (
+        patch("agentic_py.config.llm.LLM_ENABLED", True),
+        patch(
+            "agentic_py.ai.batching.batch_llm_calls", new=AsyncMock(return_value=["FLAGGED"])
+        ) as mock_batch,
+    ):
+        filtered = await _filter_false_positives(violations, [], [], {"py"})
+
+    assert len(mock_batch.await_args.args[0]) == 1
+    assert filtered == violations
+
+
+def test_check_pattern_violations_long_lines():
+    """Test secret scanning stays bounded on long generated lines."""
+    from agentic_py.workflows.audit import _check_pattern_violations
+
+    minified = "+" + "var a=function(){return 1};" * 5000
+    blob = '+token = "' + "A" * 100_000 + '"'
+    secret = '+password = "hunter2"'
+
+    violations, details = _check_pattern_violations("\n".join([minified, blob, secret]))
+
+    assert violations == ["Hardcoded password detected"]
+    assert details[0].line_number == 3
+
+
+def test_check_python_violations_parses_repeated_blocks_once():
+    """Test identical code blocks across hunks share one ast.parse call."""
+    import ast
+    from unittest.mock import patch
+
+    from agentic_py.workflows.audit import _check_python_violations
+
+    parsed_files = [
+        {"old_path": "a.py", "new_path": "a.py", "extension": "py"},
+        {"old_path": "b.py", "new_path": "b.py", "extension": "py"},
+    ]
+    parsed_hunks = [
+        {"file_path": path, "new_start": start, "added_lines": ['print("debug")']}
+        for path, start in (("a.py", 1), ("b.py", 10), ("a.py", 20))
+    ]
+    parse_cache = {}
+
+    with patch("ast.parse", wraps=ast.parse) as mock_parse:
+        violations, details = _check_python_violations(parsed_hunks, parsed_files, parse_cache)
+
+    assert mock_parse.call_count == 1
+    assert [(d.file_path, d.line_number) for d in details] == [
+        ("a.py", 1),
+        ("b.py", 10),
+        ("a.py", 20),
+    ]
+    assert len(parse_cache) == 1
+
+
+def test_check_python_violations_many_hunks_in_order():
+    """Test every Python hunk is checked in-process and reported in hunk order."""
+    from agentic_py.workflows.audit import _check_python_violations
+
+    parsed_files = [
+        {"old_path": f"m{i}.py", "new_path": f"m{i}.py", "extension": "py"} for i in range(6)
+    ]
+    parsed_hunks = [
+        {
+            "file_path": f"m{i}.py",
+            "new_start": i + 1,
+            "added_lines": ["def f():", f'    print("{i}")', "    breakpoint()"],
+        }
+        for i in range(6)
+    ]
+
+    violations, details = _check_python_violations(parsed_hunks, parsed_files)
+
+    assert [d.file_path for d in details] == [f"m{i // 2}.py" for i in range(12)]
+
+
+@pytest.mark.asyncio
+async def test_check_violations_parallel_files(audit_state):
+    """Test the AST and pattern scans of a 50-file diff are dispatched off the event loop."""
+    import asyncio
+    from unittest.mock import patch
+
+    diff_content = "".join(
+        f"--- a/m{i}.py\n+++ b/m{i}.py\n@@ -0,0 +1,3 @@\n"
+        f'+def f():\n+    print("{i}")\n+    token = "t{i}"\n'
+        for i in range(50)
+    )
+    state = audit_state(diff_content)
+    state.update(parse_diff(state))
+
+    with patch(
+        "agentic_py.workflows.audit.asyncio.to_thread", wraps=asyncio.to_thread
+    ) as to_thread:
+        result = await check_violations(state)
+
+    scanned = [call.args[0].__name__ for call in to_thread.call_args_list]
+    assert scanned == ["_check_python_violations", "_check_pattern_violations"]
+    rules = [detail["rule_name"] for detail in result["violation_details"]]
+    # AST violations come first, in file order, followed by the pattern violations
+    assert rules == ["no_print_statements"] * 50 + ["hardcoded_secret"] * 50
+    assert [detail["file_path"] for detail in result["violation_details"][:50]] == [
+        f"m{i}.py" for i in range(50)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_filter_false_positives_classifies_each_path_once():
+    """Test path classification runs only for relevant rules and once per distinct path."""
+    from unittest.mock import patch
+
+    from agentic_py.workflows.audit import ViolationDetail, _filter_false_positives, _is_test_file
+
+    violations = [
+        ViolationDetail(
+            file_path=f"tests/test_{i // 2 % 2}.py",
+            line_number=i,
+            severity=severity,
+            rule_name=rule_name,
+            message=rule_name,
+            remediation="",
+        )
+        for i, (rule_name, severity) in enumerate(
+            [("no_print_statements", "error"), ("long_function", "warning")] * 4
+        )
+    ]
+    _is_test_file.cache_clear()
+
+    with patch("agentic_py.config.llm.LLM_ENABLED", False):
+        filtered = await _filter_false_positives(violations, [], [], {"py"})
+
+    assert [v.rule_name for v in filtered] == ["long_function"] * 4
+    assert _is_test_file.cache_info().misses == 2
+
+
+@pytest.mark.asyncio
+async def test_check_violations_empty_diff_short_circuits(audit_state):
+    """Test an empty diff passes without running any checks."""
+    from unittest.mock import patch
+
+    state = audit_state(" \n")
+    state.update(parse_diff(state))
+
+    with patch("agentic_py.workflows.audit._check_pattern_violations") as mock_patterns:
+        result = await check_violations(state)
+
+    mock_patterns.assert_not_called()
+    assert result == {"violations": [], "status": "pass", "violation_details": []}
+
+
+@pytest.mark.asyncio
+async def test_generate_remediations_batch_bounded_and_ordered():
+    """Test batch remediation keeps input order and caps concurrent LLM calls."""
+    import asyncio
+    from unittest.mock import patch
+
+    from agentic_py.workflows.audit import generate_remediations_batch
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_llm(prompt):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if "rule_3" in prompt:
+            raise RuntimeError("quota exceeded")
+        return f"fix {prompt.count('rule_')}"
+
+    details = [
+        {"file_path": "a.py", "line_number": i, "rule_name": f"rule_{i}", "remediation": "manual"}
+        for i in range(6)
+    ]
+    with (
+        patch("agentic_py.config.llm.LLM_ENABLED", True),
+        patch("agentic_py.ai.llm.invoke_llm_with_retry", new=fake_llm),
+    ):
+        results = await generate_remediations_batch(
+            details, ["ctx"] * 6, ["code"] * 6, concurrency=2
+        )
+
+    assert max_in_flight == 2
+    assert [r["remediation_complete"] for r in results] == [True, True, True, False, True, True]
+    assert results[3]["suggestion"] == "manual"
+
+
+@pytest.mark.asyncio
+async def test_generate_remediations_batch_length_mismatch():
+    """Test batch remediation rejects misaligned inputs."""
+    from agentic_py.workflows.audit import generate_remediations_batch
+
+    with pytest.raises(ValueError):
+        await generate_remediations_batch([{"rule_name": "x"}], [], [])
+
+
+@pytest.mark.asyncio
+async def test_generate_remediations_batch_resumes_from_checkpoint(tmp_path):
+    """Test completed remediations are checkpointed and skipped when the batch is rerun."""
+    from unittest.mock import AsyncMock, patch
+
+    from agentic_py.workflows.audit import generate_remediations_batch
+
+    checkpoint = tmp_path / "remediations.jsonl"
+    details = [
+        {"file_path": "a.py", "line_number": i, "rule_name": f"rule_{i}", "remediation": "manual"}
+        for i in range(3)
+    ]
+    first_llm = AsyncMock(side_effect=["fix 0", RuntimeError("quota exceeded"), "fix 2"])
+    with (
+        patch("agentic_py.config.llm.LLM_ENABLED", True),
+        patch("agentic_py.ai.llm.invoke_llm_with_retry", new=first_llm),
+    ):
+        await generate_remediations_batch(
+            details, ["ctx"] * 3, ["code"] * 3, concurrency=1, output_jsonl=checkpoint
+        )
+    assert len(checkpoint.read_text().splitlines()) == 2
+
+    # A line truncated by a crash mid-write is ignored
+    with checkpoint.open("a") as f:
+        f.write('{"violation_id": "a.py:1:rule_1", "sugg')
+
+    second_llm = AsyncMock(return_value="fix 1")
+    with (
+        patch("agentic_py.config.llm.LLM_ENABLED", True),
+        patch("agentic_py.ai.llm.invoke_llm_with_retry", new=second_llm),
+    ):
+        results = await generate_remediations_batch(
+            details, ["ctx"] * 3, ["code"] * 3, output_jsonl=checkpoint
+        )
+
+    assert second_llm.await_count == 1
+    assert [r["suggestion"] for r in results] == ["fix 0", "fix 1", "fix 2"]
+    assert all(r["remediation_complete"] for r in results)
+    assert len(checkpoint.read_text().splitlines()) == 4
+
+
+@pytest.mark.asyncio
+async def test_stream_remediations_yields_in_completion_or_input_order():
+    """Test remediations stream as they finish, or in input order when requested."""
+    import asyncio
+    from unittest.mock import patch
+
+    from agentic_py.workflows.audit import stream_remediations
+
+    delays = {"rule_0": 0.03, "rule_1": 0.01, "rule_2": 0.02}
+
+    async def fake_llm(prompt):
+        rule = next(rule for rule in delays if rule in prompt)
+        await asyncio.sleep(delays[rule])
+        return f"fix {rule}"
+
+    details = [{"file_path": "a.py", "line_number": i, "rule_name": f"rule_{i}"} for i in range(3)]
+    with (
+        patch("agentic_py.config.llm.LLM_ENABLED", True),
+        patch("agentic_py.ai.llm.invoke_llm_with_retry", new=fake_llm),
+    ):
+        streamed = [
+            (i, r["suggestion"])
+            async for i, r in stream_remediations(details, ["ctx"] * 3, ["code"] * 3)
+        ]
+        ordered = [
+            i async for i, _ in stream_remediations(details, ["c"] * 3, ["v"] * 3, ordered=True)
+        ]
+
+    assert streamed == [(1, "fix rule_1"), (2, "fix rule_2"), (0, "fix rule_0")]
+    assert ordered == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_stream_remediations_cancels_pending_calls_on_early_exit():
+    """Test closing the stream early cancels the LLM calls still in flight."""
+    import asyncio
+    from unittest.mock import patch
+
+    from agentic_py.workflows.audit import stream_remediations
+
+    cancelled = 0
+
+    async def fake_llm(prompt):
+        nonlocal cancelled
+        if "rule_0" in prompt:
+            return "fast fix"
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+
+    details = [{"file_path": "a.py", "line_number": i, "rule_name": f"rule_{i}"} for i in range(3)]
+    with (
+        patch("agentic_py.config.llm.LLM_ENABLED", True),
+        patch("agentic_py.ai.llm.invoke_llm_with_retry", new=fake_llm),
+    ):
+        stream = stream_remediations(details, ["ctx"] * 3, ["code"] * 3)
+        async for i, _ in stream:
+            assert i == 0
+            break
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+    assert cancelled == 2
+
+
+@pytest.mark.asyncio
+async def test_analyze_violations_with_llm_single_call():
+    """Test violations are analyzed in one LLM call, with individual fallback for gaps."""
+    from unittest.mock import AsyncMock, patch
+
+    from agentic_py.workflows.audit import analyze_violations_with_llm
+
+    details = [
+        {"file_path": "src/app.py", "line_number": i, "rule_name": "hardcoded_secret"}
+        for i in range(3)
+    ]
+    response = (
+        "```json\n"
+        '[{"id": 0, "keep": true, "reason": "real"}, {"id": 2, "keep": false, "reason": "test"}]'
+        "\n```"
+    )
+    with (
+        patch("agentic_py.config.llm.LLM_ENABLED", True),
+        patch(
+            "agentic_py.ai.llm.invoke_llm_with_retry", new=AsyncMock(return_value=response)
+        ) as mock_llm,
+        patch(
+            "agentic_py.workflows.audit._analyze_ambiguous_violation",
+            new=AsyncMock(return_value=False),
+        ) as mock_single,
+    ):
+        result = await analyze_violations_with_llm(details, [], "+x = 1", {"py"})
+
+    assert mock_llm.await_count == 1
+    assert mock_single.await_count == 1
+    assert result["analysis_complete"] is True
+    assert [(r["id"], r["keep"]) for r in result["results"]] == [(0, True), (1, False), (2, False)]
+
+
+@pytest.mark.asyncio
+async def test_analyze_violations_with_llm_chunks_large_prompts():
+    """Test prompts over the token budget are split into concurrent chunks."""
+    from unittest.mock import AsyncMock, patch
+
+    from agentic_py.workflows.audit import analyze_violations_with_llm
+
+    details = [
+        {"file_path": "src/app.py", "line_number": i, "code_context": "x" * 400} for i in range(4)
+    ]
+    answer = '[{"id": 0, "keep": true}, {"id": 1, "keep": true}, {"id": 2}, {"id": 3}]'
+    with (
+        patch("agentic_py.config.llm.LLM_ENABLED", True),
+        patch("agentic_py.workflows.audit._ANALYSIS_MAX_PROMPT_TOKENS", 0),
+        patch(
+            "agentic_py.ai.llm.invoke_llm_with_retry", new=AsyncMock(return_value=answer)
+        ) as mock_llm,
+    ):
+        result = await analyze_violations_with_llm(details, [], "", set())
+
+    assert mock_llm.await_count == 4
+    assert [r["keep"] for r in result["results"]] == [True] * 4
+
+
+@pytest.mark.asyncio
+async def test_analyze_violations_with_llm_disabled_keeps_all():
+    """Test violations are kept when the LLM is disabled."""
+    from unittest.mock import patch
+
+    from agentic_py.workflows.audit import analyze_violations_with_llm
+
+    with patch("agentic_py.config.llm.LLM_ENABLED", False):
+        result = await analyze_violations_with_llm([{"rule_name": "x"}], [], "", set())
+
+    assert result["analysis_complete"] is False
+    assert result["results"] == [{"id": 0, "keep": True, "reason": "LLM analysis unavailable"}]
+
+
+@pytest.mark.asyncio
+async def test_generate_remediation_reuses_cached_suggestion():
+    """Test the same rule on equivalent code reuses one LLM suggestion."""
+    from unittest.mock import AsyncMock, patch
+
+    from agentic_py.ai.cache import set_redis_cache
+    from agentic_py.workflows.audit import generate_remediation
+
+    class FakeCache:
+        def __init__(self):
+            self.data = {}
+
+        async def get(self, prompt, model=None, temperature=None):
+            return self.data.get(prompt)
+
+        async def set(self, prompt, response, model=None, temperature=None, ttl=None):
+            self.data[prompt] = response
+
+    set_redis_cache(FakeCache())
+    try:
+        with (
+            patch("agentic_py.config.llm.LLM_ENABLED", True),
+            patch(
+                "agentic_py.ai.llm.invoke_llm_with_retry",
+                new=AsyncMock(return_value="Use logging"),
+            ) as mock_llm,
+        ):
+            first = await generate_remediation(
+                {"rule_name": "long_function", "line_number": 3}, "", "print(1)"
+            )
+            second = await generate_remediation(
+                {"rule_name": "long_function", "line_number": 9}, "", "  print(42)\n"
+            )
+            other_rule = await generate_remediation({"rule_name": "other"}, "", "print(1)")
+            other_case = await generate_remediation({"rule_name": "long_function"}, "", "PRINT(1)")
+            other_context = await generate_remediation(
+                {"rule_name": "long_function"}, "def main():", "print(1)"
+            )
+            other_language = await generate_remediation(
+                {"rule_name": "long_function", "file_path": "app.js"}, "", "print(1)"
+            )
+            no_code = [
+                await generate_remediation({"rule_name": "long_function"}, "", "") for _ in range(2)
+            ]
+    finally:
+        set_redis_cache(None)
+
+    assert first == second == {"remediation_complete": True, "suggestion": "Use logging"}
+    for result in (other_rule, other_case, other_context, other_language, *no_code):
+        assert result["remediation_complete"] is True
+    # Empty violated code is never served from or written to the cache
+    assert mock_llm.await_count == 7
+
+
+@pytest.mark.asyncio
+async def test_generate_remediation_uses_template_for_fixed_rules():
+    """Test rules with a fixed remedy are answered from their template without the LLM."""
+    from unittest.mock import AsyncMock, patch
+
+    from agentic_py.workflows.audit import generate_remediation
+
+    with (
+        patch("agentic_py.config.llm.LLM_ENABLED", True),
+        patch("agentic_py.ai.llm.invoke_llm_with_retry", new=AsyncMock()) as mock_llm,
+    ):
+        result = await generate_remediation(
+            {"rule_name": "no_debugger_calls", "file_path": "src/app.py", "line_number": 7},
+            "",
+            "breakpoint()",
+        )
+
+    assert result["remediation_complete"] is True
+    assert result["suggestion"].startswith("Remove the debugger call at src/app.py:7")
+    mock_llm.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_check_violations_ignores_removed_and_context_prints(audit_state):
+    """Test print calls in removed or context lines are not reported."""
+    diff_content = """--- a/src/app.py
++++ b/src/app.py
 @@ -1,3 +1,3 @@
- def foo():
--    pass
-+    password = "secret123"
+ print("context")
+-print("removed")
++logger.info("added")
 """
-    state = AuditState(diff_content=diff_content, violations=[], status="pending")
-    parsed = parse_diff(state)
-    state.update(parsed)
+    state = audit_state(diff_content)
+    state.update(parse_diff(state))
     result = await check_violations(state)
-    assert len(result["violations"]) > 0
-    assert result["status"] == "fail"
-    # Check that it's a secret violation
-    assert any("password" in v.lower() or "secret" in v.lower() for v in result["violations"])
+
+    assert result["status"] == "pass"
+    assert result["violations"] == []
+
+
+@pytest.mark.asyncio
+async def test_generate_lesson_bounds_prompt_items(struggle_state):
+    """Test the lesson prompt includes a bounded number of errors and history items."""
+    from unittest.mock import AsyncMock, MagicMock, patch
+
+    rag_service = MagicMock()
+    rag_service.query_knowledge = AsyncMock(return_value="")
+    state = struggle_state(
+        edit_frequency=15.0,
+        error_logs=[f"Error {i}" for i in range(5)],
+        history=[f"Attempt {i}" for i in range(5)],
+        is_struggling=True,
+    )
+    with (
+        patch("agentic_py.workflows.struggle.LESSON_PROMPT_MAX_ITEMS", 2),
+        patch("agentic_py.workflows.struggle.get_rag_service", return_value=rag_service),
+        patch(
+            "agentic_py.workflows.struggle._generate_lesson_with_llm",
+            new=AsyncMock(return_value="lesson"),
+        ) as mock_generate,
+    ):
+        result = await generate_lesson(state)
+
+    prompt = mock_generate.await_args.args[0]
+    assert result["lesson_recommendation"] == "lesson"
+    assert "Error 1" in prompt and "Error 2" not in prompt
+    assert "Attempt 4" in prompt and "Attempt 2" not in prompt
+
+
+@pytest.mark.asyncio
+async def test_generate_lesson_loads_prompt_off_event_loop(struggle_state):
+    """Test the prompt template is loaded in a worker thread alongside the RAG query."""
+    import threading
+    from unittest.mock import AsyncMock, MagicMock, patch
+
+    from agentic_py.prompts.loader import load_prompt
+
+    loader_threads = []
+
+    def tracking_load_prompt(name):
+        loader_threads.append(threading.current_thread())
+        return load_prompt(name)
+
+    rag_service = MagicMock()
+    rag_service.query_knowledge = AsyncMock(return_value="rag context")
+    state = struggle_state(
+        edit_frequency=15.0,
+        error_logs=["TypeError"],
+        is_struggling=True,
+    )
+    with (
+        patch("agentic_py.workflows.struggle.load_prompt", new=tracking_load_prompt),
+        patch("agentic_py.workflows.struggle.get_rag_service", return_value=rag_service),
+        patch(
+            "agentic_py.workflows.struggle._generate_lesson_with_llm",
+            new=AsyncMock(return_value="lesson"),
+        ) as mock_generate,
+    ):
+        await generate_lesson(state)
+
+    assert loader_threads and loader_threads[0] is not threading.main_thread()
+    assert "rag context" in mock_generate.await_args.args[0]
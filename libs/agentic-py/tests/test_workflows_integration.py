@@ -107,3 +107,26 @@ async def test_audit_graph_full_workflow_clean_code():
     # Check parsed information is present
     assert "parsed_files" in final_state
     assert "parsed_hunks" in final_state
+
+
+@pytest.mark.asyncio
+async def test_build_audit_graph_reuses_compiled_graph():
+    """Test the graph is compiled once and checkpointers are attached to copies."""
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    first_saver, second_saver = InMemorySaver(), InMemorySaver()
+    graph = build_audit_graph(checkpointer=first_saver)
+    other = build_audit_graph(checkpointer=second_saver)
+
+    assert build_audit_graph() is build_audit_graph()
+    assert build_audit_graph().checkpointer is None
+    assert graph.checkpointer is first_saver
+    assert other.checkpointer is second_saver
+    assert graph.nodes["parse_diff"] is build_audit_graph().nodes["parse_diff"]
+
+    config = {"configurable": {"thread_id": "audit-1"}}
+    state = AuditState(diff_content="", violations=[], status="pending")
+    await graph.ainvoke(state, config)
+
+    assert (await graph.aget_state(config)).values["status"] == "pass"
+    assert await second_saver.aget(config) is None
@@ -14,28 +14,88 @@ import sys
 from pathlib import Path
 
 # Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root / "libs" / "agentic-py" / "src"))
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "libs" / "agentic-py" / "src"))
+
+LESSONS_DIR = PROJECT_ROOT / "docs" / "lessons"
+SAMPLE_LESSON = LESSONS_DIR / "python" / "beginner" / "01-variables-and-data-types.md"
 
 from agentic_py.rag.loaders import load_markdown  # noqa: E402
-from agentic_py.rag.service import RagService  # noqa: E402
+from agentic_py.rag.service import RagService, get_rag_service  # noqa: E402
+
+# Frontmatter keys every lesson must have
+REQUIRED_FRONTMATTER = frozenset({"title", "language", "difficulty"})
+
+# Index pages in the lessons tree that aren't lessons themselves
+NON_LESSON_FILES = frozenset({"README.md", "INDEX.md"})
+
+# Lesson chunks sent per embedding request during ingestion
+EMBEDDING_BATCH_SIZE = 128
+
+# Concurrent retrieval queries, to avoid overloading the embedding backend
+MAX_CONCURRENT_QUERIES = 8
+
+# Rule printed above and below each section title
+BAR = "=" * 60
+
+# Shared by every gather_bounded call, so concurrent tests share the cap
+_query_slots = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+
+# Shared vector store probe, so the retrieval tests check availability once
+_vector_store_probe: asyncio.Future[bool] | None = None
+
+
+def banner(title: str) -> None:
+    """Print a section title between two rules."""
+    print(f"\n{BAR}\n{title}\n{BAR}")
+
+
+async def gather_bounded(*coros):
+    """Run coroutines concurrently, at most MAX_CONCURRENT_QUERIES at a time.
+
+    Exceptions are returned in place of results, like
+    ``asyncio.gather(..., return_exceptions=True)``.
+    """
+
+    async def run(coro):
+        async with _query_slots:
+            return await coro
+
+    return await asyncio.gather(*(run(coro) for coro in coros), return_exceptions=True)
+
+
+def is_retrieved(context) -> bool:
+    """Whether a gathered query result is actual retrieved context."""
+    return (
+        isinstance(context, str)
+        and bool(context)
+        and "Vector store not available" not in context
+    )
+
+
+async def vector_store_ready(service: RagService) -> bool:
+    """Probe the vector store with one trivial query; later calls reuse the answer."""
+    global _vector_store_probe
+    if _vector_store_probe is None:
+        _vector_store_probe = asyncio.ensure_future(_probe_vector_store(service))
+    return await _vector_store_probe
+
+
+async def _probe_vector_store(service: RagService) -> bool:
+    try:
+        context = await service.query_knowledge("variables", top_k=1)
+    except Exception as e:
+        print(f"❌ Vector store probe failed: {e}")
+        return False
+    return "Vector store not available" not in context
 
 
 async def test_loader():
     """Verify markdown loader can handle lesson files with frontmatter."""
-    print("=" * 60)
-    print("Test 1: Verifying Markdown Loader with Frontmatter")
-    print("=" * 60)
+    banner("Test 1: Verifying Markdown Loader with Frontmatter")
 
     # Test with a sample lesson
-    test_lesson = (
-        project_root
-        / "docs"
-        / "lessons"
-        / "python"
-        / "beginner"
-        / "01-variables-and-data-types.md"
-    )
+    test_lesson = SAMPLE_LESSON
 
     if not test_lesson.exists():
         print(f"❌ Test lesson not found: {test_lesson}")
@@ -44,22 +104,23 @@ async def test_loader():
     try:
         doc = load_markdown(test_lesson)
 
+        metadata = doc.metadata
+
         # Check that frontmatter was extracted
-        assert "title" in doc.metadata, "Title not in metadata"
-        assert "language" in doc.metadata, "Language not in metadata"
-        assert "difficulty" in doc.metadata, "Difficulty not in metadata"
+        missing = REQUIRED_FRONTMATTER - metadata.keys()
+        assert not missing, f"Missing from metadata: {sorted(missing)}"
         assert (
-            doc.metadata["language"] == "python"
-        ), f"Expected python, got {doc.metadata['language']}"
+            metadata["language"] == "python"
+        ), f"Expected python, got {metadata['language']}"
         assert (
-            doc.metadata["difficulty"] == "beginner"
-        ), f"Expected beginner, got {doc.metadata['difficulty']}"
+            metadata["difficulty"] == "beginner"
+        ), f"Expected beginner, got {metadata['difficulty']}"
 
         print("✅ Markdown loader works correctly")
-        print(f"   Title: {doc.metadata.get('title')}")
-        print(f"   Language: {doc.metadata.get('language')}")
-        print(f"   Difficulty: {doc.metadata.get('difficulty')}")
-        print(f"   Keywords: {doc.metadata.get('keywords', [])}")
+        print(f"   Title: {metadata['title']}")
+        print(f"   Language: {metadata['language']}")
+        print(f"   Difficulty: {metadata['difficulty']}")
+        print(f"   Keywords: {metadata.get('keywords', [])}")
         print(f"   Content length: {len(doc.page_content)} characters")
         return True
 
@@ -71,32 +132,33 @@ async def test_loader():
         return False
 
 
-async def test_ingestion():
+async def test_ingestion(service: RagService):
     """Test ingesting all lessons into RAG."""
-    print("\n" + "=" * 60)
-    print("Test 2: Ingesting All Lessons")
-    print("=" * 60)
+    banner("Test 2: Ingesting All Lessons")
 
-    lessons_dir = project_root / "docs" / "lessons"
+    lessons_dir = LESSONS_DIR
 
     if not lessons_dir.exists():
         print(f"❌ Lessons directory not found: {lessons_dir}")
         return False
 
     # Count lesson files
-    lesson_files = list(lessons_dir.rglob("*.md"))
-    lesson_files = [f for f in lesson_files if f.name not in ["README.md", "INDEX.md"]]
-
-    print(f"Found {len(lesson_files)} lesson files")
+    lesson_count = sum(
+        1 for f in lessons_dir.rglob("*.md") if f.name not in NON_LESSON_FILES
+    )
 
-    # Initialize RAG service
-    service = RagService(enabled=True)
+    print(f"Found {lesson_count} lesson files")
 
     try:
         # Ingest directory
         print("Ingesting lessons directory...")
         result = await service.ingest_directory(
-            lessons_dir, file_patterns=["*.md"], recursive=True
+            lessons_dir,
+            file_patterns=["*.md"],
+            recursive=True,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            # Reruns only embed lessons that changed since the last ingestion
+            skip_existing=True,
         )
 
         print("✅ Ingestion completed!")
@@ -118,14 +180,8 @@ async def test_ingestion():
         return False
 
 
-async def test_retrieval():
+async def test_retrieval(service: RagService):
     """Test retrieval for each language."""
-    print("\n" + "=" * 60)
-    print("Test 3: Testing Retrieval for Each Language")
-    print("=" * 60)
-
-    service = RagService(enabled=True)
-
     test_queries = [
         ("Python", "How do I create variables in Python?"),
         ("TypeScript", "How do I declare variables with types in TypeScript?"),
@@ -135,42 +191,39 @@ async def test_retrieval():
         ("Java", "How do I use streams in Java?"),
     ]
 
-    results = []
+    if not await vector_store_ready(service):
+        banner("Test 3: Testing Retrieval for Each Language")
+        print("⚠️  Skipped: vector store not available")
+        return False
+
+    contexts = await gather_bounded(
+        *(service.query_knowledge(query, top_k=3) for _, query in test_queries)
+    )
+
+    banner("Test 3: Testing Retrieval for Each Language")
+
+    for (language, query), context in zip(test_queries, contexts, strict=True):
+        print(f"\nQuery ({language}): {query}")
+
+        if isinstance(context, Exception):
+            print(f"❌ Error querying: {context}")
+        elif is_retrieved(context):
+            print(f"✅ Retrieved context ({len(context)} chars)")
+            # Show first 200 chars
+            preview = context[:200].replace("\n", " ")
+            print(f"   Preview: {preview}...")
+        else:
+            print("⚠️  No context retrieved or vector store not available")
 
-    for language, query in test_queries:
-        try:
-            print(f"\nQuery ({language}): {query}")
-            context = await service.query_knowledge(query, top_k=3)
-
-            if context and "Vector store not available" not in context:
-                print(f"✅ Retrieved context ({len(context)} chars)")
-                # Show first 200 chars
-                preview = context[:200].replace("\n", " ")
-                print(f"   Preview: {preview}...")
-                results.append(True)
-            else:
-                print("⚠️  No context retrieved or vector store not available")
-                results.append(False)
-
-        except Exception as e:
-            print(f"❌ Error querying: {e}")
-            results.append(False)
-
-    success_count = sum(results)
+    success_count = sum(map(is_retrieved, contexts))
     print(
         f"\n✅ Retrieval test: {success_count}/{len(test_queries)} queries successful"
     )
     return success_count > 0
 
 
-async def test_error_pattern_retrieval():
+async def test_error_pattern_retrieval(service: RagService):
     """Test retrieval with error patterns (simulating struggle detection)."""
-    print("\n" + "=" * 60)
-    print("Test 4: Testing Retrieval with Error Patterns")
-    print("=" * 60)
-
-    service = RagService(enabled=True)
-
     test_cases = [
         {
             "query": "Help with errors",
@@ -195,32 +248,37 @@ async def test_error_pattern_retrieval():
         },
     ]
 
-    results = []
-
-    for case in test_cases:
-        try:
-            print(f"\nError Pattern Test ({case['language']}):")
-            print(f"  Query: {case['query']}")
-            print(f"  Errors: {case['error_patterns']}")
+    if not await vector_store_ready(service):
+        banner("Test 4: Testing Retrieval with Error Patterns")
+        print("⚠️  Skipped: vector store not available")
+        return False
 
-            context = await service.query_knowledge(
+    contexts = await gather_bounded(
+        *(
+            service.query_knowledge(
                 case["query"], error_patterns=case["error_patterns"], top_k=3
             )
+            for case in test_cases
+        )
+    )
+
+    banner("Test 4: Testing Retrieval with Error Patterns")
 
-            if context and "Vector store not available" not in context:
-                print(f"✅ Retrieved relevant context ({len(context)} chars)")
-                preview = context[:200].replace("\n", " ")
-                print(f"   Preview: {preview}...")
-                results.append(True)
-            else:
-                print("⚠️  No context retrieved")
-                results.append(False)
+    for case, context in zip(test_cases, contexts, strict=True):
+        print(f"\nError Pattern Test ({case['language']}):")
+        print(f"  Query: {case['query']}")
+        print(f"  Errors: {case['error_patterns']}")
 
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            results.append(False)
+        if isinstance(context, Exception):
+            print(f"❌ Error: {context}")
+        elif is_retrieved(context):
+            print(f"✅ Retrieved relevant context ({len(context)} chars)")
+            preview = context[:200].replace("\n", " ")
+            print(f"   Preview: {preview}...")
+        else:
+            print("⚠️  No context retrieved")
 
-    success_count = sum(results)
+    success_count = sum(map(is_retrieved, contexts))
     print(
         f"\n✅ Error pattern test: {success_count}/{len(test_cases)} cases successful"
     )
@@ -230,26 +288,30 @@ async def test_error_pattern_retrieval():
 async def main():
     """Run all tests."""
     print("Educational Lessons RAG Integration Test")
-    print("=" * 60)
+    print(BAR)
 
     results = []
 
+    # One service for ingestion and retrieval, so the vector store and
+    # embeddings are initialized once
+    service = get_rag_service(enabled=True)
+
     # Test 1: Verify loader
     results.append(await test_loader())
 
     # Test 2: Ingest lessons
-    results.append(await test_ingestion())
+    results.append(await test_ingestion(service))
 
-    # Test 3: Test retrieval
-    results.append(await test_retrieval())
-
-    # Test 4: Test error pattern retrieval
-    results.append(await test_error_pattern_retrieval())
+    # Tests 3 and 4 only depend on ingestion, so their queries run concurrently;
+    # each prints its report in one go once its own queries are back
+    results.extend(
+        await asyncio.gather(
+            test_retrieval(service), test_error_pattern_retrieval(service)
+        )
+    )
 
     # Summary
-    print("\n" + "=" * 60)
-    print("Test Summary")
-    print("=" * 60)
+    banner("Test Summary")
     print(f"✅ Passed: {sum(results)}/{len(results)}")
 
     if all(results):